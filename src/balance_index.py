@@ -0,0 +1,110 @@
+"""
+Balance Index Module
+
+This module answers balance and flow questions for any date range by:
+1. Keeping the ledger's days with transactions in sorted order, taken from
+   the cube's day-level base aggregate (so no row sort is ever needed)
+2. Storing running totals (prefix sums) of income and expense cents over
+   those days, with a leading zero
+3. Answering balance-at-date and income/expense/net-between-dates queries
+   with a binary search into the prefix sums, in O(log days)
+
+The index is built once per cube and cached on it.
+"""
+
+from lazy_imports import lazy_import
+from ledger_cube import EXPENSES, INCOME, as_cube
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+
+def day_number(date):
+    """
+    Convert a date to days since 1970-01-01.
+
+    Args:
+        date: Date string (e.g. '2025-06-30'), datetime or Timestamp
+
+    Returns:
+        Day number as a Python int
+    """
+    try:
+        timestamp = pd.Timestamp(date)
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid date '{date}'. Use YYYY-MM-DD.")
+    if pd.isna(timestamp):
+        raise ValueError(f"Invalid date '{date}'. Use YYYY-MM-DD.")
+    return int(np.datetime64(timestamp.to_datetime64(), 'D').astype('int64'))
+
+
+def balance_index(ledger):
+    """
+    Build (or fetch the cached) prefix-sum index of a ledger.
+
+    Args:
+        ledger: Ledger DataFrame or cube from build_cube()
+
+    Returns:
+        Dict containing:
+        - days: sorted int64 array of day numbers with transactions
+        - income: int64 array (days + 1) of running income cents, starting at 0
+        - expenses: int64 array (days + 1) of running expense cents, starting at 0
+    """
+    cube = as_cube(ledger)
+    if cube.get('balance_index') is not None:
+        return cube['balance_index']
+
+    present = cube['daily_counts'] > 0
+    daily = cube['daily'][present]
+    index = {
+        'days': np.flatnonzero(present) + (cube['first_day'] or 0),
+        'income': np.concatenate(([0], np.cumsum(daily[:, INCOME]))),
+        'expenses': np.concatenate(([0], np.cumsum(daily[:, EXPENSES])))
+    }
+    cube['balance_index'] = index
+    return index
+
+
+def _position(index, date):
+    """Number of indexed days on or before date (all of them if date is None)."""
+    if date is None:
+        return len(index['days'])
+    return int(np.searchsorted(index['days'], day_number(date), side='right'))
+
+
+def balance_cents(index, date=None):
+    """
+    Net balance (income minus expenses) at the end of a date.
+
+    Args:
+        index: Index from balance_index()
+        date: Date to read the balance at (default: end of the ledger)
+
+    Returns:
+        Balance in cents as a Python int
+    """
+    position = _position(index, date)
+    return int(index['income'][position] - index['expenses'][position])
+
+
+def flow_cents(index, start=None, end=None):
+    """
+    Income, expenses and net flow between two dates, both inclusive.
+
+    Args:
+        index: Index from balance_index()
+        start: First date of the range (default: start of the ledger)
+        end: Last date of the range (default: end of the ledger)
+
+    Returns:
+        Dict with income, expenses and net in cents (Python ints)
+    """
+    if start is None:
+        first = 0
+    else:
+        first = int(np.searchsorted(index['days'], day_number(start), side='left'))
+    last = max(first, _position(index, end))
+    income = int(index['income'][last] - index['income'][first])
+    expenses = int(index['expenses'][last] - index['expenses'][first])
+    return {'income': income, 'expenses': expenses, 'net': income - expenses}
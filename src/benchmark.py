@@ -0,0 +1,542 @@
+#!/usr/bin/env python3
+"""
+Benchmark Module
+
+This module measures the cost of the analytics kernels on synthetic ledgers by:
+1. Generating compact ledgers of any size (int32 month ordinals, int64 cents)
+   without going through CSV parsing
+2. Timing each kernel (best of several runs) and reporting per-row cost
+3. Comparing against the previous implementation where one is kept for reference
+
+Examples:
+    python src/benchmark.py monthly
+    python src/benchmark.py trends
+    python src/benchmark.py monthly --rows 1000000 10000000 100000000
+    python src/benchmark.py cube --rows 1000000 50000000
+    python src/benchmark.py grid
+    python src/benchmark.py classify --rows 200000
+    python src/benchmark.py trends --rows 1000 50000
+    python src/benchmark.py detect --rows 10000 1000000
+    python src/benchmark.py projections --rows 10000 100000
+"""
+
+import argparse
+import time
+
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Default sizes per kernel, in that kernel's unit (see --rows); each run takes seconds, not minutes.
+# Ledgers of 100M rows need roughly 4 GB of memory
+DEFAULT_SIZES = {
+    'monthly': [1_000_000, 10_000_000],
+    'cube': [1_000_000, 10_000_000],
+    'classify': [200_000],
+    'trends': [1_000, 5_000],
+    'detect': [10_000, 100_000],
+    'projections': [10_000, 100_000],
+}
+
+# Scenario grids (income changes, expense changes, months): 1.2M and 10M cells
+DEFAULT_GRIDS = [(100, 100, 120), (200, 100, 500)]
+
+# Previous implementations are slow, so they are only timed up to this size
+REFERENCE_MAX_ROWS = 1_000_000
+
+# The previous trends loop filters every row once per category
+REFERENCE_MAX_CATEGORIES = 10_000
+
+
+def synthetic_ledger(n_rows, n_months=120, n_categories=40, seed=0, columns=('month_ordinal', 'amount_cents')):
+    """
+    Generate a random compact ledger.
+
+    Args:
+        n_rows: Number of transactions
+        n_months: Number of consecutive months covered, starting 2015-01
+        n_categories: Number of distinct categories
+        seed: Random seed
+        columns: Compact columns to generate (a subset of date, category,
+            amount_cents, month_ordinal); fewer columns keep huge ledgers in memory
+
+    Returns:
+        DataFrame with the requested compact ledger columns
+    """
+    rng = np.random.default_rng(seed)
+    first = (2015 - 1970) * 12
+    ordinals = rng.integers(first, first + n_months, n_rows, dtype='int32')
+    ledger = {}
+    if 'date' in columns:
+        days = rng.integers(0, 28, n_rows).astype('timedelta64[D]')
+        month_starts = (ordinals.astype('int64')).astype('datetime64[M]').astype('datetime64[D]')
+        ledger['date'] = (month_starts + days).astype('datetime64[ns]')
+    if 'category' in columns:
+        names = [f"Category {i}" for i in range(n_categories)]
+        ledger['category'] = pd.Categorical.from_codes(rng.integers(0, n_categories, n_rows), names)
+    if 'amount_cents' in columns:
+        # Mostly small expenses with occasional larger income
+        ledger['amount_cents'] = rng.integers(-20_000, 8_000, n_rows, dtype='int64')
+    if 'month_ordinal' in columns:
+        ledger['month_ordinal'] = ordinals
+    return pd.DataFrame(ledger)
+
+
+def time_call(func, repeat):
+    """Best wall-clock time of repeated calls, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def reference_monthly_cashflow(df):
+    """Previous calculate_monthly_cashflow(): groupby with per-group Python lambdas."""
+    from money import ledger_cents, to_dollars
+    from transaction_loader import month_periods
+
+    monthly = pd.DataFrame({'month': month_periods(df), 'cents': ledger_cents(df)})
+    result = monthly.groupby('month')['cents'].agg(
+        income=lambda x: x[x > 0].sum(),
+        expenses=lambda x: -x[x < 0].sum(),
+        net_cashflow='sum'
+    ).reset_index()
+    result[['income', 'expenses', 'net_cashflow']] = to_dollars(result[['income', 'expenses', 'net_cashflow']])
+    result['month'] = result['month'].astype(str)
+    return result
+
+
+def reference_classify_category(category_name):
+    """Previous classify_category(): exact lookups, then a linear scan of every keyword."""
+    from delayed_gratification import DISCRETIONARY_CATEGORIES, ESSENTIAL_CATEGORIES
+
+    category_lower = category_name.lower().strip()
+    if category_lower in DISCRETIONARY_CATEGORIES:
+        return 'discretionary'
+    elif category_lower in ESSENTIAL_CATEGORIES:
+        return 'essential'
+    else:
+        for disc_cat in DISCRETIONARY_CATEGORIES:
+            if disc_cat in category_lower or category_lower in disc_cat:
+                return 'discretionary'
+        for ess_cat in ESSENTIAL_CATEGORIES:
+            if ess_cat in category_lower or category_lower in ess_cat:
+                return 'essential'
+    return 'unknown'
+
+
+def reference_category_spending_trends(df):
+    """Previous get_category_spending_trends(): group the rows, then filter them once per category."""
+    from delayed_gratification import classify_category
+
+    df_copy = df.copy()
+    df_copy['month'] = df_copy['date'].dt.to_period('M')
+    expenses_df = df_copy[df_copy['amount'] < 0].copy()
+    expenses_df['amount'] = -expenses_df['amount']
+    if expenses_df.empty:
+        return pd.DataFrame()
+    category_monthly = expenses_df.groupby(['category', 'month'], observed=True)['amount'].sum().reset_index()
+    if category_monthly['month'].nunique() < 2:
+        return pd.DataFrame()
+    trends = []
+    for category in category_monthly['category'].unique():
+        category_data = category_monthly[category_monthly['category'] == category].sort_values('month')
+        if len(category_data) >= 2:
+            prev_month_row = category_data.iloc[-2]
+            curr_month_row = category_data.iloc[-1]
+            prev_spend = prev_month_row['amount']
+            curr_spend = curr_month_row['amount']
+            absolute_change = curr_spend - prev_spend
+            if absolute_change > 0:
+                trend_direction = 'increase'
+            elif absolute_change < 0:
+                trend_direction = 'decrease'
+            else:
+                trend_direction = 'stable'
+            trends.append({
+                'category': category,
+                'previous_month': str(prev_month_row['month']),
+                'current_month': str(curr_month_row['month']),
+                'previous_month_spend': prev_spend,
+                'current_month_spend': curr_spend,
+                'absolute_change': absolute_change,
+                'percentage_change': (absolute_change / prev_spend * 100) if prev_spend > 0 else 0,
+                'trend_direction': trend_direction,
+                'classification': classify_category(category)
+            })
+    return pd.DataFrame(trends)
+
+
+def reference_insight_text(df):
+    """Previous insight text of detect_delayed_gratification(): one f-string call per row."""
+    return df.apply(
+        lambda row: f"You chose not to spend ${row['saved_amount']:.2f} on {row['category'].title()} this month.\n"
+                    f"This reflects a {abs(row['percentage_change']):.0f}% reduction compared to last month.",
+        axis=1
+    )
+
+
+def reference_map_to_reward(future_value):
+    """Previous map_to_reward(): linear scan of REWARD_MAPPING."""
+    from delayed_gratification import REWARD_MAPPING
+
+    for threshold, description in REWARD_MAPPING:
+        if future_value >= threshold:
+            return description
+    return REWARD_MAPPING[-1][1]
+
+
+def reference_insight_blocks(delayed_grat):
+    """Previous Stage 3 of generate_delayed_gratification_insights(): one text block per row via iterrows."""
+    blocks = []
+    for _, row in delayed_grat.iterrows():
+        saved_amount = row['saved_amount']
+        projections = [{'months': months, 'future_value': saved_amount * months} for months in [6, 24, 60]]
+        insight_block = f"\n{'='*60}\n"
+        insight_block += f"DELAYED GRATIFICATION INSIGHT: {row['category'].upper()}\n"
+        insight_block += f"{'='*60}\n\n"
+        insight_block += f"{row['insight']}\n\n"
+        insight_block += "If this behavior continues:\n"
+        for proj in projections:
+            months = proj['months']
+            time_frame = {6: "In 6 months", 24: "In 2 years", 60: "In 5 years"}.get(months, f"In {months} months")
+            insight_block += f"  {time_frame}: ~${proj['future_value']:,.2f}\n"
+        top_reward = reference_map_to_reward(projections[0]['future_value'])
+        insight_block += f"\nThis could fund:\n  {top_reward}\n"
+        blocks.append(insight_block)
+    return blocks
+
+
+def synthetic_trends(n_rows, seed=0):
+    """Trends DataFrame with n_rows month pairs, mostly discretionary reductions."""
+    from delayed_gratification import trend_frame
+
+    rng = np.random.default_rng(seed)
+    names = np.array(['eating out', 'Coffee', 'online shopping', 'Movies', 'Rent'], dtype=object)
+    prev_cents = rng.integers(1, 50_000, n_rows)
+    curr_cents = (prev_cents * rng.uniform(0.2, 1.1, n_rows)).astype('int64')
+    category = rng.integers(0, len(names), n_rows)
+    classification = np.where(category == 4, 'essential', 'discretionary')
+    return trend_frame(names[category], np.full(n_rows, '2025-05'), np.full(n_rows, '2025-06'),
+                       prev_cents, curr_cents, classification)
+
+
+def merchant_categories(n_names, seed=0):
+    """
+    Generate distinct merchant-level category strings.
+
+    About one in five contains a taxonomy keyword, some are fragments of a
+    keyword, and the rest match nothing.
+    """
+    from delayed_gratification import DISCRETIONARY_CATEGORIES, ESSENTIAL_CATEGORIES
+
+    rng = np.random.default_rng(seed)
+    keywords = sorted(DISCRETIONARY_CATEGORIES | ESSENTIAL_CATEGORIES)
+    words = ['Acme', 'Corner', 'Store', 'Pay', 'Ltd', 'Online', 'Market', 'Co', 'Hub', 'Express']
+    names = []
+    for i, kind in enumerate(rng.integers(0, 10, n_names)):
+        keyword = keywords[i % len(keywords)]
+        if kind < 2:
+            name = f"{words[i % 10]} {keyword.title()} #{i}"
+        elif kind == 2:
+            name = keyword[:1 + i % len(keyword)] if i < len(keywords) * 8 else f"{keyword[:3]}{i}"
+        else:
+            name = f"{words[i % 10]} {words[(i // 10) % 10]} {i}"
+        names.append(name)
+    return list(dict.fromkeys(names))
+
+
+def benchmark_classify(rows_list, repeat=3):
+    """
+    Time classifying distinct category strings, compiled vs linear scan.
+
+    Args:
+        rows_list: Numbers of distinct names to classify
+        repeat: Runs per size (best time is reported)
+
+    Returns:
+        List of dicts with rows, seconds, ns_per_row and, up to
+        REFERENCE_MAX_ROWS, reference_seconds and speedup
+    """
+    from category_classifier import CategoryClassifier
+    from delayed_gratification import DISCRETIONARY_CATEGORIES, ESSENTIAL_CATEGORIES
+
+    results = []
+    for n_rows in rows_list:
+        names = merchant_categories(n_rows)
+
+        def compiled():
+            # A fresh classifier each run, so the LRU memo never answers for it
+            classifier = CategoryClassifier([('discretionary', DISCRETIONARY_CATEGORIES),
+                                             ('essential', ESSENTIAL_CATEGORIES)])
+            return classifier.classify_many(names)
+
+        seconds = time_call(compiled, repeat)
+        result = {'rows': len(names), 'seconds': seconds, 'ns_per_row': seconds / len(names) * 1e9}
+        if n_rows <= REFERENCE_MAX_ROWS:
+            assert compiled() == [reference_classify_category(name) for name in names]
+            result['reference_seconds'] = time_call(lambda: [reference_classify_category(name) for name in names],
+                                                    repeat)
+            result['speedup'] = result['reference_seconds'] / seconds
+        results.append(result)
+    return results
+
+
+def benchmark_trends(categories_list, repeat=3):
+    """
+    Time get_category_spending_trends() on ledgers with many categories.
+
+    Args:
+        categories_list: Numbers of distinct categories (1M rows over 24 months each)
+        repeat: Runs per size (best time is reported)
+
+    Returns:
+        List of dicts with rows (categories), seconds, ns_per_row and, up to
+        REFERENCE_MAX_CATEGORIES, reference_seconds (the filter per
+        category) and speedup; both sides start from the rows, so seconds
+        includes building the cube
+    """
+    from delayed_gratification import get_category_spending_trends
+    from money import to_dollars
+
+    results = []
+    for n_categories in categories_list:
+        ledger = synthetic_ledger(1_000_000, n_months=24, n_categories=n_categories,
+                                  columns=('date', 'category', 'amount_cents', 'month_ordinal'))
+        seconds = time_call(lambda: get_category_spending_trends(ledger), repeat)
+        result = {'rows': n_categories, 'seconds': seconds, 'ns_per_row': seconds / n_categories * 1e9}
+        if n_categories <= REFERENCE_MAX_CATEGORIES:
+            rows = pd.DataFrame({'date': ledger['date'], 'category': ledger['category'],
+                                 'amount': to_dollars(ledger['amount_cents'])})
+            pd.testing.assert_frame_equal(get_category_spending_trends(ledger),
+                                          reference_category_spending_trends(rows))
+            result['reference_seconds'] = time_call(lambda: reference_category_spending_trends(rows), repeat)
+            result['speedup'] = result['reference_seconds'] / seconds
+        results.append(result)
+    return results
+
+
+def benchmark_detect(rows_list, repeat=3):
+    """
+    Time detect_delayed_gratification() with vectorized insight text.
+
+    Args:
+        rows_list: Numbers of trend rows
+        repeat: Runs per size (best time is reported)
+
+    Returns:
+        List of dicts with rows, seconds, ns_per_row and, up to
+        REFERENCE_MAX_ROWS, reference_seconds (the same detection with
+        per-row insight text) and speedup
+    """
+    from delayed_gratification import detect_delayed_gratification
+
+    results = []
+    for n_rows in rows_list:
+        trends = synthetic_trends(n_rows)
+        seconds = time_call(lambda: detect_delayed_gratification(trends), repeat)
+        result = {'rows': n_rows, 'seconds': seconds, 'ns_per_row': seconds / n_rows * 1e9}
+        if n_rows <= REFERENCE_MAX_ROWS:
+            def reference():
+                detected = detect_delayed_gratification(trends, insights=False)
+                detected['insight'] = reference_insight_text(detected)
+                return detected
+
+            pd.testing.assert_frame_equal(detect_delayed_gratification(trends), reference())
+            result['reference_seconds'] = time_call(reference, repeat)
+            result['speedup'] = result['reference_seconds'] / seconds
+        results.append(result)
+    return results
+
+
+def benchmark_projections(rows_list, repeat=3):
+    """
+    Time Stage 3: the projections table with its rewards, and formatting every text block.
+
+    Args:
+        rows_list: Numbers of trend rows (about two thirds are detected)
+        repeat: Runs per size (best time is reported)
+
+    Returns:
+        List of dicts with rows (detected instances), seconds, ns_per_row
+        and, up to REFERENCE_MAX_ROWS, reference_seconds (the iterrows
+        loop) and speedup; both sides format every block, since the
+        lazy blocks would otherwise skip the formatting altogether
+    """
+    from delayed_gratification import InsightBlocks, detect_delayed_gratification, project_delayed_gratification
+
+    results = []
+    for n_rows in rows_list:
+        detected = detect_delayed_gratification(synthetic_trends(n_rows))
+        seconds = time_call(lambda: list(InsightBlocks(project_delayed_gratification(detected))), repeat)
+        result = {'rows': len(detected), 'seconds': seconds, 'ns_per_row': seconds / len(detected) * 1e9}
+        if n_rows <= REFERENCE_MAX_ROWS:
+            assert list(InsightBlocks(project_delayed_gratification(detected))) == reference_insight_blocks(detected)
+            result['reference_seconds'] = time_call(lambda: reference_insight_blocks(detected), repeat)
+            result['speedup'] = result['reference_seconds'] / seconds
+        results.append(result)
+    return results
+
+
+def benchmark_monthly(rows_list, repeat=3):
+    """
+    Time calculate_monthly_cashflow() at several ledger sizes.
+
+    Args:
+        rows_list: Ledger sizes to benchmark
+        repeat: Runs per size (best time is reported)
+
+    Returns:
+        List of dicts with rows, seconds, ns_per_row and, up to
+        REFERENCE_MAX_ROWS, reference_seconds and speedup
+    """
+    from cashflow import calculate_monthly_cashflow
+
+    results = []
+    for n_rows in rows_list:
+        df = synthetic_ledger(n_rows)
+        seconds = time_call(lambda: calculate_monthly_cashflow(df), repeat)
+        result = {'rows': n_rows, 'seconds': seconds, 'ns_per_row': seconds / n_rows * 1e9}
+        if n_rows <= REFERENCE_MAX_ROWS:
+            pd.testing.assert_frame_equal(calculate_monthly_cashflow(df), reference_monthly_cashflow(df))
+            result['reference_seconds'] = time_call(lambda: reference_monthly_cashflow(df), repeat)
+            result['speedup'] = result['reference_seconds'] / seconds
+        results.append(result)
+        del df
+    return results
+
+
+def benchmark_cube(rows_list, repeat=3):
+    """
+    Time building the ledger cube and serving reports from it.
+
+    Args:
+        rows_list: Ledger sizes to benchmark
+        repeat: Runs per size (best time is reported)
+
+    Returns:
+        List of dicts with rows, build_seconds, the cube shape and report_seconds
+        (monthly, breakdown, trends and savings served from the cube)
+    """
+    from cashflow import calculate_category_breakdown, calculate_monthly_cashflow, calculate_total_savings
+    from delayed_gratification import get_category_spending_trends
+    from ledger_cube import build_cube
+
+    reports = {
+        'monthly': calculate_monthly_cashflow,
+        'breakdown': calculate_category_breakdown,
+        'trends': get_category_spending_trends,
+        'savings': calculate_total_savings
+    }
+    results = []
+    for n_rows in rows_list:
+        df = synthetic_ledger(n_rows, columns=('date', 'category', 'amount_cents', 'month_ordinal'))
+        build_seconds = time_call(lambda: build_cube(df), repeat)
+        cube = build_cube(df)
+        del df
+        results.append({
+            'rows': n_rows,
+            'build_seconds': build_seconds,
+            'shape': cube['cents'].shape,
+            'report_seconds': {name: time_call(lambda: report(cube), repeat) for name, report in reports.items()}
+        })
+    return results
+
+
+def benchmark_grid(grids, repeat=3):
+    """
+    Time project_scenario_grid() on income change x expense change x month grids.
+
+    Args:
+        grids: (income changes, expense changes, months) sizes to benchmark
+        repeat: Runs per size (best time is reported)
+
+    Returns:
+        List of dicts with grid, cells (scenarios x months), seconds and ns_per_cell
+    """
+    from cashflow import project_scenario_grid
+
+    monthly = pd.DataFrame({'income': [4200.0, 3900.0, 4350.0], 'expenses': [3100.0, 3450.0, 2980.0]})
+    results = []
+    for n_income, n_expense, n_months in grids:
+        income_changes = np.linspace(-1000, 1000, n_income)
+        expense_changes = np.linspace(-500, 500, n_expense)
+        horizons = np.arange(1, n_months + 1)
+        seconds = time_call(lambda: project_scenario_grid(monthly, income_changes, expense_changes, horizons), repeat)
+        cells = n_income * n_expense * n_months
+        results.append({'grid': (n_income, n_expense, n_months), 'cells': cells,
+                        'seconds': seconds, 'ns_per_cell': seconds / cells * 1e9})
+    return results
+
+
+def format_grid_results(results):
+    """Format scenario grid benchmark results as a console table."""
+    lines = [f"{'Grid (inc x exp x months)':>26s} {'Cells':>12s} {'Time (ms)':>10s} {'ns/cell':>8s}"]
+    for result in results:
+        grid = 'x'.join(str(size) for size in result['grid'])
+        lines.append(f"{grid:>26s} {result['cells']:12,d} {result['seconds'] * 1000:10.1f} {result['ns_per_cell']:8.2f}")
+    return "\n".join(lines)
+
+
+def format_cube_results(results):
+    """Format cube benchmark results as a console table."""
+    names = list(results[0]['report_seconds']) if results else []
+    lines = [f"{'Rows':>12s} {'Build (ms)':>11s} {'ns/row':>8s} {'Cube':>14s} "
+             + " ".join(f"{name + ' (ms)':>15s}" for name in names)]
+    for result in results:
+        shape = 'x'.join(str(size) for size in result['shape'])
+        lines.append(f"{result['rows']:12,d} {result['build_seconds'] * 1000:11.1f} "
+                     f"{result['build_seconds'] / result['rows'] * 1e9:8.2f} {shape:>14s} "
+                     + " ".join(f"{result['report_seconds'][name] * 1000:15.2f}" for name in names))
+    return "\n".join(lines)
+
+
+def format_results(results):
+    """Format benchmark results as a console table."""
+    lines = [f"{'Rows':>12s} {'Time (ms)':>10s} {'ns/row':>8s} {'Previous (ms)':>14s} {'Speedup':>8s}"]
+    for result in results:
+        line = f"{result['rows']:12,d} {result['seconds'] * 1000:10.1f} {result['ns_per_row']:8.2f}"
+        if 'reference_seconds' in result:
+            line += f" {result['reference_seconds'] * 1000:14.1f} {result['speedup']:7.1f}x"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Run the requested benchmark and print a results table."""
+    parser = argparse.ArgumentParser(description="Benchmark analytics kernels on synthetic ledgers.")
+    parser.add_argument('kernel', choices=['monthly', 'cube', 'grid', 'classify', 'trends', 'detect', 'projections'], help="Kernel to benchmark")
+    parser.add_argument('--rows', type=int, nargs='+', help="Ledger sizes (monthly, cube), distinct names (classify), categories (trends) or trend rows (detect, projections); default: DEFAULT_SIZES for the kernel")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per size (best is reported)")
+    options = parser.parse_args(argv)
+    if options.rows is None and options.kernel != 'grid':
+        options.rows = DEFAULT_SIZES[options.kernel]
+
+    if options.kernel == 'monthly':
+        print("calculate_monthly_cashflow()")
+        print(format_results(benchmark_monthly(options.rows, options.repeat)))
+    elif options.kernel == 'cube':
+        print("build_cube() and reports served from the cube")
+        print(format_cube_results(benchmark_cube(options.rows, options.repeat)))
+    elif options.kernel == 'classify':
+        print("classify_categories() on distinct merchant-level category strings")
+        print(format_results(benchmark_classify(options.rows, options.repeat)))
+    elif options.kernel == 'trends':
+        print("get_category_spending_trends() by number of categories (Rows = categories)")
+        print(format_results(benchmark_trends(options.rows, options.repeat)))
+    elif options.kernel == 'detect':
+        print("detect_delayed_gratification() with insight text, by number of trend rows")
+        print(format_results(benchmark_detect(options.rows, options.repeat)))
+    elif options.kernel == 'projections':
+        print("project_delayed_gratification() and every text block formatted, by detected instances")
+        print(format_results(benchmark_projections(options.rows, options.repeat)))
+    elif options.kernel == 'grid':
+        print("project_scenario_grid(): every scenario, month and horizon in one call")
+        print(format_grid_results(benchmark_grid(DEFAULT_GRIDS, options.repeat)))
+
+
+if __name__ == '__main__':
+    main()
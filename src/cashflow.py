@@ -1,8 +1,40 @@
+"""
+Personal Finance Analyzer
+
+This module is both an importable library and the interactive application:
+1. load_ledger() reads a CSV file, directory or glob into a compact ledger
+2. monthly_cashflow(), total_savings(), runway(), plan_goal(), scenario() and
+   category_breakdown() compute results from a loaded ledger without prompting
+3. main() runs the interactive prompt and menu; importing the module does no work
+
+Example:
+    from cashflow import load_ledger, monthly_cashflow
+    df, report = load_ledger('data/multi_month_transactions.csv')
+    print(monthly_cashflow(df))
+"""
+
 
-import pandas as pd
 from datetime import datetime
 import os
+from lazy_imports import lazy_import
+from balance_index import balance_cents, balance_index, flow_cents
 from delayed_gratification import display_delayed_gratification_insights
+from ledger_cache import load_transactions_cached
+from ledger_ingest import format_ingest_report, is_multi_file_input, load_transaction_files
+from ledger_cube import GRANULARITIES, as_cube, build_cube, category_totals, monthly_totals, rollup_totals
+from money import to_cents, to_dollars
+from monte_carlo import DEFAULT_PERCENTILES, category_history, goal_probability, percentile_bands, simulate_paths
+from transaction_loader import memory_per_row, ordinals_to_periods
+
+# pandas and NumPy load on first use, so importing this module for a quick report stays cheap
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Average days per month, for converting a target date into months
+DAYS_PER_MONTH = 30.44
+
+# Last axis of project_scenario_grid() values
+SCENARIO_METRICS = ('income', 'expenses', 'net_cashflow', 'cumulative_savings')
 
 # Helper function to create sample transactions CSV if it doesn't exist
 def create_sample_transactions(file_path):
@@ -34,122 +66,90 @@ def create_sample_transactions(file_path):
     df_sample.to_csv(file_path, index=False)
     print(f"Created sample transactions file at {file_path}")
 
+# Ask the user for a column that could not be auto-mapped
+def ask_for_column(required_col, available):
+    """Prompt for the actual column name of a required column."""
+    print(f"Column '{required_col}' not found. Available: {available}")
+    return input(f"Enter the actual column name for '{required_col}': ")
+
+# Load a ledger from a file, directory or glob pattern
+def load_ledger(path, resolve_missing=None):
+    """
+    Load transactions from a CSV file, a directory of CSVs or a glob pattern.
+
+    Single files go through the fingerprint cache; directories and globs are
+    parsed concurrently and combined.
+
+    Args:
+        path: CSV file, directory or glob pattern
+        resolve_missing: Optional callable(required_col, available) returning
+            the column name to use when a required column cannot be auto-mapped
+
+    Returns:
+        Tuple (df, report) with the compact ledger and the load report from
+        load_transactions_cached() or load_transaction_files()
+    """
+    if is_multi_file_input(path):
+        return load_transaction_files(path)
+    return load_transactions_cached(path, resolve_missing=resolve_missing)
+
 # Interactive file input
-print("--- Personal Finance Analyzer ---")
-try:
-    DEFAULT_PATH = "data/sample_transactions.csv"
-    user_input = input(
-        f"Enter path to transactions CSV file\n"
-        f"[Press Enter to use '{DEFAULT_PATH}']: "
-    ).strip()
-    
-    file_path = user_input if user_input else DEFAULT_PATH
-    
-    # If using default path, create sample file if it doesn't exist
-    if file_path == DEFAULT_PATH:
-        create_sample_transactions(file_path)
-    
-    print(f"\nLoading transactions from: {file_path}")
-    
-    # Load the CSV file with encoding and delimiter error handling
-    df = None
-    encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
-    delimiters = [',', ';', '\t', '|']
-    
-    for encoding in encodings:
-        for delimiter in delimiters:
-            try:
-                df = pd.read_csv(file_path, encoding=encoding, delimiter=delimiter, on_bad_lines='skip', engine='python')
-                if not df.empty:
-                    print(f"File loaded with {encoding} encoding and '{delimiter}' delimiter.")
-                    break
-            except (UnicodeDecodeError, LookupError, pd.errors.ParserError):
-                continue
-        if df is not None and not df.empty:
-            break
-    
-    # If still no luck, try with error_bad_lines=False (older pandas)
-    if df is None or df.empty:
-        for encoding in encodings:
-            try:
-                df = pd.read_csv(file_path, encoding=encoding, error_bad_lines=False)
-                if not df.empty:
-                    print(f"File loaded with {encoding} encoding (skipping bad lines).")
-                    break
-            except (UnicodeDecodeError, LookupError):
-                continue
-    
-    if df is None or df.empty:
-        raise ValueError("Could not read CSV file. Tried multiple encodings and delimiters. Please ensure the file is a valid CSV.")
-    
-    # Remove empty columns
-    df = df.dropna(axis=1, how='all')
-    
-    # Standardize column names (lowercase and strip whitespace)
-    df.columns = df.columns.str.lower().str.strip()
-    
-    print(f"Available columns: {list(df.columns)}")
-    
-    # Default required columns
-    required_columns = ['date', 'category', 'amount']
-    column_mapping = {}
-    
-    # Create flexible mapping for common column name variations
-    column_aliases = {
-        'date': ['date', 'transaction_date', 'trans_date'],
-        'category': ['category', 'description', 'type', 'transaction_type'],
-        'amount': ['amount', 'value', 'transaction_amount']
-    }
-    
-    # Try to auto-map columns
-    for required_col, aliases in column_aliases.items():
-        found = False
-        for alias in aliases:
-            if alias in df.columns:
-                if alias != required_col:
-                    column_mapping[alias] = required_col
-                found = True
-                break
+def prompt_for_ledger():
+    """
+    Ask for a transactions path, load it and print the load report.
+
+    Returns:
+        The loaded DataFrame, or None if loading failed
+    """
+    print("--- Personal Finance Analyzer ---")
+    try:
+        DEFAULT_PATH = "data/sample_transactions.csv"
+        user_input = input(
+            f"Enter path to transactions CSV file, directory or glob pattern\n"
+            f"[Press Enter to use '{DEFAULT_PATH}']: "
+        ).strip()
         
-        if not found:
-            print(f"Column '{required_col}' not found. Available: {list(df.columns)}")
-            alt_col = input(f"Enter the actual column name for '{required_col}': ")
-            if alt_col and alt_col in df.columns:
-                column_mapping[alt_col] = required_col
+        file_path = user_input if user_input else DEFAULT_PATH
+        
+        # If using default path, create sample file if it doesn't exist
+        if file_path == DEFAULT_PATH:
+            create_sample_transactions(file_path)
+        
+        print(f"\nLoading transactions from: {file_path}")
+        df, load_report = load_ledger(file_path, resolve_missing=ask_for_column)
+        
+        if is_multi_file_input(file_path):
+            # Every matched file was parsed concurrently and combined into one ledger
+            print(format_ingest_report(load_report))
+            print(f"Compact ledger: {memory_per_row(df):.1f} bytes/row")
+        else:
+            # The cached ledger is reused if the file is unchanged; otherwise sniffed and parsed once
+            print(f"File loaded with {load_report['encoding']} encoding and '{load_report['delimiter']}' delimiter "
+                  f"({load_report['engine']} parser).")
+            print(f"Available columns: {load_report['columns']}")
+            if load_report['cache'] in ('hit', 'append'):
+                print(f"Loaded cached ledger in {load_report['load_seconds'] * 1000:.1f} ms ({load_report['rows']} rows, "
+                      f"{load_report['appended_rows']} newly appended)")
             else:
-                raise ValueError(f"Required column '{required_col}' is missing.")
-    
-    # Rename columns if alternatives were provided
-    if column_mapping:
-        df = df.rename(columns=column_mapping)
-    
-    # Now parse date and validate
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')
-    if df['date'].isnull().any():
-        raise ValueError("Invalid date values found. Ensure dates are in a parseable format.")
-    
-    # Validate 'amount' as numeric
-    df['amount'] = pd.to_numeric(df['amount'], errors='coerce')
-    if df['amount'].isnull().any():
-        raise ValueError("Invalid 'amount' values found. Ensure all amounts are numeric.")
-    
-    print("Data loaded successfully!")
-    print(df.head())
-    
-except FileNotFoundError:
-    print("Error: File not found. Please check the path and try again.")
-    df = None
-except ValueError as e:
-    print(f"Error: {e}")
-    df = None
-except Exception as e:
-    print(f"Unexpected error: {e}")
-    df = None
-
-# The dataframe is now loaded and validated
-if df is None:
-    print("Cannot proceed without valid data. Exiting.")
-    exit()
+                print(f"Detection: {load_report['detection_seconds'] * 1000:.1f} ms, "
+                      f"parsing: {load_report['parse_seconds'] * 1000:.1f} ms ({load_report['rows']} rows, cache {load_report['cache']})")
+            print(f"Compact ledger: {load_report['compact_bytes_per_row']:.1f} bytes/row "
+                  f"(vs {load_report['raw_bytes_per_row']:.1f} bytes/row uncompacted)")
+            if load_report['invalid_dates']:
+                print(f"Skipped {load_report['invalid_dates']} rows with unparseable dates "
+                      f"(rows: {load_report['invalid_date_rows']})")
+
+        print("Data loaded successfully!")
+        print(df.head())
+        return df
+        
+    except FileNotFoundError:
+        print("Error: File not found. Please check the path and try again.")
+    except ValueError as e:
+        print(f"Error: {e}")
+    except Exception as e:
+        print(f"Unexpected error: {e}")
+    return None
 
 
 
@@ -165,23 +165,85 @@ def calculate_monthly_cashflow(df):
     """
     Groups transactions by month and calculates total income, total expenses, and net cash flow.
     
+    Accepts a transaction DataFrame or a cube from build_cube().
+    
     Returns a DataFrame with columns: month, income, expenses, net_cashflow
     """
-    # Create month column
-    df['month'] = df['date'].dt.to_period('M')
-    
-    # Group by month and aggregate
-    result = df.groupby('month')['amount'].agg(
-        income=lambda x: x[x > 0].sum(),
-        expenses=lambda x: -x[x < 0].sum(),  # Make expenses positive
-        net_cashflow='sum'
-    ).reset_index()
+    # One vectorized pass over month ordinals, or a reduction of the pre-aggregated cube; sums are exact integer cents
+    ordinals, income, expenses, net = monthly_totals(df)
     
-    # Convert month to string for cleaner display
-    result['month'] = result['month'].astype(str)
+    # Convert cents to dollars and month to string for cleaner display
+    result = pd.DataFrame({
+        'month': ordinals_to_periods(ordinals).astype(str),
+        'income': to_dollars(income),
+        'expenses': to_dollars(expenses),
+        'net_cashflow': to_dollars(net)
+    })
     
     return result
 
+def calculate_cashflow(df, granularity='month'):
+    """
+    Income, expenses and net cash flow per day, ISO week, month, quarter or year.
+    
+    Accepts a transaction DataFrame or a cube from build_cube(); rollups are
+    derived from the cube's day-level base aggregate and cached on the cube.
+    
+    Args:
+        df: Ledger DataFrame or cube
+        granularity: One of 'day', 'week', 'month', 'quarter', 'year'
+    
+    Returns a DataFrame with columns: <granularity>, income, expenses, net_cashflow
+    """
+    labels, income, expenses, net = rollup_totals(df, granularity)
+    return pd.DataFrame({
+        granularity: labels,
+        'income': to_dollars(income),
+        'expenses': to_dollars(expenses),
+        'net_cashflow': to_dollars(net)
+    })
+
+def future_month_labels(months):
+    """
+    Labels of the months following the current one.
+    
+    Args:
+        months: Number of months
+    
+    Returns:
+        Index of 'YYYY-MM' strings, starting next month
+    """
+    start = pd.Period(datetime.now(), freq='M') + 1
+    return pd.period_range(start, periods=months, freq='M').strftime('%Y-%m')
+
+def projection_frame(months, income, expenses):
+    """
+    Projection with constant monthly income and expenses.
+    
+    Net cash flow is the same every month; cumulative savings is its
+    running sum in one array operation, equal bit for bit to adding the net
+    month by month.
+    
+    Args:
+        months: Number of months to project
+        income: Projected monthly income
+        expenses: Projected monthly expenses
+    
+    Returns:
+        DataFrame with columns: month, income, expenses, net_cashflow,
+        cumulative_savings (an empty DataFrame for no months)
+    """
+    if months <= 0:
+        return pd.DataFrame()
+    net = income - expenses
+    return pd.DataFrame({
+        'month': future_month_labels(months),
+        'income': income,
+        'expenses': expenses,
+        'net_cashflow': net,
+        'cumulative_savings': np.cumsum(np.full(months, net))
+    })
+
 def project_future_cashflow(monthly_cashflow, months_ahead, required_savings=0):
     """
     Projects future monthly cash flow by adding savings as expense.
@@ -197,61 +259,29 @@ def project_future_cashflow(monthly_cashflow, months_ahead, required_savings=0):
     if monthly_cashflow.empty:
         return pd.DataFrame()
     
-    current_date = pd.to_datetime(datetime.now())
     avg_income = monthly_cashflow['income'].mean()
     avg_expenses = monthly_cashflow['expenses'].mean()
-    months_to_project = int(months_ahead)
-    
-    projections = []
-    cumulative = 0
-    
-    for i in range(1, months_to_project + 1):
-        future_date = current_date + pd.DateOffset(months=i)
-        projected_month = future_date.strftime('%Y-%m')
-        adjusted_expenses = avg_expenses + required_savings
-        net = avg_income - adjusted_expenses
-        cumulative += net
-        
-        projected = {
-            'month': projected_month,
-            'income': avg_income,
-            'expenses': adjusted_expenses,
-            'net_cashflow': net,
-            'cumulative_savings': cumulative
-        }
-        projections.append(projected)
-    
-    return pd.DataFrame(projections)
+    return projection_frame(int(months_ahead), avg_income, avg_expenses + required_savings)
 
-# Calculate monthly cash flow
-monthly_cashflow = calculate_monthly_cashflow(df)
-
-def calculate_total_savings(df):
+def calculate_total_savings(df, as_of=None):
     """
     Calculates total savings as the cumulative sum of net cash flow.
     Assumes savings accumulates from positive net cash flows.
     
     Args:
-        df: DataFrame with 'amount' column
+        df: DataFrame with 'amount' (or compact 'amount_cents') column, or a
+            cube from build_cube()
+        as_of: Date to read savings at (default: end of the ledger)
     
     Returns:
         Total savings amount
     """
-    # Calculate net cash flow cumulatively
-    df_sorted = df.sort_values('date')
-    df_sorted['cumulative_net'] = df_sorted['amount'].cumsum()
+    # The cumulative net at a date is a binary search into the balance index, in exact integer cents
+    balance = balance_cents(balance_index(df), as_of)
     # Savings is the positive cumulative net (or 0 if negative)
-    total_savings = max(0, df_sorted['cumulative_net'].iloc[-1])
+    total_savings = to_dollars(max(0, balance))
     return total_savings
 
-# Calculate total savings from data
-if df is not None:
-    total_savings = calculate_total_savings(df)
-else:
-    total_savings = 0
-    print("\nCannot proceed without valid data.")
-    exit()
-
 def calculate_emergency_runway(monthly_cashflow, savings):
     """
     Calculates the emergency fund runway in months.
@@ -271,9 +301,6 @@ def calculate_emergency_runway(monthly_cashflow, savings):
     runway_months = savings / avg_monthly_expenses
     return runway_months
 
-# Update emergency runway to use calculated savings
-runway = calculate_emergency_runway(monthly_cashflow, total_savings)
-
 
 
 
@@ -284,7 +311,7 @@ runway = calculate_emergency_runway(monthly_cashflow, total_savings)
 # - integrates this as a new expense category in the cash flow model
 # - checks whether the goal is achievable under current net cash flow
 
-def plan_savings_goal(goal_amount, target_date_str, monthly_cashflow):
+def plan_savings_goal(goal_amount, target_date_str, monthly_cashflow, savings=0):
     """
     Plans a savings goal and integrates it into the cash flow model.
     
@@ -292,6 +319,7 @@ def plan_savings_goal(goal_amount, target_date_str, monthly_cashflow):
         goal_amount: The target savings amount
         target_date_str: Target date as string (e.g., '2025-12-31')
         monthly_cashflow: DataFrame with cash flow data
+        savings: Existing savings counted towards the goal
     
     Returns:
         Dict with required monthly savings, achievability, and updated cash flow
@@ -304,10 +332,10 @@ def plan_savings_goal(goal_amount, target_date_str, monthly_cashflow):
     if days_to_target <= 0:
         return {"error": "Target date is in the past"}
     
-    months_to_target = days_to_target / 30.44  # Average days per month
+    months_to_target = days_to_target / DAYS_PER_MONTH
     
     # Calculate remaining amount needed (accounting for existing savings)
-    remaining_needed = goal_amount - total_savings
+    remaining_needed = goal_amount - savings
     
     if remaining_needed <= 0:
         required_monthly_savings = 0
@@ -328,20 +356,70 @@ def plan_savings_goal(goal_amount, target_date_str, monthly_cashflow):
         'updated_cashflow': updated_cashflow
     }
 
+def solve_savings_goals(goal_amounts, target_dates, savings, monthly_net, today=None):
+    """
+    Plans many savings goals at once, e.g. every user x every candidate target date.
+    
+    All array arguments broadcast against each other, so goals for users
+    (shape (users, 1)) and candidate dates (shape (dates,)) give a
+    (users, dates) result without a loop. Nothing is read from module state.
+    
+    Args:
+        goal_amounts: Target savings amounts
+        target_dates: Target dates (anything numpy.datetime64 accepts, e.g. '2026-12-31')
+        savings: Existing savings counted towards each goal
+        monthly_net: Expected monthly net cash flow (e.g. average net per month)
+        today: Date to plan from (default: today)
+    
+    Returns:
+        Dict of broadcast arrays:
+        - months_to_target: Months from today to the target date
+        - remaining_needed: Goal amount minus existing savings
+        - required_monthly_savings: Monthly savings needed (NaN for past targets)
+        - achievable: Whether monthly net covers the required savings (False for past targets)
+        - surplus: Monthly net minus required savings (negative for a shortfall)
+        - earliest_date: First target date the goal is achievable at, never
+          before tomorrow (NaT if it never is)
+    """
+    today = np.datetime64(datetime.now() if today is None else today, 'D')
+    goal_amounts, savings, monthly_net = (np.asarray(values, dtype=float) for values in (goal_amounts, savings, monthly_net))
+    days_to_target = (np.asarray(target_dates, dtype='datetime64[D]') - today).astype('int64')
+    months_to_target = days_to_target / DAYS_PER_MONTH
+    remaining_needed = goal_amounts - savings
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        required = np.where(remaining_needed <= 0, 0.0, remaining_needed / months_to_target)
+        required = np.where(days_to_target <= 0, np.nan, required)
+        
+        # Earliest feasible day: the first whole day whose required savings fit in the monthly net
+        needed_days = np.ceil(remaining_needed / monthly_net * DAYS_PER_MONTH)
+        needed_days += remaining_needed / (needed_days / DAYS_PER_MONTH) > monthly_net  # Float round-off
+        # A goal already met stays met only if the net does not eat into savings
+        feasible = ((remaining_needed <= 0) & (monthly_net >= 0)) | (monthly_net > 0)
+        # Targets must be after today, so even a goal already met is first achievable tomorrow
+        needed_days = np.where(remaining_needed <= 0, 1, np.where(feasible, needed_days, 0))
+    earliest_date = np.where(feasible, today + needed_days.astype('int64'), np.datetime64('NaT'))
+    
+    keys = ('months_to_target', 'remaining_needed', 'required_monthly_savings', 'achievable', 'surplus', 'earliest_date')
+    values = (months_to_target, remaining_needed, required, required <= monthly_net, monthly_net - required, earliest_date)
+    return dict(zip(keys, np.broadcast_arrays(*values)))
+
 def calculate_category_breakdown(df):
     """
     Calculates spending breakdown by category.
     
+    Accepts a transaction DataFrame or a cube from build_cube().
+    
     Returns a DataFrame with category totals and percentages
     """
-    category_totals = df.groupby('category')['amount'].sum().sort_values()
-    expenses_only = category_totals[category_totals < 0]
+    totals = category_totals(df).sort_values()
+    expenses_only = totals[totals < 0]
     expenses_only = -expenses_only  # Make positive for display
     total_expenses = expenses_only.sum()
     
     result = pd.DataFrame({
         'Category': expenses_only.index,
-        'Amount': expenses_only.values,
+        'Amount': to_dollars(expenses_only.values),
         'Percentage': (expenses_only.values / total_expenses * 100).round(2)
     }).reset_index(drop=True)
     
@@ -360,44 +438,401 @@ def run_what_if_scenario(monthly_cashflow, months_projection, scenario_type, sce
     Returns:
         Projected cash flow with scenarios
     """
-    current_date = pd.to_datetime(datetime.now())
     avg_income = monthly_cashflow['income'].mean()
     avg_expenses = monthly_cashflow['expenses'].mean()
     
-    projections = []
+    # Calculate adjusted values based on scenario
+    if scenario_type == 'decrease_spending':
+        adjusted_expenses = avg_expenses - scenario_amount
+        adjusted_income = avg_income
+    elif scenario_type == 'increase_savings':
+        adjusted_expenses = avg_expenses + scenario_amount
+        adjusted_income = avg_income
+    else:  # both
+        adjusted_expenses = avg_expenses - (scenario_amount / 2)
+        adjusted_income = avg_income + (scenario_amount / 2)
     
-    for i in range(1, int(months_projection) + 1):
-        future_date = current_date + pd.DateOffset(months=i)
-        projected_month = future_date.strftime('%Y-%m')
-        
-        # Calculate adjusted values based on scenario
-        if scenario_type == 'decrease_spending':
-            adjusted_expenses = avg_expenses - scenario_amount
-            adjusted_income = avg_income
-        elif scenario_type == 'increase_savings':
-            adjusted_expenses = avg_expenses + scenario_amount
-            adjusted_income = avg_income
-        else:  # both
-            adjusted_expenses = avg_expenses - (scenario_amount / 2)
-            adjusted_income = avg_income + (scenario_amount / 2)
-        
-        projected = {
-            'month': projected_month,
-            'income': adjusted_income,
-            'expenses': adjusted_expenses,
-            'net_cashflow': adjusted_income - adjusted_expenses,
-            'cumulative_savings': 0  # Will be calculated
-        }
-        projections.append(projected)
+    return projection_frame(int(months_projection), adjusted_income, adjusted_expenses)
+
+def project_scenario(monthly_cashflow, months, income_change=0, expense_change=0):
+    """
+    Projects cumulative savings with adjusted average income and expenses.
+    
+    Args:
+        monthly_cashflow: Historical monthly cash flow DataFrame
+        months: Number of months to project
+        income_change: Amount added to average monthly income (may be negative)
+        expense_change: Amount added to average monthly expenses (may be negative)
+    
+    Returns:
+        Dict with the projection DataFrame, the adjusted income and expenses,
+        and the baseline vs scenario cumulative savings after the last month
+    """
+    avg_income = monthly_cashflow['income'].mean()
+    avg_expenses = monthly_cashflow['expenses'].mean()
+    new_income = avg_income + income_change
+    new_expenses = avg_expenses + expense_change
+    projection_df = projection_frame(months, new_income, new_expenses)
     
-    result_df = pd.DataFrame(projections)
-    result_df['cumulative_savings'] = result_df['net_cashflow'].cumsum()
+    baseline_cumulative = (avg_income - avg_expenses) * months
+    scenario_cumulative = (new_income - new_expenses) * months
+    difference = scenario_cumulative - baseline_cumulative
     
-    return result_df
+    return {
+        'projection': projection_df,
+        'income': new_income,
+        'expenses': new_expenses,
+        'baseline_cumulative': baseline_cumulative,
+        'scenario_cumulative': scenario_cumulative,
+        'difference': difference,
+        'difference_pct': (difference / abs(baseline_cumulative) * 100) if baseline_cumulative != 0 else 0
+    }
+
+def project_scenario_grid(monthly_cashflow, income_changes=(0,), expense_changes=(0,), horizons=(12,)):
+    """
+    Projects every combination of income and expense changes in one broadcast pass.
+    
+    Each scenario is one (income change, expense change) pair, projected like
+    project_scenario() up to the longest horizon; a 1000 x 1000 scenario x
+    month grid takes milliseconds.
+    
+    Args:
+        monthly_cashflow: Historical monthly cash flow DataFrame
+        income_changes: Amounts added to average monthly income
+        expense_changes: Amounts added to average monthly expenses
+        horizons: Months after which to report cumulative savings in the summary
+    
+    Returns:
+        Dict containing:
+        - scenarios: DataFrame with income_change and expense_change per scenario
+        - months: Index of projected month labels ('YYYY-MM')
+        - metrics: SCENARIO_METRICS, naming the last axis of values
+        - values: float64 array (scenarios, months, metrics)
+        - summary: DataFrame with income_change, expense_change, months,
+          cumulative_savings, baseline_cumulative and difference for every
+          scenario and horizon
+    """
+    horizons = np.unique(np.asarray(horizons, dtype=int))
+    if len(horizons) == 0 or horizons[0] < 1:
+        raise ValueError("Horizons must be positive numbers of months.")
+    
+    avg_income = monthly_cashflow['income'].mean()
+    avg_expenses = monthly_cashflow['expenses'].mean()
+    income_change, expense_change = (grid.ravel() for grid in np.meshgrid(
+        np.asarray(income_changes, dtype=float), np.asarray(expense_changes, dtype=float), indexing='ij'))
+    income = avg_income + income_change
+    expenses = avg_expenses + expense_change
+    net = income - expenses
+    
+    # Scenarios x months x metrics; every metric is a broadcast of per-scenario values over months
+    n_months = int(horizons[-1])
+    values = np.empty((len(net), n_months, len(SCENARIO_METRICS)))
+    values[:, :, 0] = income[:, None]
+    values[:, :, 1] = expenses[:, None]
+    values[:, :, 2] = net[:, None]
+    np.cumsum(values[:, :, 2], axis=1, out=values[:, :, 3])  # Same running sum as projection_frame()
+    
+    # Summary figures as project_scenario() computes them: net times months
+    cumulative = net[:, None] * horizons
+    baseline = (avg_income - avg_expenses) * horizons
+    summary = pd.DataFrame({
+        'income_change': np.repeat(income_change, len(horizons)),
+        'expense_change': np.repeat(expense_change, len(horizons)),
+        'months': np.tile(horizons, len(net)),
+        'cumulative_savings': cumulative.ravel(),
+        'baseline_cumulative': np.tile(baseline, len(net)),
+        'difference': (cumulative - baseline).ravel()
+    })
+    
+    return {
+        'scenarios': pd.DataFrame({'income_change': income_change, 'expense_change': expense_change}),
+        'months': future_month_labels(n_months),
+        'metrics': SCENARIO_METRICS,
+        'values': values,
+        'summary': summary
+    }
+
+def simulate_cashflow(df, months=120, paths=10_000, savings=0, goal_amount=None, income_change=0, expense_change=0,
+                      percentiles=DEFAULT_PERCENTILES, seed=0, method='category', max_workers=1):
+    """
+    Simulates a range of future savings instead of a single average projection.
+    
+    Every simulated month bootstraps each category's net cash flow from its
+    own historical months (method='category') or reuses a whole historical
+    month (method='month'). The same seed always gives the same result,
+    however many worker processes are used.
+    
+    Args:
+        df: Ledger DataFrame or cube from build_cube()
+        months: Number of months to simulate
+        paths: Number of simulated paths
+        savings: Savings before the first simulated month
+        goal_amount: Optional savings goal to check at the last month
+        income_change: Amount added to every month's income (may be negative)
+        expense_change: Amount added to every month's expenses (may be negative)
+        percentiles: Percentiles of savings to report for every month
+        seed: Random seed
+        method: 'category' or 'month'
+        max_workers: Worker processes (None: one per CPU; 1: in-process)
+    
+    Returns:
+        Dict containing:
+        - bands: DataFrame with month and one savings column per percentile (p5, p50, ...)
+        - goal_probability: Share of paths reaching goal_amount by the last month (None without a goal)
+        - paths, seed, method: The simulation settings
+    """
+    cumulative = simulate_paths(category_history(df), months, paths, seed, method,
+                                to_cents(income_change) - to_cents(expense_change), max_workers)
+    start = to_cents(savings)
+    
+    bands = pd.DataFrame({'month': future_month_labels(months)})
+    for percentile, band in zip(percentiles, percentile_bands(cumulative, percentiles)):
+        bands[f"p{percentile:g}"] = to_dollars(band + start)
+    
+    return {
+        'bands': bands,
+        'goal_probability': None if goal_amount is None else goal_probability(cumulative, to_cents(goal_amount),
+                                                                               start_cents=start),
+        'paths': paths,
+        'seed': seed,
+        'method': method
+    }
+
+def check_savings_goal(monthly_cashflow, savings, goal_amount, target, income_change=0, expense_change=0):
+    """
+    Checks whether a savings goal is achievable under adjusted income and expenses.
+    
+    Args:
+        monthly_cashflow: Historical monthly cash flow DataFrame
+        savings: Existing savings counted towards the goal
+        goal_amount: The target savings amount
+        target: Target date (e.g. '2025-12-31') or a number of months
+        income_change: Amount added to average monthly income (may be negative)
+        expense_change: Amount added to average monthly expenses (may be negative)
+    
+    Returns:
+        Dict with months to target, remaining amount, required monthly savings,
+        projected monthly net, achievability and monthly surplus (negative for
+        a shortfall), or {"error": ...} if the target date is in the past
+    """
+    current_date = pd.to_datetime(datetime.now())
+    if isinstance(target, (int, float)):
+        # numbers are always a count of months, never an epoch timestamp
+        months_to_target = float(target)
+    else:
+        # try parse as date first
+        try:
+            target_date = pd.to_datetime(target)
+            days_to_target = (target_date - current_date).days
+            if days_to_target <= 0:
+                return {"error": "Target date is in the past"}
+            months_to_target = days_to_target / DAYS_PER_MONTH
+        except Exception:
+            # treat as months
+            months_to_target = float(target)
+    
+    remaining_needed = goal_amount - savings
+    if remaining_needed <= 0:
+        required_monthly = 0.0
+    else:
+        required_monthly = remaining_needed / months_to_target
+    
+    new_income = monthly_cashflow['income'].mean() + income_change
+    new_expenses = monthly_cashflow['expenses'].mean() + expense_change
+    projected_monthly_net = new_income - new_expenses
+    
+    return {
+        'goal_amount': goal_amount,
+        'months_to_target': months_to_target,
+        'remaining_needed': remaining_needed,
+        'required_monthly_savings': required_monthly,
+        'projected_monthly_net': projected_monthly_net,
+        'achievable': required_monthly <= projected_monthly_net,
+        'surplus': projected_monthly_net - required_monthly
+    }
+
+# Library API: every function takes a ledger from load_ledger() (or its cube from build_cube()) and never prompts
+def monthly_cashflow(df):
+    """
+    Monthly income, expenses and net cash flow of a ledger.
+    
+    Returns a DataFrame with columns: month, income, expenses, net_cashflow
+    """
+    return calculate_monthly_cashflow(df)
+
+def cashflow(df, granularity='month'):
+    """
+    Income, expenses and net cash flow of a ledger per day, week, month, quarter or year.
+    
+    Returns a DataFrame with columns: <granularity>, income, expenses, net_cashflow
+    """
+    return calculate_cashflow(df, granularity)
+
+def total_savings(df, as_of=None):
+    """
+    Total savings of a ledger (cumulative net cash flow, floored at 0), at
+    the end of the ledger or of the as_of date.
+    """
+    return calculate_total_savings(df, as_of)
+
+def balance(df, date=None):
+    """
+    Net balance (cumulative income minus expenses) of a ledger at the end of a date.
+    
+    Args:
+        df: Ledger DataFrame or cube
+        date: Date to read the balance at (default: end of the ledger)
+    
+    Returns:
+        Balance in dollars (negative if expenses exceed income)
+    """
+    return to_dollars(balance_cents(balance_index(df), date))
+
+def flows(df, start=None, end=None):
+    """
+    Income, expenses and net cash flow of a ledger between two dates, both inclusive.
+    
+    Args:
+        df: Ledger DataFrame or cube
+        start: First date of the range (default: start of the ledger)
+        end: Last date of the range (default: end of the ledger)
+    
+    Returns:
+        Dict with income, expenses and net in dollars
+    """
+    return {key: to_dollars(cents) for key, cents in flow_cents(balance_index(df), start, end).items()}
+
+def runway(df, as_of=None):
+    """
+    Emergency fund runway of a ledger.
+    
+    Args:
+        df: Ledger DataFrame or cube
+        as_of: Date to compute the runway at: savings up to that date and
+            average expenses of the months up to and including its month
+            (default: end of the ledger)
+    
+    Returns:
+        Dict with runway_months, savings and avg_monthly_expenses
+    """
+    cube = as_cube(df)
+    savings = calculate_total_savings(cube, as_of)  # Validates as_of
+    monthly = calculate_monthly_cashflow(cube)
+    if as_of is not None:
+        monthly = monthly[monthly['month'] <= str(pd.Period(as_of, 'M'))]
+    return {
+        'runway_months': calculate_emergency_runway(monthly, savings),
+        'savings': savings,
+        'avg_monthly_expenses': monthly['expenses'].mean()
+    }
+
+def plan_goal(df, goal_amount, target, income_change=0, expense_change=0):
+    """
+    Check a savings goal against a ledger's cash flow.
+    
+    Args:
+        df: Ledger DataFrame
+        goal_amount: The target savings amount
+        target: Target date (e.g. '2025-12-31') or a number of months
+        income_change: Amount added to average monthly income (may be negative)
+        expense_change: Amount added to average monthly expenses (may be negative)
+    
+    Returns:
+        Dict from check_savings_goal()
+    """
+    cube = as_cube(df)
+    return check_savings_goal(calculate_monthly_cashflow(cube), calculate_total_savings(cube),
+                              goal_amount, target, income_change, expense_change)
+
+def plan_goals(df, goal_amounts, target_dates, today=None):
+    """
+    Plan several goals and candidate target dates against a ledger's savings and average net cash flow.
+    
+    Args:
+        df: Ledger DataFrame
+        goal_amounts: Target savings amounts (broadcast against target_dates)
+        target_dates: Target dates
+        today: Date to plan from (default: today)
+    
+    Returns:
+        Dict from solve_savings_goals()
+    """
+    cube = as_cube(df)
+    return solve_savings_goals(goal_amounts, target_dates, calculate_total_savings(cube),
+                               calculate_monthly_cashflow(cube)['net_cashflow'].mean(), today)
+
+def scenario(df, months, income_change=0, expense_change=0):
+    """
+    Project a what-if scenario from a ledger's average income and expenses.
+    
+    Args:
+        df: Ledger DataFrame
+        months: Number of months to project
+        income_change: Amount added to average monthly income (may be negative)
+        expense_change: Amount added to average monthly expenses (may be negative)
+    
+    Returns:
+        Dict from project_scenario()
+    """
+    return project_scenario(calculate_monthly_cashflow(df), months, income_change, expense_change)
+
+def scenario_grid(df, income_changes=(0,), expense_changes=(0,), horizons=(12,)):
+    """
+    Project every combination of income and expense changes from a ledger's averages.
+    
+    Args:
+        df: Ledger DataFrame
+        income_changes: Amounts added to average monthly income
+        expense_changes: Amounts added to average monthly expenses
+        horizons: Months after which to report cumulative savings
+    
+    Returns:
+        Dict from project_scenario_grid()
+    """
+    return project_scenario_grid(calculate_monthly_cashflow(df), income_changes, expense_changes, horizons)
+
+def simulate(df, months=120, paths=10_000, goal_amount=None, income_change=0, expense_change=0, seed=0,
+             method='category', max_workers=1):
+    """
+    Monte Carlo savings bands for a ledger, starting from its total savings.
+    
+    Args:
+        df: Ledger DataFrame
+        months: Number of months to simulate
+        paths: Number of simulated paths
+        goal_amount: Optional savings goal to check at the last month
+        income_change: Amount added to every month's income (may be negative)
+        expense_change: Amount added to every month's expenses (may be negative)
+        seed: Random seed
+        method: 'category' or 'month'
+        max_workers: Worker processes (None: one per CPU; 1: in-process)
+    
+    Returns:
+        Dict from simulate_cashflow()
+    """
+    cube = as_cube(df)
+    return simulate_cashflow(cube, months, paths, calculate_total_savings(cube), goal_amount, income_change,
+                             expense_change, seed=seed, method=method, max_workers=max_workers)
+
+def category_breakdown(df):
+    """
+    Expense totals and percentages per category of a ledger.
+    
+    Returns a DataFrame with columns: Category, Amount, Percentage
+    """
+    return calculate_category_breakdown(df)
 
 # Main menu system
-def main_menu():
-    """Interactive menu for personal finance analyzer."""
+def main_menu(cube, monthly, savings, runway_months):
+    """
+    Interactive menu for personal finance analyzer.
+    
+    Args:
+        cube: Pre-aggregated ledger from build_cube()
+        monthly: Monthly cash flow from calculate_monthly_cashflow(cube)
+        savings: Total savings from calculate_total_savings(cube)
+        runway_months: Runway from calculate_emergency_runway()
+    """
     
     print("\n" + "="*50)
     print("     PERSONAL FINANCE ANALYZER - MAIN MENU")
@@ -410,23 +845,24 @@ def main_menu():
         print("3. Emergency Fund Runway")
         print("4. Scenario Projection & Analysis")
         print("5. Category Spending Breakdown")
+        print("6. Cash Flow by Period (day/week/month/quarter/year)")
         print("0. Exit")
         
-        choice = input("\nEnter your choice (0-5): ").strip()
+        choice = input("\nEnter your choice (0-6): ").strip()
         
         if choice == '1':
             print("\n--- Monthly Cash Flow Summary ---")
-            print(monthly_cashflow)
+            print(monthly)
             
         elif choice == '2':
             print(f"\n--- Total Savings ---")
-            print(f"Total Savings from Data: ${total_savings:.2f}")
+            print(f"Total Savings from Data: ${savings:.2f}")
             
         elif choice == '3':
             print(f"\n--- Emergency Fund Runway ---")
-            print(f"Runway: {runway:.1f} months")
-            print(f"Savings: ${total_savings:.2f}")
-            print(f"Avg Monthly Expenses: ${monthly_cashflow['expenses'].mean():.2f}")
+            print(f"Runway: {runway_months:.1f} months")
+            print(f"Savings: ${savings:.2f}")
+            print(f"Avg Monthly Expenses: ${monthly['expenses'].mean():.2f}")
             
         elif choice == '4':
             print("\n--- Scenario Projection & Analysis ---")
@@ -438,30 +874,26 @@ def main_menu():
                 print("4. Change both income and expenses")
                 scenario_choice = input("Enter scenario choice (1-4): ").strip()
 
-                current_date = pd.to_datetime(datetime.now())
-                avg_income = monthly_cashflow['income'].mean()
-                avg_expenses = monthly_cashflow['expenses'].mean()
+                avg_income = monthly['income'].mean()
+                avg_expenses = monthly['expenses'].mean()
 
-                # Determine adjusted income/expenses based on scenario (ask change immediately)
-                new_income = avg_income
-                new_expenses = avg_expenses
+                # Determine income/expense changes based on scenario (ask change immediately)
+                income_change = 0
+                expense_change = 0
 
                 if scenario_choice == '1':
                     scenario_desc = "No change"
                 elif scenario_choice == '2':
-                    change = float(input("Enter income change amount (use + or - as needed, e.g. +500 or -300): $"))
-                    new_income = avg_income + change
-                    scenario_desc = f"Income change: {change:+.2f} (now ${new_income:.2f})"
+                    income_change = float(input("Enter income change amount (use + or - as needed, e.g. +500 or -300): $"))
+                    scenario_desc = f"Income change: {income_change:+.2f} (now ${avg_income + income_change:.2f})"
                 elif scenario_choice == '3':
-                    change = float(input("Enter expense change amount (use + or - as needed, e.g. +200 or -100): $"))
-                    new_expenses = avg_expenses + change
-                    scenario_desc = f"Expense change: {change:+.2f} (now ${new_expenses:.2f})"
+                    expense_change = float(input("Enter expense change amount (use + or - as needed, e.g. +200 or -100): $"))
+                    scenario_desc = f"Expense change: {expense_change:+.2f} (now ${avg_expenses + expense_change:.2f})"
                 elif scenario_choice == '4':
-                    inc = float(input("Enter income change (use + or - as needed): $"))
-                    exp = float(input("Enter expense change (use + or - as needed): $"))
-                    new_income = avg_income + inc
-                    new_expenses = avg_expenses + exp
-                    scenario_desc = f"Income change: {inc:+.2f}, Expense change: {exp:+.2f} (now ${new_income:.2f}, ${new_expenses:.2f})"
+                    income_change = float(input("Enter income change (use + or - as needed): $"))
+                    expense_change = float(input("Enter expense change (use + or - as needed): $"))
+                    scenario_desc = (f"Income change: {income_change:+.2f}, Expense change: {expense_change:+.2f} "
+                                     f"(now ${avg_income + income_change:.2f}, ${avg_expenses + expense_change:.2f})")
                 else:
                     print("Invalid scenario choice.")
                     continue
@@ -470,77 +902,59 @@ def main_menu():
                 print("\nWhat would you like to see?")
                 print("1. Projected cumulative savings after X months")
                 print("2. Check whether a savings goal is achievable")
-                view_choice = input("Enter choice (1-2): ").strip()
+                print("3. Simulate a range of outcomes (Monte Carlo)")
+                view_choice = input("Enter choice (1-3): ").strip()
 
                 # If user wants cumulative projection
                 if view_choice == '1':
                     months = int(input("How many months to project? "))
-                    projections = []
-                    for i in range(1, months + 1):
-                        future_date = current_date + pd.DateOffset(months=i)
-                        projected_month = future_date.strftime('%Y-%m')
-                        net = new_income - new_expenses
-                        projections.append({
-                            'month': projected_month,
-                            'income': new_income,
-                            'expenses': new_expenses,
-                            'net_cashflow': net
-                        })
-
-                    projection_df = pd.DataFrame(projections)
-                    projection_df['cumulative_savings'] = projection_df['net_cashflow'].cumsum()
-
-                    baseline_net = avg_income - avg_expenses
-                    baseline_cumulative = baseline_net * months
-                    scenario_cumulative = (new_income - new_expenses) * months
+                    result = project_scenario(monthly, months, income_change, expense_change)
 
                     print(f"\n--- Scenario: {scenario_desc} ---")
-                    print(projection_df.to_string(index=False))
-                    print(f"\nFinal Cumulative Savings after {months} months: ${projection_df['cumulative_savings'].iloc[-1]:.2f}")
+                    print(result['projection'].to_string(index=False))
+                    print(f"\nFinal Cumulative Savings after {months} months: ${result['projection']['cumulative_savings'].iloc[-1]:.2f}")
                     if scenario_choice != '1':
-                        difference = scenario_cumulative - baseline_cumulative
                         print(f"\nComparison to Baseline:")
-                        print(f"Baseline Final Worth: ${baseline_cumulative:.2f}")
-                        print(f"Scenario Final Worth: ${scenario_cumulative:.2f}")
-                        print(f"Difference: ${difference:.2f} ({(difference/abs(baseline_cumulative)*100) if baseline_cumulative != 0 else 0:.1f}%)")
+                        print(f"Baseline Final Worth: ${result['baseline_cumulative']:.2f}")
+                        print(f"Scenario Final Worth: ${result['scenario_cumulative']:.2f}")
+                        print(f"Difference: ${result['difference']:.2f} ({result['difference_pct']:.1f}%)")
 
                 # If user wants to check savings goal feasibility
                 elif view_choice == '2':
                     goal_amount = float(input("Enter savings goal amount: $"))
                     target_input = input("Enter target date (YYYY-MM-DD) or number of months: ").strip()
-                    # try parse as date first
-                    try:
-                        target_date = pd.to_datetime(target_input)
-                        days_to_target = (target_date - current_date).days
-                        if days_to_target <= 0:
-                            print("Target date is in the past.")
-                            continue
-                        months_to_target = days_to_target / 30.44
-                    except Exception:
-                        # treat as months
-                        months_to_target = float(target_input)
-
-                    remaining_needed = goal_amount - total_savings
-                    if remaining_needed <= 0:
-                        required_monthly = 0.0
-                    else:
-                        required_monthly = remaining_needed / months_to_target
-
-                    projected_monthly_net = new_income - new_expenses
-                    achievable = required_monthly <= projected_monthly_net
-                    surplus = projected_monthly_net - required_monthly
+                    goal = check_savings_goal(monthly, savings, goal_amount, target_input,
+                                              income_change, expense_change)
+                    if 'error' in goal:
+                        print(f"{goal['error']}.")
+                        continue
 
                     print(f"\nSavings Goal Check under scenario: {scenario_desc}")
                     print(f"Goal Amount: ${goal_amount:.2f}")
-                    print(f"Months to Target: {months_to_target:.2f}")
-                    print(f"Remaining Needed (after existing savings of ${total_savings:.2f}): ${remaining_needed:.2f}")
-                    print(f"Required Monthly Savings: ${required_monthly:.2f}")
-                    print(f"Projected Monthly Net Cash Flow under scenario: ${projected_monthly_net:.2f}")
-                    print(f"Achievable: {'Yes' if achievable else 'No'}")
-                    if achievable:
-                        print(f"Surplus per month: ${surplus:.2f}")
+                    print(f"Months to Target: {goal['months_to_target']:.2f}")
+                    print(f"Remaining Needed (after existing savings of ${savings:.2f}): ${goal['remaining_needed']:.2f}")
+                    print(f"Required Monthly Savings: ${goal['required_monthly_savings']:.2f}")
+                    print(f"Projected Monthly Net Cash Flow under scenario: ${goal['projected_monthly_net']:.2f}")
+                    print(f"Achievable: {'Yes' if goal['achievable'] else 'No'}")
+                    if goal['achievable']:
+                        print(f"Surplus per month: ${goal['surplus']:.2f}")
                     else:
-                        print(f"Shortfall per month: ${-surplus:.2f}")
+                        print(f"Shortfall per month: ${-goal['surplus']:.2f}")
+
+                # If user wants a range of outcomes rather than the average
+                elif view_choice == '3':
+                    months = int(input("How many months to simulate? "))
+                    goal_input = input("Savings goal amount (optional, press Enter to skip): $").strip()
+                    goal_amount = float(goal_input) if goal_input else None
+                    simulation = simulate_cashflow(cube, months, savings=savings, goal_amount=goal_amount,
+                                                   income_change=income_change, expense_change=expense_change)
+
+                    print(f"\n--- Simulated Savings ({simulation['paths']:,} paths): {scenario_desc} ---")
+                    print(simulation['bands'].to_string(index=False))
+                    print("\np5/p95: 5% of simulated paths end below/above these amounts")
+                    if goal_amount is not None:
+                        print(f"Chance of reaching ${goal_amount:.2f} within {months} months: "
+                              f"{simulation['goal_probability']:.0%}")
 
                 else:
                     print("Invalid view choice.")
@@ -551,22 +965,46 @@ def main_menu():
                 
         elif choice == '5':
             print("\n--- Category Spending Breakdown ---")
-            category_breakdown = calculate_category_breakdown(df)
+            category_breakdown = calculate_category_breakdown(cube)
             print(category_breakdown.to_string(index=False))
             total_expenses_breakdown = category_breakdown['Amount'].sum()
             print(f"\nTotal Expenses: ${total_expenses_breakdown:.2f}")
             
             # Display Delayed Gratification Insights
-            display_delayed_gratification_insights(df)
+            display_delayed_gratification_insights(cube)
+            
+        elif choice == '6':
+            granularity = input(f"Period ({'/'.join(GRANULARITIES)}) [month]: ").strip().lower() or 'month'
+            if granularity not in GRANULARITIES:
+                print(f"Invalid period. Please enter one of: {', '.join(GRANULARITIES)}.")
+                continue
+            print(f"\n--- Cash Flow by {granularity.capitalize()} ---")
+            print(calculate_cashflow(cube, granularity).to_string(index=False))
             
         elif choice == '0':
             print("\nThank you for using Personal Finance Analyzer. Goodbye!")
             break
             
         else:
-            print("Invalid choice. Please enter 0-5.")
+            print("Invalid choice. Please enter 0-6.")
+
+def main():
+    """Load a ledger interactively and run the main menu."""
+    df = prompt_for_ledger()
+    
+    # The dataframe is now loaded and validated
+    if df is None:
+        print("Cannot proceed without valid data. Exiting.")
+        return
+    
+    # Aggregate once; every report is then served from the cube instead of the rows
+    cube = build_cube(df)
+    monthly = calculate_monthly_cashflow(cube)
+    savings = calculate_total_savings(cube)
+    runway_months = calculate_emergency_runway(monthly, savings)
+    main_menu(cube, monthly, savings, runway_months)
 
-# Run main menu
-main_menu()
+if __name__ == '__main__':
+    main()
 
 
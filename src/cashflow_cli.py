@@ -0,0 +1,316 @@
+"""
+Batch Command-Line Module
+
+This module runs cashflow reports without the interactive menu by:
+1. Parsing the requested reports and ledgers from the command line
+2. Loading each ledger once and computing only the requested reports,
+   sharing intermediate results (monthly cash flow, savings) between them
+3. Writing machine-readable JSON (one object per ledger per line) or CSV,
+   with optional per-ledger and per-report timings on stderr
+
+Examples:
+    python src/cashflow_cli.py monthly runway -l data/multi_month_transactions.csv
+    python src/cashflow_cli.py cashflow --granularity week -l data/multi_month_transactions.csv
+    python src/cashflow_cli.py scenario --months 24 --income-change 500 -l a.csv -l b.csv
+    python src/cashflow_cli.py monthly --format csv -l 'exports/*.csv'
+    python src/cashflow_cli.py monthly breakdown --format csv --output-dir out -l a.csv
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import time
+from datetime import datetime
+
+from lazy_imports import import_seconds
+from ledger_cube import GRANULARITIES
+from ledger_stream import STREAMING_LEDGER_BYTES, STREAMING_REPORTS, stream_aggregates, stream_report
+from monte_carlo import SIMULATION_METHODS
+from small_ledger import SMALL_LEDGER_REPORTS, aggregate_small_ledger, read_small_ledger, small_ledger_report
+
+REPORTS = ('monthly', 'cashflow', 'savings', 'runway', 'scenario', 'simulate', 'breakdown', 'insights', 'history')
+
+# Key holding the row table of reports that also carry summary fields (CSV writes only the table)
+TABLE_KEYS = {'scenario': 'projection', 'simulate': 'bands', 'insights': 'delayed_gratification', 'history': 'trends'}
+
+
+def build_parser():
+    """Build the argument parser for the batch CLI."""
+    parser = argparse.ArgumentParser(
+        description="Compute cashflow reports for one or more ledgers without prompting.")
+    parser.add_argument('reports', nargs='+', choices=REPORTS, metavar='REPORT',
+                        help=f"Reports to compute: {', '.join(REPORTS)}")
+    parser.add_argument('-l', '--ledger', action='append', required=True, dest='ledgers',
+                        help="CSV file, directory or glob pattern; repeat for several ledgers")
+    parser.add_argument('--format', choices=('json', 'csv'), default='json',
+                        help="Output format (default: json)")
+    parser.add_argument('--output-dir',
+                        help="Write one <report>.csv per report here (required for several CSV reports)")
+    parser.add_argument('--granularity', choices=GRANULARITIES, default='month',
+                        help="Period of the cashflow report (default: month)")
+    parser.add_argument('--as-of', metavar='YYYY-MM-DD',
+                        help="Read savings and runway at the end of this date (default: end of the ledger)")
+    parser.add_argument('--months', type=int, default=12,
+                        help="Months to project for the scenario and simulate reports (default: 12)")
+    parser.add_argument('--income-change', type=float, default=0.0,
+                        help="Change to average monthly income for the scenario report")
+    parser.add_argument('--expense-change', type=float, default=0.0,
+                        help="Change to average monthly expenses for the scenario report")
+    parser.add_argument('--paths', type=int, default=10_000,
+                        help="Simulated paths for the simulate report (default: 10000)")
+    parser.add_argument('--goal', type=float,
+                        help="Savings goal whose probability the simulate report estimates")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="Random seed for the simulate report (default: 0)")
+    parser.add_argument('--method', choices=SIMULATION_METHODS, default='category',
+                        help="Bootstrap each category's months or whole months (default: category)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes for the simulate report (default: 1)")
+    parser.add_argument('--stream-bytes', type=int, default=STREAMING_LEDGER_BYTES, metavar='BYTES',
+                        help="Summarize single-file ledgers at least this large in bounded memory "
+                             f"(default: {STREAMING_LEDGER_BYTES})")
+    parser.add_argument('--timings', action='store_true',
+                        help="Print startup, load and per-report timings to stderr as JSON")
+    return parser
+
+
+def to_json_value(value):
+    """
+    Convert report values into JSON-serializable Python values.
+
+    DataFrames become lists of records and non-finite floats (e.g. an
+    infinite runway) become None, so the output is strict JSON.
+    """
+    if hasattr(value, 'to_dict'):
+        return [to_json_value(record) for record in value.to_dict('records')]
+    if isinstance(value, dict):
+        return {str(key): to_json_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json_value(item) for item in value]
+    if hasattr(value, 'item'):
+        value = value.item()  # NumPy scalar -> Python scalar
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def compute_reports(cashflow, df, reports, options):
+    """
+    Compute the requested reports for one ledger.
+
+    Args:
+        cashflow: The imported cashflow module
+        df: Ledger DataFrame from cashflow.load_ledger()
+        reports: Report names to compute, in output order
+        options: Parsed arguments (granularity, as_of, months, income_change,
+            expense_change and the simulation settings)
+
+    Returns:
+        Tuple (results, seconds) of report name -> result and report name ->
+        compute time; shared intermediates (the cube, monthly cash flow,
+        savings) are charged to the first report using them
+    """
+    shared = {}
+
+    def cube():
+        # Every report is served from one pre-aggregated cube instead of re-scanning rows
+        if 'cube' not in shared:
+            shared['cube'] = cashflow.build_cube(df)
+        return shared['cube']
+
+    def monthly():
+        if 'monthly' not in shared:
+            shared['monthly'] = cashflow.calculate_monthly_cashflow(cube())
+        return shared['monthly']
+
+    def savings():
+        if 'savings' not in shared:
+            shared['savings'] = cashflow.calculate_total_savings(cube(), options.as_of)
+        return shared['savings']
+
+    results, seconds = {}, {}
+    for name in reports:
+        start = time.perf_counter()
+        if name == 'monthly':
+            result = monthly()
+        elif name == 'cashflow':
+            result = cashflow.calculate_cashflow(cube(), options.granularity)
+        elif name == 'savings':
+            result = {'total_savings': savings()}
+        elif name == 'runway' and options.as_of is not None:
+            result = cashflow.runway(cube(), options.as_of)
+        elif name == 'runway':
+            result = {
+                'runway_months': cashflow.calculate_emergency_runway(monthly(), savings()),
+                'savings': savings(),
+                'avg_monthly_expenses': monthly()['expenses'].mean()
+            }
+        elif name == 'scenario':
+            result = cashflow.project_scenario(monthly(), options.months,
+                                               options.income_change, options.expense_change)
+        elif name == 'simulate':
+            result = cashflow.simulate_cashflow(cube(), options.months, options.paths, savings(), options.goal,
+                                                options.income_change, options.expense_change, seed=options.seed,
+                                                method=options.method, max_workers=options.workers)
+        elif name == 'breakdown':
+            result = cashflow.calculate_category_breakdown(cube())
+        elif name == 'history':
+            from delayed_gratification import detect_delayed_gratification_history, get_category_trend_history
+            result = {
+                'trends': get_category_trend_history(cube()),
+                'delayed_gratification': detect_delayed_gratification_history(cube())
+            }
+        else:  # insights
+            from delayed_gratification import generate_delayed_gratification_insights
+            insights = generate_delayed_gratification_insights(cube())
+            result = {
+                'delayed_gratification': insights['delayed_gratification'],
+                'summary': insights['summary'].strip()
+            }
+        results[name] = result
+        seconds[name] = time.perf_counter() - start
+    return results, seconds
+
+
+def report_records(name, result):
+    """
+    Flatten a report result into JSON-ready row dicts for CSV output.
+
+    Returns:
+        List of dicts, one per row (a single row for scalar reports)
+    """
+    records = to_json_value(result[TABLE_KEYS[name]] if name in TABLE_KEYS else result)
+    return records if isinstance(records, list) else [records]
+
+
+def write_csv_rows(sinks, name, ledger, records, output_dir):
+    """
+    Append one ledger's report rows to the report's CSV, writing the header once.
+
+    Args:
+        sinks: Dict of report name -> (file handle, csv.DictWriter), updated in place
+        name: Report name
+        ledger: Ledger path, written as the leading 'ledger' column
+        records: Row dicts from report_records()
+        output_dir: Directory for <report>.csv files, or None for stdout
+    """
+    if not records:
+        return
+    if name not in sinks:
+        handle = open(os.path.join(output_dir, f"{name}.csv"), 'w', newline='') if output_dir else sys.stdout
+        writer = csv.DictWriter(handle, fieldnames=['ledger', *records[0]], lineterminator='\n')
+        writer.writeheader()
+        sinks[name] = (handle, writer)
+    sinks[name][1].writerows({'ledger': ledger, **record} for record in records)
+
+
+def main(argv=None):
+    """
+    Run the batch CLI.
+
+    Small single-file ledgers asking only for summary reports are handled
+    by small_ledger without importing pandas, and single files of at least
+    --stream-bytes are summarized chunk by chunk by ledger_stream; everything
+    else goes through cashflow, which is imported on first need.
+
+    Args:
+        argv: Argument list (default: sys.argv[1:])
+
+    Returns:
+        Process exit code: 0 on success, 1 if any ledger failed to load
+    """
+    parser = build_parser()
+    options = parser.parse_args(argv)
+    reports = list(dict.fromkeys(options.reports))  # Drop repeats, keep order
+    if options.format == 'csv' and len(reports) > 1 and not options.output_dir:
+        parser.error("several CSV reports need --output-dir (one <report>.csv per report)")
+    if options.months < 1 or options.paths < 1 or options.workers < 1:
+        parser.error("--months, --paths and --workers must be positive")
+    if options.as_of is not None:
+        try:
+            datetime.strptime(options.as_of, '%Y-%m-%d')
+        except ValueError:
+            parser.error(f"invalid --as-of date '{options.as_of}' (use YYYY-MM-DD)")
+    if options.output_dir:
+        os.makedirs(options.output_dir, exist_ok=True)
+    # The pure-Python path only knows whole-ledger totals
+    small_reports = options.as_of is None and all(name in SMALL_LEDGER_REPORTS for name in reports)
+    stream_reports = options.as_of is None and all(name in STREAMING_REPORTS for name in reports)
+
+    cashflow = None
+    module_seconds = {}
+    sinks = {}
+    failed = False
+    try:
+        for ledger in options.ledgers:
+            start = time.perf_counter()
+            streamed = stream_reports and os.path.isfile(ledger) and os.path.getsize(ledger) >= options.stream_bytes
+            small = read_small_ledger(ledger) if small_reports and not streamed else None
+            if small is not None:
+                aggregates = aggregate_small_ledger(small)
+                load_seconds = time.perf_counter() - start
+                results, seconds = {}, {}
+                for name in reports:
+                    report_start = time.perf_counter()
+                    results[name] = small_ledger_report(aggregates, name)
+                    seconds[name] = time.perf_counter() - report_start
+                path, rows = 'small', len(small)
+            elif streamed:
+                try:
+                    aggregates = stream_aggregates(ledger)
+                except (ValueError, OSError) as e:
+                    failed = True
+                    error = {'ledger': ledger, 'error': str(e)}
+                    print(json.dumps(error), file=sys.stdout if options.format == 'json' else sys.stderr)
+                    continue
+                load_seconds = time.perf_counter() - start
+                results, seconds = {}, {}
+                for name in reports:
+                    report_start = time.perf_counter()
+                    results[name] = stream_report(aggregates, name)
+                    seconds[name] = time.perf_counter() - report_start
+                path, rows = 'stream', aggregates['rows']
+            else:
+                if cashflow is None:
+                    import_start = time.perf_counter()
+                    import cashflow
+                    module_seconds['cashflow'] = time.perf_counter() - import_start
+                    start = time.perf_counter()
+                try:
+                    df, _ = cashflow.load_ledger(ledger)
+                except (ValueError, OSError) as e:
+                    # One bad ledger must not abort a nightly batch
+                    failed = True
+                    error = {'ledger': ledger, 'error': str(e)}
+                    print(json.dumps(error), file=sys.stdout if options.format == 'json' else sys.stderr)
+                    continue
+                load_seconds = time.perf_counter() - start
+                results, seconds = compute_reports(cashflow, df, reports, options)
+                path, rows = 'full', len(df)
+
+            if options.format == 'json':
+                print(json.dumps({'ledger': ledger, **to_json_value(results)}))
+            else:
+                for name in reports:
+                    write_csv_rows(sinks, name, ledger, report_records(name, results[name]), options.output_dir)
+
+            if options.timings:
+                print(json.dumps({'ledger': ledger, 'path': path, 'rows': rows, 'load_seconds': load_seconds,
+                                  'report_seconds': seconds}), file=sys.stderr)
+    finally:
+        for handle, _ in sinks.values():
+            if handle is not sys.stdout:
+                handle.close()
+
+    if options.timings:
+        # Deferred imports (pandas, NumPy) are charged here rather than to the first load that used them
+        module_seconds.update(import_seconds())
+        print(json.dumps({'import_seconds': module_seconds}), file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
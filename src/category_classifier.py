@@ -0,0 +1,195 @@
+"""
+Category Classifier Module
+
+This module classifies category names against keyword taxonomies in time
+independent of the number of keywords by:
+1. Compiling every keyword into one Aho-Corasick automaton (a complete
+   transition table), so a single scan of a name finds every keyword it
+   contains
+2. Precomputing every substring of every keyword, so "the name is part of a
+   keyword" is a single set lookup
+3. Memoizing single-name lookups in a bounded LRU cache
+4. Classifying whole arrays by stepping the automaton over every distinct
+   name at once: one NumPy gather per character position, with names
+   batched by length so padding stays small
+
+Taxonomies are given in precedence order. A name takes the label of the first
+taxonomy with an exact keyword match; failing that, of the first taxonomy
+with a keyword inside the name or the name inside a keyword; else the default.
+"""
+
+from collections import deque
+from functools import lru_cache
+
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Distinct names remembered by CategoryClassifier.classify()
+CLASSIFIER_CACHE_SIZE = 65_536
+
+# Names scanned together by classify_many(); batches hold names of similar length
+SCAN_BATCH = 8192
+
+
+class CategoryClassifier:
+    """Compiled keyword classifier with substring matching in both directions."""
+
+    def __init__(self, taxonomies, default='unknown', cache_size=CLASSIFIER_CACHE_SIZE):
+        """
+        Compile the taxonomies.
+
+        Args:
+            taxonomies: Sequence of (label, keywords) pairs in precedence order;
+                keywords are matched case-insensitively
+            default: Label for names matching no taxonomy
+            cache_size: Size of the LRU memo behind classify()
+        """
+        self.labels = [label for label, _ in taxonomies]
+        self.default = default
+        self._exact = {}
+        self._substrings = []
+        goto, output = [{}], [0]
+        for bit, (label, keywords) in enumerate(taxonomies):
+            substrings = set()
+            for keyword in keywords:
+                keyword = keyword.lower()
+                self._exact.setdefault(keyword, label)
+                substrings.update(keyword[start:end] for start in range(len(keyword) + 1)
+                                  for end in range(start, len(keyword) + 1))
+                state = 0
+                for char in keyword:
+                    if char not in goto[state]:
+                        goto.append({})
+                        output.append(0)
+                        goto[state][char] = len(goto) - 1
+                    state = goto[state][char]
+                if keyword:
+                    output[state] |= 1 << bit
+            self._substrings.append(substrings)
+        self._delta, self._output = self._compile(goto, output)
+        self._table = None
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+
+    @staticmethod
+    def _compile(goto, output):
+        """Turn the keyword trie into a complete transition table (breadth-first over failure links)."""
+        delta = [None] * len(goto)
+        delta[0] = dict(goto[0])
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            # A state matches everything its longest proper suffix state matches
+            output[state] |= output[fail[state]]
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            for char, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(char, 0)
+                queue.append(child)
+        return delta, output
+
+    def _scan(self, text):
+        """Bitmask of the taxonomies with a keyword inside text."""
+        delta, output = self._delta, self._output
+        state = mask = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            mask |= output[state]
+        return mask
+
+    def _vector_form(self):
+        """
+        NumPy/pandas form of the classifier, built on first use.
+
+        Returns:
+            Dict containing:
+            - alphabet: sorted int64 code points of the keyword characters
+            - table: int32 transitions (states, alphabet + 1); column 0 stands
+              for any character outside the alphabet
+            - output: int64 keyword bitmask per state
+            - exact: Index of exact keywords, with exact_bits their taxonomy
+            - substrings: one Index of keyword substrings per taxonomy
+        """
+        if self._table is None:
+            alphabet = sorted({char for transitions in self._delta for char in transitions})
+            columns = {char: column for column, char in enumerate(alphabet, start=1)}
+            table = np.zeros((len(self._delta), len(alphabet) + 1), dtype='int32')
+            for state, transitions in enumerate(self._delta):
+                for char, target in transitions.items():
+                    table[state, columns[char]] = target
+            self._table = {
+                'alphabet': np.array([ord(char) for char in alphabet], dtype='int64'),
+                'table': table,
+                'output': np.array(self._output, dtype='int64'),
+                'exact': pd.Index(list(self._exact), dtype=object),
+                'exact_bits': np.array([self.labels.index(label) for label in self._exact.values()]),
+                'substrings': [pd.Index(sorted(substrings), dtype=object) for substrings in self._substrings]
+            }
+        return self._table
+
+    def _scan_many(self, texts):
+        """Keyword bitmasks for an array of texts (the vectorized _scan())."""
+        form = self._vector_form()
+        alphabet, table, output = form['alphabet'], form['table'], form['output']
+        masks = np.zeros(len(texts), dtype='int64')
+        order = np.argsort(texts.str.len().to_numpy(), kind='stable')
+        for start in range(0, len(texts), SCAN_BATCH):
+            batch = order[start:start + SCAN_BATCH]
+            # Fixed-width UTF-32: one code point per cell, shorter names padded with code 0
+            codes = np.array(texts[batch].tolist(), dtype=str)
+            codes = codes.view(np.uint32).reshape(len(batch), -1).astype('int64')
+            columns = np.searchsorted(alphabet, codes) + 1
+            columns[alphabet[np.minimum(columns - 1, len(alphabet) - 1)] != codes] = 0
+            state = np.zeros(len(batch), dtype='int32')
+            mask = np.zeros(len(batch), dtype='int64')
+            for position in range(codes.shape[1]):
+                state = table[state, columns[:, position]]
+                mask |= output[state]
+            masks[batch] = mask
+        return masks
+
+    def _decide(self, name, mask):
+        """Label of a lower-cased, stripped name given its keyword bitmask."""
+        label = self._exact.get(name)
+        if label is not None:
+            return label
+        for bit, (label, substrings) in enumerate(zip(self.labels, self._substrings)):
+            if mask >> bit & 1 or name in substrings:
+                return label
+        return self.default
+
+    def _classify(self, name):
+        """Classify one name (uncached)."""
+        name = name.lower().strip()
+        if name in self._exact:
+            return self._exact[name]
+        return self._decide(name, self._scan(name))
+
+    def classify_many(self, names):
+        """
+        Classify an array of names, scanning each distinct name once.
+
+        Args:
+            names: Iterable of category names
+
+        Returns:
+            List of labels, one per name
+        """
+        codes, unique = pd.factorize(pd.Index(list(names), dtype=object))
+        if len(unique) == 0:
+            return []
+        texts = pd.Index(unique, dtype=object).str.lower().str.strip()
+        form = self._vector_form()
+        masks = self._scan_many(texts)
+
+        # Later taxonomies first, so earlier ones overwrite them; exact matches beat everything
+        choice = np.full(len(texts), len(self.labels))
+        for bit in reversed(range(len(self.labels))):
+            hit = (masks >> bit & 1).astype(bool) | (form['substrings'][bit].get_indexer(texts) >= 0)
+            choice[hit] = bit
+        exact = form['exact'].get_indexer(texts)
+        choice = np.where(exact >= 0, form['exact_bits'][exact], choice)
+
+        labels = np.array([*self.labels, self.default], dtype=object)
+        return labels[choice[codes]].tolist()
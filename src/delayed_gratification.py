@@ -2,13 +2,24 @@
 Delayed Gratification Insights Module
 
 This module detects, quantifies, and rewards delayed gratification behavior by:
-1. Analyzing category spending trends month-over-month
+1. Analyzing category spending trends month-over-month, for the latest
+   month or for every month of the history at once
 2. Detecting reductions in discretionary spending
 3. Projecting future value and mapping to meaningful outcomes
 """
 
-import pandas as pd
+from collections.abc import Sequence
 from datetime import datetime
+from functools import lru_cache
+
+from category_classifier import CategoryClassifier
+from lazy_imports import lazy_import
+from ledger_cube import category_month_expenses, total_cents
+from money import to_dollars
+from transaction_loader import ordinals_to_periods
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
 
 # Category classifications
 DISCRETIONARY_CATEGORIES = {
@@ -40,33 +51,51 @@ REWARD_MAPPING = [
 MINIMUM_REDUCTION_THRESHOLD = 20  # dollars
 MINIMUM_REDUCTION_PERCENT = 10  # percent
 
+# Months ahead to project saved amounts, and how the insight text names them
+PROJECTION_HORIZONS = (6, 24, 60)
+HORIZON_LABELS = {6: "In 6 months", 24: "In 2 years", 60: "In 5 years"}
+
+# '.00' to '.99', indexed by cents
+CENT_SUFFIXES = [f".{cents:02d}" for cents in range(100)]
+
+
+@lru_cache(maxsize=None)
+def category_classifier():
+    """
+    The compiled classifier for DISCRETIONARY_CATEGORIES and ESSENTIAL_CATEGORIES.
+    
+    Built on first use, so changes to the keyword sets after that are not seen.
+    """
+    return CategoryClassifier([('discretionary', DISCRETIONARY_CATEGORIES), ('essential', ESSENTIAL_CATEGORIES)])
+
 
 def classify_category(category_name):
     """
     Classify a category as discretionary, essential, or unknown.
     
+    Exact keyword matches come first (discretionary, then essential), then
+    substring matches either way round (discretionary, then essential).
+    
     Args:
         category_name: String category name
     
     Returns:
         'discretionary', 'essential', or 'unknown'
     """
-    category_lower = category_name.lower().strip()
+    return category_classifier().classify(category_name)
+
+
+def classify_categories(category_names):
+    """
+    Classify many categories at once, with the same rules as classify_category().
     
-    if category_lower in DISCRETIONARY_CATEGORIES:
-        return 'discretionary'
-    elif category_lower in ESSENTIAL_CATEGORIES:
-        return 'essential'
-    else:
-        # Try substring matching
-        for disc_cat in DISCRETIONARY_CATEGORIES:
-            if disc_cat in category_lower or category_lower in disc_cat:
-                return 'discretionary'
-        for ess_cat in ESSENTIAL_CATEGORIES:
-            if ess_cat in category_lower or category_lower in ess_cat:
-                return 'essential'
+    Args:
+        category_names: Iterable of category names
     
-    return 'unknown'
+    Returns:
+        List of 'discretionary', 'essential' or 'unknown', one per name
+    """
+    return category_classifier().classify_many(category_names)
 
 
 def get_category_spending_trends(df):
@@ -74,7 +103,9 @@ def get_category_spending_trends(df):
     Stage 1: Calculate category spending trends month-over-month.
     
     Args:
-        df: DataFrame with 'date', 'category', 'amount' columns
+        df: DataFrame with 'date', 'category', 'amount' columns (or a compact
+            ledger with 'amount_cents' and 'month_ordinal'), or a cube from
+            ledger_cube.build_cube()
     
     Returns:
         DataFrame with columns:
@@ -88,71 +119,142 @@ def get_category_spending_trends(df):
         - trend_direction
         - classification
     """
-    # Create month column
-    df_copy = df.copy()
-    df_copy['month'] = df_copy['date'].dt.to_period('M')
+    # Expense cents per month and category, served from the pre-aggregated cube
+    ordinals, categories, expenses = category_month_expenses(df)
+    active = expenses > 0
     
-    # Filter only expenses (negative amounts)
-    expenses_df = df_copy[df_copy['amount'] < 0].copy()
-    expenses_df['amount'] = -expenses_df['amount']  # Make positive for easier analysis
+    # Need at least two months with any expense for trend analysis
+    if active.any(axis=1).sum() < 2:
+        return pd.DataFrame()
     
-    if expenses_df.empty:
+    # Only analyze categories with at least 2 months of data
+    columns = np.flatnonzero(active.sum(axis=0) >= 2)
+    if len(columns) == 0:
         return pd.DataFrame()
     
-    # Group by category and month
-    category_monthly = expenses_df.groupby(['category', 'month'])['amount'].sum().reset_index()
+    # Previous and current month per category: its own last two months with spending
+    category_active = active[:, columns]
+    last = len(ordinals) - 1
+    rows = np.arange(len(columns))
+    curr_month = last - category_active[::-1].argmax(axis=0)
+    category_active[curr_month, rows] = False
+    prev_month = last - category_active[::-1].argmax(axis=0)
+    
+    month_labels = np.asarray(ordinals_to_periods(ordinals).astype(str))
+    category_names = categories[columns]
+    return trend_frame(category_names, month_labels[prev_month], month_labels[curr_month],
+                       expenses[prev_month, columns], expenses[curr_month, columns],
+                       classify_categories(category_names))
+
+
+def trend_frame(category_names, previous_months, current_months, prev_cents, curr_cents, classification):
+    """
+    Build a trends DataFrame from per-row arrays (one row per month pair).
     
-    # Get unique months sorted
-    months = sorted(category_monthly['month'].unique())
+    Args:
+        category_names: Category of each row
+        previous_months, current_months: Month labels ('YYYY-MM') of each row
+        prev_cents, curr_cents: int64 expense cents in those months (prev_cents > 0)
+        classification: Classification of each row
     
-    if len(months) < 2:
-        # Not enough data for trend analysis
-        return pd.DataFrame()
+    Returns:
+        DataFrame with the columns of get_category_spending_trends()
+    """
+    change_cents = curr_cents - prev_cents
+    return pd.DataFrame({
+        'category': list(category_names),
+        'previous_month': np.asarray(previous_months).tolist(),
+        'current_month': np.asarray(current_months).tolist(),
+        'previous_month_spend': to_dollars(prev_cents),
+        'current_month_spend': to_dollars(curr_cents),
+        'absolute_change': to_dollars(change_cents),
+        'percentage_change': change_cents / prev_cents * 100,
+        # Exact integer comparison: no float noise around zero
+        'trend_direction': np.select([change_cents > 0, change_cents < 0], ['increase', 'decrease'], 'stable').tolist(),
+        'classification': list(classification)
+    })
+
+
+def category_trend_matrix(df):
+    """
+    Month-over-month changes for every category over the whole history, in one pass.
     
-    trends = []
+    Each active month (a month with spending) of a category is compared
+    with that category's previous active month, exactly as
+    get_category_spending_trends() compares the last two.
     
-    # For each category, calculate month-over-month changes
-    for category in category_monthly['category'].unique():
-        category_data = category_monthly[category_monthly['category'] == category].sort_values('month')
-        
-        # Only analyze if we have at least 2 months of data
-        if len(category_data) >= 2:
-            # Get previous and current month (last two months)
-            prev_month_row = category_data.iloc[-2]
-            curr_month_row = category_data.iloc[-1]
-            
-            prev_spend = prev_month_row['amount']
-            curr_spend = curr_month_row['amount']
-            
-            absolute_change = curr_spend - prev_spend
-            percentage_change = (absolute_change / prev_spend * 100) if prev_spend > 0 else 0
-            
-            # Determine trend direction
-            if absolute_change > 0:
-                trend_direction = 'increase'
-            elif absolute_change < 0:
-                trend_direction = 'decrease'
-            else:
-                trend_direction = 'stable'
-            
-            classification = classify_category(category)
-            
-            trends.append({
-                'category': category,
-                'previous_month': str(prev_month_row['month']),
-                'current_month': str(curr_month_row['month']),
-                'previous_month_spend': prev_spend,
-                'current_month_spend': curr_spend,
-                'absolute_change': absolute_change,
-                'percentage_change': percentage_change,
-                'trend_direction': trend_direction,
-                'classification': classification
-            })
-    
-    return pd.DataFrame(trends)
-
-
-def detect_delayed_gratification(df):
+    Args:
+        df: Transaction DataFrame or cube from ledger_cube.build_cube()
+    
+    Returns:
+        Dict containing:
+        - months: month labels ('YYYY-MM'), one per row of the arrays
+        - categories: category names, one per column of the arrays
+        - expenses: int64 expense cents (months, categories)
+        - previous: int64 row of the previous active month (months,
+          categories), -1 where a cell has no month to compare with
+        - change_cents: int64 change from the previous active month, 0
+          where previous is -1
+        - percentage_change: float64 change in percent, NaN where previous is -1
+    """
+    ordinals, categories, expenses = category_month_expenses(df)
+    active = expenses > 0
+    
+    # Latest active month up to each month, carried down the rows (-1: none yet)
+    rows = np.arange(len(ordinals))[:, None]
+    latest = np.maximum.accumulate(np.where(active, rows, -1), axis=0)
+    previous = np.full(expenses.shape, -1, dtype='int64')
+    previous[1:] = latest[:-1]
+    previous[~active] = -1
+    paired = previous >= 0
+    
+    prev_cents = np.take_along_axis(expenses, np.maximum(previous, 0), axis=0)
+    change_cents = np.where(paired, expenses - prev_cents, 0)
+    percentage_change = np.full(expenses.shape, np.nan)
+    np.divide(change_cents, prev_cents, out=percentage_change, where=paired)
+    percentage_change *= 100
+    
+    return {
+        'months': ordinals_to_periods(ordinals).astype(str).tolist(),
+        'categories': categories,
+        'expenses': expenses,
+        'previous': previous,
+        'change_cents': change_cents,
+        'percentage_change': percentage_change
+    }
+
+
+def get_category_trend_history(df):
+    """
+    Stage 1 over the whole history: every consecutive pair of active months.
+    
+    The last row of each category is that category's row in
+    get_category_spending_trends(), and detect_delayed_gratification() runs
+    on the result unchanged.
+    
+    Args:
+        df: Transaction DataFrame or cube from ledger_cube.build_cube()
+    
+    Returns:
+        DataFrame with the columns of get_category_spending_trends(), one row
+        per category and month, ordered by category then month
+    """
+    matrix = category_trend_matrix(df)
+    # Transposed, so the pairs come out category by category
+    column, month = np.nonzero(matrix['previous'].T >= 0)
+    if len(column) == 0:
+        return pd.DataFrame()
+    
+    months = np.asarray(matrix['months'])
+    expenses = matrix['expenses']
+    previous = matrix['previous'][month, column]
+    used, position = np.unique(column, return_inverse=True)
+    classification = np.array(classify_categories(matrix['categories'][used]), dtype=object)
+    return trend_frame(matrix['categories'][column], months[previous], months[month],
+                       expenses[previous, column], expenses[month, column], classification[position])
+
+
+def detect_delayed_gratification(df, insights=True):
     """
     Stage 2: Detect delayed gratification behavior.
     
@@ -163,6 +265,8 @@ def detect_delayed_gratification(df):
     
     Args:
         df: Trends DataFrame from get_category_spending_trends()
+        insights: Add the 'insight' text column; pass False to skip the
+            formatting and call render_insights() on the rows shown
     
     Returns:
         DataFrame with detected delayed gratification instances
@@ -193,18 +297,80 @@ def detect_delayed_gratification(df):
     # Add saved amount (positive value)
     delayed_grat['saved_amount'] = -delayed_grat['absolute_change']
     
+    columns = ['category', 'previous_month_spend', 'current_month_spend', 'saved_amount', 'percentage_change']
+    if not insights:
+        return delayed_grat[columns]
+    
     # Add behavioral insight
-    delayed_grat['insight'] = delayed_grat.apply(
-        lambda row: f"You chose not to spend ${row['saved_amount']:.2f} on {row['category'].title()} this month.\n"
-                    f"This reflects a {abs(row['percentage_change']):.0f}% reduction compared to last month.",
-        axis=1
-    )
+    delayed_grat['insight'] = render_insights(delayed_grat)
     
-    return delayed_grat[['category', 'previous_month_spend', 'current_month_spend', 
-                         'saved_amount', 'percentage_change', 'insight']]
+    return delayed_grat[columns + ['insight']]
 
 
-def project_future_value(saved_amount, horizons=[6, 24, 60]):
+def render_insights(df):
+    """
+    Behavioral insight text for detected delayed gratification rows.
+    
+    Built with whole-column string operations, so formatting costs no
+    Python call per row.
+    
+    Args:
+        df: DataFrame from detect_delayed_gratification() (or any rows of it)
+    
+    Returns:
+        Series of insight strings, aligned with df's index
+    """
+    # Exact cents give the same digits as formatting the dollars with :.2f
+    saved_cents = (df['saved_amount'] * 100).round().astype('int64').to_numpy()
+    dollars = pd.Series((saved_cents // 100).astype(str), index=df.index)
+    fraction = pd.Series(np.array(CENT_SUFFIXES, dtype=object)[saved_cents % 100], index=df.index, dtype=str)
+    # round() rounds half to even, as :.0f does
+    percent = pd.Series(df['percentage_change'].abs().round().astype('int64').to_numpy().astype(str), index=df.index)
+    # Title-case each distinct category once
+    codes, categories = pd.factorize(df['category'])
+    titles = pd.Series(pd.Index(categories).str.title().to_numpy()[codes], index=df.index, dtype=str)
+    return ("You chose not to spend $" + dollars + fraction + " on " + titles + " this month.\n"
+            "This reflects a " + percent + "% reduction compared to last month.")
+
+
+def detect_delayed_gratification_history(df, insights=True):
+    """
+    Stage 2 over the whole history: delayed gratification in every month at once.
+    
+    Args:
+        df: Transaction DataFrame or cube from ledger_cube.build_cube()
+        insights: Add the 'insight' text column (see detect_delayed_gratification())
+    
+    Returns:
+        DataFrame of detect_delayed_gratification() with the compared months
+        ('previous_month', 'current_month') after 'category'
+    """
+    history = get_category_trend_history(df)
+    delayed_grat = detect_delayed_gratification(history, insights)
+    if delayed_grat.empty:
+        return delayed_grat
+    
+    # Detection keeps the history's index, so the months line up row for row
+    delayed_grat.insert(1, 'previous_month', history.loc[delayed_grat.index, 'previous_month'])
+    delayed_grat.insert(2, 'current_month', history.loc[delayed_grat.index, 'current_month'])
+    return delayed_grat.reset_index(drop=True)
+
+
+def project_future_values(saved_amounts, horizons=PROJECTION_HORIZONS):
+    """
+    Project many saved amounts at once: saved amount times months, for every horizon.
+    
+    Args:
+        saved_amounts: Array of amounts saved in a month
+        horizons: Months to project
+    
+    Returns:
+        float64 array (amounts, horizons) of projected values
+    """
+    return np.multiply.outer(np.asarray(saved_amounts, dtype='float64'), np.asarray(horizons))
+
+
+def project_future_value(saved_amount, horizons=PROJECTION_HORIZONS):
     """
     Project future value of saved amount at different time horizons.
     
@@ -215,16 +381,25 @@ def project_future_value(saved_amount, horizons=[6, 24, 60]):
     Returns:
         List of dicts with projected values
     """
-    projections = []
+    values = project_future_values([saved_amount], horizons)[0].tolist()
+    return [{'months': months, 'future_value': value} for months, value in zip(horizons, values)]
+
+
+def map_to_rewards(future_values):
+    """
+    Map many future values to rewards with one binary search over the thresholds.
     
-    for months in horizons:
-        future_value = saved_amount * months
-        projections.append({
-            'months': months,
-            'future_value': future_value
-        })
+    Args:
+        future_values: Array of projected values in dollars
     
-    return projections
+    Returns:
+        Object array of reward descriptions, one per value
+    """
+    thresholds, descriptions = zip(*sorted(REWARD_MAPPING, key=lambda reward: reward[0]))
+    # Highest threshold at or below each value; -1 below the lowest threshold
+    position = np.searchsorted(thresholds, future_values, side='right') - 1
+    descriptions = np.array(descriptions, dtype=object)
+    return np.where(position >= 0, descriptions[np.maximum(position, 0)], REWARD_MAPPING[-1][1])
 
 
 def map_to_reward(future_value):
@@ -237,11 +412,92 @@ def map_to_reward(future_value):
     Returns:
         Reward description string
     """
-    for threshold, description in REWARD_MAPPING:
-        if future_value >= threshold:
-            return description
+    return map_to_rewards([future_value])[0]
+
+
+def project_delayed_gratification(delayed_grat, horizons=PROJECTION_HORIZONS):
+    """
+    Stage 3: Project every detected instance and pick its reward, as one table.
+    
+    Args:
+        delayed_grat: DataFrame from detect_delayed_gratification()
+        horizons: Months to project
     
-    return REWARD_MAPPING[-1][1]  # Default message
+    Returns:
+        The detected rows (fresh index) plus one 'value_<months>m' column per
+        horizon and 'reward', the reward for the first horizon's value
+    """
+    table = delayed_grat.reset_index(drop=True)
+    values = project_future_values(table['saved_amount'].to_numpy(), horizons)
+    for column, months in enumerate(horizons):
+        table[f'value_{months}m'] = values[:, column]
+    table['reward'] = map_to_rewards(values[:, 0])
+    return table
+
+
+class InsightBlocks(Sequence):
+    """Detailed insight text blocks, formatted from a projections table on access."""
+    
+    def __init__(self, table, horizons=PROJECTION_HORIZONS):
+        """
+        Args:
+            table: DataFrame from project_delayed_gratification()
+            horizons: The horizons the table was projected with
+        """
+        self.table = table
+        self.horizons = tuple(horizons)
+        self._columns = None
+    
+    def __len__(self):
+        return len(self.table)
+    
+    def _column_lists(self):
+        # Plain lists once per table; a pandas row lookup per block costs more than formatting it
+        if self._columns is None:
+            table = self.table
+            self._columns = (
+                table['category'].tolist(),
+                table['insight'].tolist() if 'insight' in table else None,
+                [table[f'value_{months}m'].tolist() for months in self.horizons],
+                table['reward'].tolist()
+            )
+        return self._columns
+    
+    def _format_block(self, category, insight_text, values, reward):
+        insight_block = f"\n{'='*60}\n"
+        insight_block += f"DELAYED GRATIFICATION INSIGHT: {category.upper()}\n"
+        insight_block += f"{'='*60}\n\n"
+        insight_block += f"{insight_text}\n\n"
+        
+        insight_block += "If this behavior continues:\n"
+        for months, value in zip(self.horizons, values):
+            time_frame = HORIZON_LABELS.get(months, f"In {months} months")
+            insight_block += f"  {time_frame}: ~${value:,.2f}\n"
+        
+        # Add top reward
+        insight_block += f"\nThis could fund:\n  {reward}\n"
+        return insight_block
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        position = range(len(self))[index]  # Negative indices and IndexError as for a list
+        categories, insights, values, rewards = self._column_lists()
+        if insights is None:
+            insight_text = render_insights(self.table.iloc[[position]]).iloc[0]
+        else:
+            insight_text = insights[position]
+        return self._format_block(categories[position], insight_text,
+                                  [column[position] for column in values], rewards[position])
+    
+    def __iter__(self):
+        categories, insights, values, rewards = self._column_lists()
+        if insights is None:
+            # Reading every block: render all insight sentences in one pass
+            insights = render_insights(self.table).tolist()
+        row_values = zip(*values) if values else [()] * len(categories)
+        for category, insight_text, block_values, reward in zip(categories, insights, row_values, rewards):
+            yield self._format_block(category, insight_text, block_values, reward)
 
 
 def generate_delayed_gratification_insights(df):
@@ -249,13 +505,16 @@ def generate_delayed_gratification_insights(df):
     Main entry point: Generate comprehensive delayed gratification insights.
     
     Args:
-        df: Original transaction DataFrame with 'date', 'category', 'amount'
+        df: Original transaction DataFrame with 'date', 'category', 'amount',
+            or a cube from ledger_cube.build_cube()
     
     Returns:
         Dict containing:
         - trends: DataFrame of category trends
         - delayed_gratification: DataFrame of detected instances
-        - detailed_insights: List of formatted insight strings
+        - projections: DataFrame from project_delayed_gratification()
+        - detailed_insights: Sequence of formatted insight strings, each
+          formatted when first read
         - summary: Aggregated insight message
     """
     # Stage 1: Calculate trends
@@ -265,6 +524,7 @@ def generate_delayed_gratification_insights(df):
         return {
             'trends': pd.DataFrame(),
             'delayed_gratification': pd.DataFrame(),
+            'projections': pd.DataFrame(),
             'detailed_insights': [],
             'summary': "Not enough historical data to detect spending patterns. Check back next month!"
         }
@@ -276,53 +536,15 @@ def generate_delayed_gratification_insights(df):
         return {
             'trends': trends,
             'delayed_gratification': pd.DataFrame(),
+            'projections': pd.DataFrame(),
             'detailed_insights': [],
             'summary': "No significant spending reductions detected this month. Keep building your habits!"
         }
     
-    # Stage 3: Generate detailed insights with future value projections
-    detailed_insights = []
-    total_saved = 0
-    
-    for idx, row in delayed_grat.iterrows():
-        category = row['category']
-        saved_amount = row['saved_amount']
-        insight_text = row['insight']
-        
-        total_saved += saved_amount
-        
-        # Project future values
-        projections = project_future_value(saved_amount)
-        
-        # Build detailed insight
-        insight_block = f"\n{'='*60}\n"
-        insight_block += f"DELAYED GRATIFICATION INSIGHT: {category.upper()}\n"
-        insight_block += f"{'='*60}\n\n"
-        insight_block += f"{insight_text}\n\n"
-        
-        insight_block += "If this behavior continues:\n"
-        for proj in projections:
-            months = proj['months']
-            future_val = proj['future_value']
-            reward = map_to_reward(future_val)
-            
-            # Format months nicely
-            if months == 6:
-                time_frame = "In 6 months"
-            elif months == 24:
-                time_frame = "In 2 years"
-            elif months == 60:
-                time_frame = "In 5 years"
-            else:
-                time_frame = f"In {months} months"
-            
-            insight_block += f"  {time_frame}: ~${future_val:,.2f}\n"
-        
-        # Add top reward
-        top_reward = map_to_reward(projections[0]['future_value'])
-        insight_block += f"\nThis could fund:\n  {top_reward}\n"
-        
-        detailed_insights.append(insight_block)
+    # Stage 3: Project every instance at once; the text blocks are formatted when read
+    projections = project_delayed_gratification(delayed_grat)
+    detailed_insights = InsightBlocks(projections)
+    total_saved = projections['saved_amount'].sum()
     
     # Generate summary
     summary = f"\n{'='*60}\n"
@@ -332,8 +554,8 @@ def generate_delayed_gratification_insights(df):
     
     # Calculate percentage increase in savings rate (rough estimate)
     # Compare avoided spending to total expenses
-    total_expenses = df[df['amount'] < 0]['amount'].sum()
-    total_expenses = -total_expenses
+    _, expense_cents = total_cents(df)
+    total_expenses = to_dollars(expense_cents)
     
     if total_expenses > 0:
         savings_rate_impact = (total_saved / total_expenses) * 100
@@ -345,6 +567,7 @@ def generate_delayed_gratification_insights(df):
     return {
         'trends': trends,
         'delayed_gratification': delayed_grat,
+        'projections': projections,
         'detailed_insights': detailed_insights,
         'summary': summary
     }
@@ -355,7 +578,7 @@ def display_delayed_gratification_insights(df):
     Pretty-print delayed gratification insights to console.
     
     Args:
-        df: Transaction DataFrame
+        df: Transaction DataFrame or cube from ledger_cube.build_cube()
     """
     insights = generate_delayed_gratification_insights(df)
     
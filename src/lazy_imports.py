@@ -0,0 +1,75 @@
+"""
+Lazy Import Module
+
+This module keeps start-up fast for short command-line runs by:
+1. Standing in for heavy dependencies (pandas, NumPy) until one of their
+   attributes is first used, so importing the analyzer costs only milliseconds
+2. Recording how long each deferred import took, for start-up timing reports
+"""
+
+import importlib
+import sys
+import time
+
+# Seconds spent importing each deferred module, in the order they were loaded
+IMPORT_SECONDS = {}
+
+
+class LazyModule:
+    """Placeholder that imports the named module on first attribute access."""
+
+    def __init__(self, name):
+        self._lazy_name = name
+        self._lazy_module = None
+
+    def __getattr__(self, attr):
+        module = self._lazy_module
+        if module is None:
+            module = self._lazy_module = load_module(self._lazy_name)
+        return getattr(module, attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._lazy_module is not None else 'not loaded'
+        return f"<lazy module '{self._lazy_name}' ({state})>"
+
+
+def load_module(name):
+    """
+    Import a module now, timing it if it was not already loaded.
+
+    Args:
+        name: Dotted module name
+
+    Returns:
+        The imported module
+    """
+    module = sys.modules.get(name)
+    if module is None:
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        IMPORT_SECONDS[name] = time.perf_counter() - start
+    return module
+
+
+def lazy_import(name):
+    """
+    Return a placeholder for a module that is imported when first used.
+
+    Args:
+        name: Dotted module name, e.g. 'pandas'
+
+    Returns:
+        LazyModule standing in for the module
+    """
+    return LazyModule(name)
+
+
+def import_seconds():
+    """
+    Time spent in deferred imports so far.
+
+    Returns:
+        Dict of module name -> seconds (nested imports count towards the
+        module that triggered them)
+    """
+    return dict(IMPORT_SECONDS)
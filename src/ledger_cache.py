@@ -0,0 +1,478 @@
+"""
+Ledger Cache Module
+
+This module caches validated transaction ledgers so repeat runs skip parsing by:
+1. Fingerprinting the source CSV (size, mtime, content hash)
+2. Storing the compact ledger (date, category, amount_cents, month_ordinal) as Parquet,
+   or as a pickle when pyarrow is not installed, with its monthly aggregates
+3. Parsing only the appended tail of append-only exports, re-parsing fully
+   when the file was truncated or rewritten
+4. Evicting least recently used entries once the cache directory exceeds
+   its size budget
+"""
+
+import csv
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import time
+
+from lazy_imports import lazy_import
+from ledger_stream import aggregates_from_dict, aggregates_to_dict, empty_aggregates, update_aggregates
+from transaction_loader import (
+    MAX_REPORTED_ROWS,
+    build_column_dtypes,
+    compact_transactions,
+    concat_ledgers,
+    load_transactions,
+    required_column_renames,
+    validate_transactions,
+)
+
+pd = lazy_import('pandas')
+
+# Cache directory created next to the source file unless one is given
+CACHE_DIR_NAME = '.ledger_cache'
+
+# Size budget for the whole cache directory
+DEFAULT_MAX_CACHE_BYTES = 512 * 1024 * 1024
+
+# Block size used when hashing source files
+HASH_BLOCK_BYTES = 1024 * 1024
+
+# Encodings whose lines cannot be split on raw b'\n' bytes; their files are never appended to incrementally
+MULTIBYTE_ENCODINGS = ('utf-16', 'utf-32')
+
+# Bumped whenever the cached frame layout changes
+CACHE_VERSION = 8
+
+
+def file_fingerprint(file_path, with_hash=True):
+    """
+    Fingerprint a source file.
+
+    Args:
+        file_path: Path to the source file
+        with_hash: Also compute a BLAKE2 hash of the full contents
+
+    Returns:
+        Dict with 'size', 'mtime_ns' and (optionally) 'content_hash'
+    """
+    stat = os.stat(file_path)
+    fingerprint = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    if with_hash:
+        digest = hashlib.blake2b(digest_size=20)
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b''):
+                digest.update(block)
+        fingerprint['content_hash'] = digest.hexdigest()
+
+    return fingerprint
+
+
+def cache_paths(file_path, cache_dir=None):
+    """
+    Locate the data and metadata files caching a source file.
+
+    Args:
+        file_path: Path to the source CSV
+        cache_dir: Cache directory (default: CACHE_DIR_NAME next to the source)
+
+    Returns:
+        Tuple (cache_dir, data_path, meta_path)
+    """
+    source = os.path.realpath(file_path)
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(source), CACHE_DIR_NAME)
+
+    key = hashlib.sha1(source.encode('utf-8')).hexdigest()
+    return cache_dir, os.path.join(cache_dir, f"{key}.data"), os.path.join(cache_dir, f"{key}.json")
+
+
+def cache_format():
+    """Return 'parquet' when pyarrow is installed, otherwise 'pickle'."""
+    return 'parquet' if importlib.util.find_spec('pyarrow') is not None else 'pickle'
+
+
+def read_cache_meta(meta_path):
+    """Read a metadata file, returning None if it is missing or corrupt."""
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_cache_entry(df, meta, data_path, meta_path):
+    """
+    Atomically write a ledger and its metadata to the cache.
+
+    The metadata file is written last, so a crash never leaves metadata
+    pointing at a partial data file.
+    """
+    os.makedirs(os.path.dirname(data_path), exist_ok=True)
+
+    tmp_data = f"{data_path}.tmp"
+    if meta['format'] == 'parquet':
+        df.to_parquet(tmp_data, index=False)
+    else:
+        df.to_pickle(tmp_data)
+    os.replace(tmp_data, data_path)
+
+    write_cache_meta(meta, meta_path)
+
+
+def write_cache_meta(meta, meta_path):
+    """Atomically rewrite only the metadata of a cache entry."""
+    tmp_meta = f"{meta_path}.tmp"
+    with open(tmp_meta, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_meta, meta_path)
+
+
+def read_cache_data(data_path, meta):
+    """Read a cached ledger in the format recorded in its metadata."""
+    if meta['format'] == 'parquet':
+        return pd.read_parquet(data_path)
+    return pd.read_pickle(data_path)
+
+
+def fingerprint_matches(file_path, cached):
+    """
+    Check a source file against a cached fingerprint.
+
+    Size and mtime are compared first; the content hash is only computed
+    when the mtime changed, so an untouched file is validated in O(1).
+
+    Returns:
+        Tuple (matches, current_fingerprint or None when size/mtime matched)
+    """
+    current = file_fingerprint(file_path, with_hash=False)
+    if current['size'] != cached['size']:
+        return False, None
+    if current['mtime_ns'] == cached['mtime_ns']:
+        return True, None
+
+    current = file_fingerprint(file_path)
+    return current['content_hash'] == cached['content_hash'], current
+
+
+def hash_prefix(f, n_bytes):
+    """
+    BLAKE2 hash of the first n_bytes of an open binary file.
+
+    Uses the same digest as file_fingerprint(), so a prefix covering the
+    whole file hashes to its content hash. Leaves the file positioned at
+    n_bytes (or at its end, if shorter).
+
+    Returns:
+        The hashlib object, so further bytes can be added to it
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    f.seek(0)
+    remaining = n_bytes
+    while remaining > 0:
+        block = f.read(min(HASH_BLOCK_BYTES, remaining))
+        if not block:
+            break
+        digest.update(block)
+        remaining -= len(block)
+    return digest
+
+
+def append_state(file_path, offset, prefix_hash=None):
+    """
+    Capture what an append-only file must still look like up to an offset.
+
+    Args:
+        file_path: Path to the source file
+        offset: Number of bytes already ingested
+        prefix_hash: Hash of those bytes, if already known (e.g. the
+            content hash when the whole file was ingested)
+
+    Returns:
+        Dict with 'byte_offset' and 'prefix_hash'
+    """
+    if prefix_hash is None:
+        with open(file_path, 'rb') as f:
+            prefix_hash = hash_prefix(f, offset).hexdigest()
+    return {'byte_offset': offset, 'prefix_hash': prefix_hash}
+
+
+def ends_with_newline(file_path):
+    """Whether a file's last byte is a newline, i.e. its last line is complete."""
+    with open(file_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return False
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+def read_appended_tail(file_path, state):
+    """
+    Read the complete lines appended after the last ingested offset.
+
+    The file must have grown and every byte up to the offset must be
+    unchanged; otherwise the file was truncated or rewritten and None is
+    returned. Checking the prefix costs a hash of the old content, not a
+    parse of it.
+
+    Args:
+        file_path: Path to the source file
+        state: Dict from append_state()
+
+    Returns:
+        Tuple (header_line, tail_bytes, new_state), or None if the file
+        can no longer be treated as an append of the cached content
+    """
+    offset = state['byte_offset']
+    if os.path.getsize(file_path) <= offset:
+        return None  # Truncated, or rewritten in place
+
+    with open(file_path, 'rb') as f:
+        digest = hash_prefix(f, offset)
+        if digest.hexdigest() != state['prefix_hash']:
+            return None  # Rewritten
+        tail = f.read()
+        f.seek(0)
+        header = f.readline()
+
+    # Leave a partially written last line for the next run
+    end = tail.rfind(b'\n') + 1
+    digest.update(tail[:end])
+    return header, tail[:end], {'byte_offset': offset + end, 'prefix_hash': digest.hexdigest()}
+
+
+def parse_appended_rows(header, tail, report, first_row):
+    """
+    Parse appended CSV lines with the dialect and column mapping of the cached load.
+
+    Only the columns the full load mapped onto date, category and amount are
+    read, so a tail with an empty optional column parses the same way.
+
+    Args:
+        header: Raw header line of the file
+        tail: Complete appended lines
+        report: Load report stored with the cache entry
+        first_row: Row index of the first appended line in a full load
+
+    Returns:
+        Tuple (df, invalid_date_rows) of the compact DataFrame (see
+        transaction_loader.compact_transactions()) and the full-load row
+        indices of appended rows dropped for unparseable dates
+
+    Raises:
+        ValueError: The tail cannot be parsed like the cached load (e.g. a
+            different encoding); callers fall back to a full reload
+    """
+    raw_header = next(csv.reader([header.decode(report['encoding']).strip('\r\n')], delimiter=report['delimiter']))
+    resolved = report.get('resolved_columns', {})
+    renames = required_column_renames(raw_header, resolve_missing=lambda required_col, _: resolved.get(required_col))
+    df = pd.read_csv(io.BytesIO(header + tail), encoding=report['encoding'], delimiter=report['delimiter'],
+                     usecols=list(renames), dtype=build_column_dtypes(raw_header), on_bad_lines='skip', engine='c')
+    df.index += first_row
+
+    # The cached load's date format: an ambiguous tail (03/04) must not be read the other way round
+    df, invalid_date_rows = validate_transactions(df.rename(columns=renames), report.get('date_format'))
+    return compact_transactions(df), [int(row) for row in invalid_date_rows]
+
+
+def cached_aggregates(file_path, cache_dir=None):
+    """
+    Return the pre-computed monthly aggregates stored with a cache entry.
+
+    Returns:
+        Aggregates dict (see ledger_stream.empty_aggregates()), or None
+    """
+    _, _, meta_path = cache_paths(file_path, cache_dir)
+    meta = read_cache_meta(meta_path)
+    if not meta or meta.get('version') != CACHE_VERSION:
+        return None
+    return aggregates_from_dict(meta['aggregates'])
+
+
+def invalidate_cache(file_path, cache_dir=None):
+    """
+    Remove the cache entry of a source file.
+
+    Returns:
+        True if an entry was removed
+    """
+    _, data_path, meta_path = cache_paths(file_path, cache_dir)
+    removed = False
+    for path in (meta_path, data_path):
+        if os.path.exists(path):
+            os.remove(path)
+            removed = True
+    return removed
+
+
+def evict_cache(cache_dir, max_bytes=DEFAULT_MAX_CACHE_BYTES, keep=None):
+    """
+    Evict least recently used entries until the directory fits its budget.
+
+    Entry recency is the data file mtime, refreshed on every cache hit.
+
+    Args:
+        cache_dir: Cache directory
+        max_bytes: Size budget in bytes
+        keep: Optional data path that must not be evicted
+
+    Returns:
+        List of evicted data paths
+    """
+    if not os.path.isdir(cache_dir):
+        return []
+
+    entries = []
+    for name in os.listdir(cache_dir):
+        if not name.endswith('.data'):
+            continue
+        data_path = os.path.join(cache_dir, name)
+        meta_path = data_path[:-len('.data')] + '.json'
+        size = os.path.getsize(data_path)
+        if os.path.exists(meta_path):
+            size += os.path.getsize(meta_path)
+        entries.append((os.path.getmtime(data_path), data_path, meta_path, size))
+
+    total = sum(entry[3] for entry in entries)
+    evicted = []
+    for _, data_path, meta_path, size in sorted(entries):
+        if total <= max_bytes:
+            break
+        if data_path == keep:
+            continue
+        for path in (meta_path, data_path):
+            if os.path.exists(path):
+                os.remove(path)
+        total -= size
+        evicted.append(data_path)
+
+    return evicted
+
+
+def load_transactions_cached(file_path, resolve_missing=None, cache_dir=None,
+                             max_cache_bytes=DEFAULT_MAX_CACHE_BYTES, incremental=True):
+    """
+    Load a transactions CSV, reusing the cached ledger when the source is unchanged.
+
+    With incremental=True, a file that only grew since it was cached has just
+    its appended lines parsed and merged into the cached ledger and monthly
+    aggregates; truncation or rewrites fall back to a full reload.
+
+    Args:
+        file_path: Path to the CSV file
+        resolve_missing: Optional callable passed to load_transactions()
+        cache_dir: Cache directory (default: CACHE_DIR_NAME next to the source)
+        max_cache_bytes: Size budget enforced after writing a new entry
+        incremental: Parse only appended lines of append-only files
+
+    Returns:
+        Tuple (df, report) where report is the load_transactions() report
+        plus 'cache' ('hit', 'append', 'miss' or 'stale'), 'appended_rows'
+        and 'load_seconds'
+    """
+    start = time.perf_counter()
+    cache_dir, data_path, meta_path = cache_paths(file_path, cache_dir)
+    meta = read_cache_meta(meta_path)
+
+    status = 'miss'
+    if meta and meta.get('version') == CACHE_VERSION and os.path.exists(data_path):
+        matches, current = fingerprint_matches(file_path, meta['fingerprint'])
+        df = None
+        if matches or incremental:
+            try:
+                df = read_cache_data(data_path, meta)
+            except Exception:
+                df = None
+
+        if df is not None and matches:
+            try:
+                if current is not None:
+                    # Touched but unchanged: remember the new mtime
+                    meta['fingerprint'] = current
+                    write_cache_meta(meta, meta_path)
+                os.utime(data_path)
+            except OSError:
+                # A read-only or shared cache can still serve hits
+                pass
+            report = dict(meta['report'], cache='hit', appended_rows=0,
+                          load_seconds=time.perf_counter() - start)
+            return df, report
+
+        tail = None
+        if df is not None and incremental and meta.get('append_state'):
+            tail = read_appended_tail(file_path, meta['append_state'])
+        if tail is not None:
+            header, tail_bytes, new_state = tail
+            cached_report = meta['report']
+            try:
+                appended, invalid_rows = (
+                    parse_appended_rows(header, tail_bytes, cached_report,
+                                        cached_report['rows'] + cached_report['invalid_dates'])
+                    if tail_bytes else (df.iloc[:0], []))
+            except ValueError:
+                tail = None  # Parsed differently from the cached load: reload the whole file
+        if tail is not None:
+            df = concat_ledgers([df, appended])
+
+            aggregates = update_aggregates(aggregates_from_dict(meta['aggregates']), appended)
+            meta['aggregates'] = aggregates_to_dict(aggregates)
+            reported_rows = cached_report['invalid_date_rows'] + invalid_rows
+            meta['report'] = dict(cached_report, rows=len(df),
+                                  invalid_dates=cached_report['invalid_dates'] + len(invalid_rows),
+                                  invalid_date_rows=reported_rows[:MAX_REPORTED_ROWS])
+            meta['append_state'] = new_state
+            # The prefix hash is the content hash once every byte has been ingested
+            fingerprint = file_fingerprint(file_path, with_hash=False)
+            complete = fingerprint['size'] == new_state['byte_offset']
+            meta['fingerprint'] = dict(fingerprint, content_hash=new_state['prefix_hash'] if complete else None)
+            try:
+                write_cache_entry(df, meta, data_path, meta_path)
+            except OSError:
+                pass
+
+            report = dict(meta['report'], cache='append', appended_rows=len(appended),
+                          load_seconds=time.perf_counter() - start)
+            return df, report
+        status = 'stale'
+
+    # Record interactive column answers so appended lines map the same way
+    resolved_columns = {}
+
+    def remember_resolution(required_col, available):
+        answer = resolve_missing(required_col, available) if resolve_missing else None
+        resolved_columns[required_col] = answer
+        return answer
+
+    # Fingerprint before parsing so a concurrent append invalidates the entry
+    fingerprint = file_fingerprint(file_path)
+    df, report = load_transactions(file_path, remember_resolution)
+    report['resolved_columns'] = resolved_columns
+
+    meta = {
+        'version': CACHE_VERSION,
+        'source': os.path.realpath(file_path),
+        'format': cache_format(),
+        'fingerprint': fingerprint,
+        'report': report,
+        'aggregates': aggregates_to_dict(update_aggregates(empty_aggregates(), df)),
+        # Only trust the offset if the file did not grow while it was parsed, and
+        # not after a partly written last row: its rest would later parse as a new row
+        'append_state': (append_state(file_path, fingerprint['size'], fingerprint['content_hash'])
+                         if os.path.getsize(file_path) == fingerprint['size'] and ends_with_newline(file_path)
+                         and not report['encoding'].startswith(MULTIBYTE_ENCODINGS) else None)
+    }
+    try:
+        write_cache_entry(df, meta, data_path, meta_path)
+        evict_cache(cache_dir, max_cache_bytes, keep=data_path)
+    except OSError:
+        # A read-only location just means running without a cache
+        pass
+
+    report = dict(report, cache=status, appended_rows=0, load_seconds=time.perf_counter() - start)
+    return df, report
@@ -0,0 +1,291 @@
+"""
+Ledger Cube Module
+
+This module pre-aggregates a ledger once so reports never re-scan its rows by:
+1. Binning every transaction into a dense month x category x sign cube of
+   exact integer cents (sign 0 = income, sign 1 = expenses, both positive),
+   plus a month x category transaction count, in a single bincount pass
+2. Keeping a day-level base aggregate (income and expense cents per day)
+   from the same pass, from which day, ISO-week, month, quarter and year
+   rollups are derived and cached on the cube
+3. Serving monthly cash flow, category totals, per-category monthly expenses
+   and the overall balance from the cube in time proportional to
+   months x categories, independent of the number of rows
+
+Rows with a missing category keep a trailing slot of their own: they count
+towards monthly totals and the balance but not towards category reports,
+matching a groupby on the category column.
+"""
+
+from lazy_imports import lazy_import
+from money import ledger_cents, monthly_cents
+from transaction_loader import month_ordinals
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+INCOME, EXPENSES = 0, 1
+
+# Rollup granularities served from the day-level base aggregate
+GRANULARITIES = ('day', 'week', 'month', 'quarter', 'year')
+
+# 1970-01-01 was a Thursday: shifting day numbers by 3 puts ISO weeks (Monday first) on multiples of 7
+ISO_WEEK_SHIFT = 3
+
+
+def build_cube(df):
+    """
+    Pre-aggregate a ledger into a month x category x sign cube.
+
+    Args:
+        df: Plain (date, category, amount) or compact ledger DataFrame
+
+    Returns:
+        Dict containing:
+        - first_ordinal: month ordinal of the first cube row (None if empty)
+        - categories: Index of category names, in groupby order
+        - cents: int64 array (months, categories + 1, 2) of income and
+          expense cents; the extra category slot holds missing categories
+        - counts: int64 array (months, categories + 1) of transaction counts
+        - first_day: day number (days since 1970-01-01) of the first daily row
+        - daily: int64 array (days, 2) of income and expense cents per day
+        - daily_counts: int64 array (days,) of transaction counts per day
+        - rollups: cache of rollup_totals() results, filled on demand
+        - balance_index: cache for balance_index.balance_index(), filled on demand
+        - rows: number of transactions aggregated
+    """
+    if isinstance(df['category'].dtype, pd.CategoricalDtype):
+        codes = df['category'].cat.codes.to_numpy()
+        categories = pd.Index(df['category'].cat.categories)
+    else:
+        codes, categories = pd.factorize(df['category'], sort=True)
+    n_slots = len(categories) + 1
+
+    cents = ledger_cents(df).to_numpy()
+    if len(cents) == 0:
+        return {
+            'first_ordinal': None,
+            'categories': categories,
+            'cents': np.zeros((0, n_slots, 2), dtype='int64'),
+            'counts': np.zeros((0, n_slots), dtype='int64'),
+            'first_day': None,
+            'daily': np.zeros((0, 2), dtype='int64'),
+            'daily_counts': np.zeros(0, dtype='int64'),
+            'rollups': {},
+            'balance_index': None,
+            'rows': 0
+        }
+
+    if 'month_ordinal' in df.columns:
+        ordinals = df['month_ordinal'].to_numpy()
+    else:
+        ordinals = month_ordinals(df['date']).to_numpy()
+    first = int(ordinals.min())
+    n_months = int(ordinals.max()) - first + 1
+
+    # Flat cell index: (month offset, category slot), then sign as the fastest axis
+    cells = np.subtract(ordinals, first, dtype=np.intp)
+    cells *= n_slots
+    cells += np.where(codes < 0, n_slots - 1, codes)
+    counts = np.bincount(cells, minlength=n_months * n_slots)
+
+    cells *= 2
+    cells += cents < 0
+    weights = np.abs(cents).astype('float64')  # Exact below 2**53 cents per cell
+    sums = np.bincount(cells, weights=weights, minlength=n_months * n_slots * 2)
+
+    # Day-level base aggregate, binned the same way with the day as the outer axis
+    days = df['date'].to_numpy().astype('datetime64[D]').astype('int64')
+    first_day = int(days.min())
+    n_days = int(days.max()) - first_day + 1
+    cells = np.subtract(days, first_day, dtype=np.intp)
+    daily_counts = np.bincount(cells, minlength=n_days)
+    cells *= 2
+    cells += cents < 0
+    daily = np.bincount(cells, weights=weights, minlength=n_days * 2)
+
+    return {
+        'first_ordinal': first,
+        'categories': categories,
+        'cents': sums.astype('int64').reshape(n_months, n_slots, 2),
+        'counts': counts.reshape(n_months, n_slots),
+        'first_day': first_day,
+        'daily': daily.astype('int64').reshape(n_days, 2),
+        'daily_counts': daily_counts,
+        'rollups': {},
+        'balance_index': None,
+        'rows': len(cents)
+    }
+
+
+def is_cube(ledger):
+    """Return True if the ledger is a cube from build_cube()."""
+    return isinstance(ledger, dict) and 'counts' in ledger
+
+
+def as_cube(ledger):
+    """Return the ledger's cube, building it if a DataFrame was given."""
+    return ledger if is_cube(ledger) else build_cube(ledger)
+
+
+def cube_months(cube):
+    """Month ordinals of all cube rows."""
+    return np.arange(len(cube['cents'])) + (cube['first_ordinal'] or 0)
+
+
+def monthly_totals(ledger):
+    """
+    Income, expenses and net cents per month.
+
+    DataFrames use the direct row kernel money.monthly_cents(); cubes are
+    reduced over their category axis.
+
+    Args:
+        ledger: Ledger DataFrame or cube from build_cube()
+
+    Returns:
+        Tuple (ordinals, income, expenses, net) of int64 arrays for months
+        with at least one transaction, sorted by month
+    """
+    if not is_cube(ledger):
+        return monthly_cents(ledger)
+
+    present = ledger['counts'].sum(axis=1) > 0
+    totals = ledger['cents'][present].sum(axis=1)
+    income, expenses = totals[:, INCOME], totals[:, EXPENSES]
+    return cube_months(ledger)[present], income, expenses, income - expenses
+
+
+def category_totals(ledger):
+    """
+    Net cents per category that has at least one transaction.
+
+    Args:
+        ledger: Ledger DataFrame or cube from build_cube()
+
+    Returns:
+        int64 Series indexed by category name, in groupby order
+    """
+    cube = as_cube(ledger)
+    observed = cube['counts'][:, :-1].sum(axis=0) > 0
+    totals = cube['cents'][:, :-1].sum(axis=0)
+    net = totals[:, INCOME] - totals[:, EXPENSES]
+    return pd.Series(net[observed], index=cube['categories'][observed], name='amount_cents')
+
+
+def category_month_expenses(ledger):
+    """
+    Expense cents per month and category.
+
+    Args:
+        ledger: Ledger DataFrame or cube from build_cube()
+
+    Returns:
+        Tuple (ordinals, categories, expenses) where expenses is an int64
+        array (months, categories); a cell is positive exactly when the
+        category had an expense that month
+    """
+    cube = as_cube(ledger)
+    return cube_months(cube), cube['categories'], cube['cents'][:, :-1, EXPENSES]
+
+
+def total_cents(ledger):
+    """
+    Income and expense cents over the whole ledger.
+
+    Args:
+        ledger: Ledger DataFrame or cube from build_cube()
+
+    Returns:
+        Tuple (income, expenses) of Python ints, both non-negative
+    """
+    if not is_cube(ledger):
+        cents = ledger_cents(ledger)
+        return int(cents[cents > 0].sum()), -int(cents[cents < 0].sum())
+    totals = ledger['cents'].sum(axis=(0, 1))
+    return int(totals[INCOME]), int(totals[EXPENSES])
+
+
+def period_keys(days, granularity):
+    """
+    Map day numbers to sortable integer period keys.
+
+    Args:
+        days: int64 array of days since 1970-01-01
+        granularity: One of GRANULARITIES
+
+    Returns:
+        int64 array of keys, non-decreasing when days are sorted
+    """
+    if granularity == 'day':
+        return days
+    if granularity == 'week':
+        return (days + ISO_WEEK_SHIFT) // 7
+    months = days.astype('datetime64[D]').astype('datetime64[M]').astype('int64')
+    if granularity == 'month':
+        return months
+    if granularity == 'quarter':
+        return months // 3
+    return months // 12
+
+
+def period_labels(keys, granularity):
+    """
+    Format period keys as labels: 2025-06-30, 2025-W27, 2025-06, 2025Q2, 2025.
+
+    Args:
+        keys: int64 array from period_keys()
+        granularity: One of GRANULARITIES
+
+    Returns:
+        List of label strings
+    """
+    if granularity == 'day':
+        return np.datetime_as_string(keys.astype('datetime64[D]')).tolist()
+    if granularity == 'week':
+        mondays = pd.DatetimeIndex((keys * 7 - ISO_WEEK_SHIFT).astype('datetime64[D]'))
+        iso = mondays.isocalendar()
+        return [f"{year}-W{week:02d}" for year, week in zip(iso['year'], iso['week'])]
+    if granularity == 'month':
+        return np.datetime_as_string(keys.astype('datetime64[M]')).tolist()
+    if granularity == 'quarter':
+        return [f"{key // 4 + 1970}Q{key % 4 + 1}" for key in keys.tolist()]
+    return [str(key + 1970) for key in keys.tolist()]
+
+
+def rollup_totals(ledger, granularity):
+    """
+    Income, expenses and net cents per day, ISO week, month, quarter or year.
+
+    Rollups are reduced from the cube's day-level base aggregate, never from
+    the rows, and cached on the cube so later calls are free.
+
+    Args:
+        ledger: Ledger DataFrame or cube from build_cube()
+        granularity: One of GRANULARITIES
+
+    Returns:
+        Tuple (labels, income, expenses, net): labels is a list of strings and
+        the rest int64 arrays, one entry per period with transactions
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity '{granularity}'. Choose one of: {', '.join(GRANULARITIES)}.")
+
+    cube = as_cube(ledger)
+    if granularity in cube['rollups']:
+        return cube['rollups'][granularity]
+
+    present = cube['daily_counts'] > 0
+    if not present.any():
+        empty = np.zeros(0, dtype='int64')
+        totals = ([], empty, empty, empty)
+    else:
+        keys = period_keys(np.flatnonzero(present) + cube['first_day'], granularity)
+        # Days are sorted, so each period is a contiguous run of days
+        unique_keys, starts = np.unique(keys, return_index=True)
+        sums = np.add.reduceat(cube['daily'][present], starts, axis=0)
+        income, expenses = sums[:, INCOME], sums[:, EXPENSES]
+        totals = (period_labels(unique_keys, granularity), income, expenses, income - expenses)
+
+    cube['rollups'][granularity] = totals
+    return totals
@@ -0,0 +1,150 @@
+"""
+Multi-File Ingestion Module
+
+This module builds one ledger from many transaction CSVs (e.g. one file per
+account per month) by:
+1. Expanding a directory or glob pattern into a list of CSV files
+2. Loading the files concurrently in a process pool, each through the
+   cached single-file loader and the shared column-alias mapping
+3. Concatenating the results with a source_file column and a per-file
+   timing report
+"""
+
+import glob
+import os
+import time
+
+from ledger_cache import load_transactions_cached
+from transaction_loader import concat_ledgers
+
+
+# Characters that make a path a glob pattern (unless a file by that exact name exists)
+GLOB_CHARS = frozenset('*?[')
+
+
+def is_glob_pattern(path):
+    """Return True if the path is a glob pattern rather than an existing file's name."""
+    return not os.path.isfile(path) and any(char in GLOB_CHARS for char in path)
+
+
+def is_multi_file_input(path):
+    """Return True if the path is a directory or a glob pattern."""
+    return os.path.isdir(path) or is_glob_pattern(path)
+
+
+def expand_input_paths(path):
+    """
+    Expand a file, directory or glob pattern into a sorted list of files.
+
+    Args:
+        path: CSV file, directory (all *.csv inside it) or glob pattern; an
+            existing file is taken as is, even with glob characters in its name
+
+    Returns:
+        List of file paths
+    """
+    if os.path.isdir(path):
+        paths = glob.glob(os.path.join(path, '*.csv'))
+    elif is_glob_pattern(path):
+        paths = glob.glob(path, recursive=True)
+    else:
+        paths = [path]
+
+    paths = sorted(p for p in paths if os.path.isfile(p))
+    if not paths:
+        raise FileNotFoundError(f"No CSV files found for '{path}'")
+    return paths
+
+
+def load_file_worker(file_path):
+    """
+    Load a single file inside a worker process.
+
+    Kept at module level so it can be pickled for the process pool.
+
+    Returns:
+        Tuple (df, report) from load_transactions_cached()
+    """
+    start = time.perf_counter()
+    try:
+        df, report = load_transactions_cached(file_path)
+    except (ValueError, OSError) as e:
+        raise ValueError(f"Could not load '{file_path}': {e}") from e
+    report['file'] = file_path
+    report['seconds'] = time.perf_counter() - start
+    return df, report
+
+
+def load_transaction_files(path, max_workers=None):
+    """
+    Load every CSV matched by a path, directory or glob into one ledger.
+
+    Files are parsed concurrently in a process pool; a single file is loaded
+    in-process. Columns that cannot be auto-mapped are an error, since worker
+    processes cannot prompt for them.
+
+    Args:
+        path: CSV file, directory or glob pattern
+        max_workers: Worker processes (default: one per CPU, at most one per file)
+
+    Returns:
+        Tuple (df, report) where df has an extra 'source_file' column and
+        report is a dict with:
+        - files: list of per-file reports (file, rows, seconds, cache, dialect)
+        - rows: total number of transactions
+        - workers: number of worker processes used
+        - wall_seconds: elapsed time for the whole load
+        - rows_per_second: overall throughput
+    """
+    start = time.perf_counter()
+    paths = expand_input_paths(path)
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    workers = max(1, min(max_workers, len(paths)))
+
+    if workers == 1:
+        results = [load_file_worker(p) for p in paths]
+    else:
+        # Imported here: the process pool machinery is slow to import and only needed for several files
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(load_file_worker, paths))
+
+    frames = []
+    for df, report in results:
+        frames.append(df.assign(source_file=report['file']))
+    ledger = concat_ledgers(frames)
+    ledger['source_file'] = ledger['source_file'].astype('category')
+
+    wall_seconds = time.perf_counter() - start
+    report = {
+        'files': [file_report for _, file_report in results],
+        'rows': len(ledger),
+        'workers': workers,
+        'wall_seconds': wall_seconds,
+        'rows_per_second': len(ledger) / wall_seconds if wall_seconds > 0 else float('inf')
+    }
+    return ledger, report
+
+
+def format_ingest_report(report):
+    """
+    Format a per-file timing table for console display.
+
+    Args:
+        report: Report dict from load_transaction_files()
+
+    Returns:
+        Multi-line string
+    """
+    lines = [f"{'File':40s} {'Rows':>8s} {'Time (ms)':>10s}  Cache"]
+    for file_report in report['files']:
+        name = os.path.basename(file_report['file'])
+        lines.append(f"{name:40s} {file_report['rows']:8d} {file_report['seconds'] * 1000:10.1f}  "
+                     f"{file_report['cache']}")
+    lines.append(f"\n{len(report['files'])} files, {report['rows']} rows in "
+                 f"{report['wall_seconds'] * 1000:.1f} ms using {report['workers']} worker(s) "
+                 f"({report['rows_per_second']:,.0f} rows/s)")
+    return "\n".join(lines)
@@ -0,0 +1,318 @@
+"""
+Streaming Ingestion Module
+
+This module processes transaction CSV files of any size in constant memory by:
+1. Reading the file in fixed-size chunks with the detected dialect
+2. Validating and normalizing each chunk with one date format inferred
+   for the whole file, so chunks cannot disagree on ambiguous dates
+3. Folding every chunk into running aggregates (monthly cashflow,
+   category totals, running balance) kept in exact integer cents
+
+The aggregates reproduce the outputs of calculate_monthly_cashflow() and
+calculate_category_breakdown() without ever holding the full ledger.
+"""
+
+from lazy_imports import lazy_import
+from money import ledger_cents, monthly_cents, to_dollars
+from transaction_loader import (
+    FALLBACK_ENCODING,
+    MAX_REPORTED_ROWS,
+    build_column_dtypes,
+    column_date_format,
+    detect_csv_dialect,
+    ordinals_to_periods,
+    required_column_renames,
+    validate_transactions,
+)
+
+pd = lazy_import('pandas')
+
+# Rows per chunk; bounds peak memory independently of file size
+DEFAULT_CHUNK_ROWS = 100_000
+
+# Rows whose dates decide the date format of the whole file, read once before streaming
+DATE_FORMAT_SAMPLE_ROWS = 100_000
+
+# Single files at least this large are summarized from a stream instead of loaded whole
+STREAMING_LEDGER_BYTES = 512 * 1024 * 1024
+
+# Reports that need only whole-ledger aggregates
+STREAMING_REPORTS = ('monthly', 'savings', 'runway', 'breakdown')
+
+
+def iter_transaction_chunks(file_path, dialect, chunk_rows=DEFAULT_CHUNK_ROWS, resolve_missing=None):
+    """
+    Yield validated transaction chunks with columns date, category, amount.
+
+    Only the three required columns are read from the file.
+
+    Args:
+        file_path: Path to the CSV file
+        dialect: Dict from detect_csv_dialect()
+        chunk_rows: Number of rows per chunk
+        resolve_missing: Optional callable passed to resolve_column_mapping()
+
+    Yields:
+        Tuples (chunk, invalid_date_rows) of validated DataFrames with datetime
+        'date' and numeric 'amount', plus the row indices dropped for bad dates;
+        a chunk without any valid date is yielded empty
+    """
+    header = dialect['header']
+    renames = required_column_renames(header, resolve_missing)
+    read_options = dict(encoding=dialect['encoding'], delimiter=dialect['delimiter'],
+                        dtype=build_column_dtypes(header), on_bad_lines='skip', engine='c')
+
+    # Infer the date format from the start of the file, as load_transactions() does for the whole column
+    date_column = next(raw for raw, target in renames.items() if target == 'date')
+    sample = pd.read_csv(file_path, usecols=[date_column], nrows=DATE_FORMAT_SAMPLE_ROWS, **read_options)
+    date_format = column_date_format(sample[date_column])
+
+    with pd.read_csv(file_path, usecols=list(renames), chunksize=chunk_rows, **read_options) as reader:
+        for chunk in reader:
+            yield validate_transactions(chunk.rename(columns=renames), date_format, allow_empty=True)
+
+
+def empty_aggregates():
+    """
+    Create an empty set of running aggregates.
+
+    Returns:
+        Dict containing:
+        - monthly: int64 cents DataFrame of income/expenses/net_cashflow
+          indexed by month period
+        - category_totals: int64 Series of summed cents per category
+        - balance_cents: running sum of all amounts in cents
+        - rows, chunks: number of transactions and chunks folded in
+        - first_date, last_date: date range covered
+    """
+    return {
+        'monthly': None,
+        'category_totals': None,
+        'balance_cents': 0,
+        'rows': 0,
+        'chunks': 0,
+        'first_date': None,
+        'last_date': None
+    }
+
+
+def update_aggregates(aggregates, chunk):
+    """
+    Fold one validated chunk into the running aggregates.
+
+    Args:
+        aggregates: Dict from empty_aggregates()
+        chunk: Plain (date, category, amount) or compact ledger DataFrame
+
+    Returns:
+        The updated aggregates dict
+    """
+    if chunk.empty:
+        return aggregates
+
+    cents = ledger_cents(chunk)
+    ordinals, income, expenses, net = monthly_cents(chunk)
+    monthly = pd.DataFrame({'income': income, 'expenses': expenses, 'net_cashflow': net},
+                           index=ordinals_to_periods(ordinals).rename('month'))
+    category_totals = cents.groupby(chunk['category'], observed=True).sum()
+    category_totals.index = category_totals.index.astype(object)
+
+    if aggregates['monthly'] is None:
+        aggregates['monthly'] = monthly
+        aggregates['category_totals'] = category_totals
+    else:
+        # Alignment goes through float; cents stay exact well beyond any ledger size
+        aggregates['monthly'] = aggregates['monthly'].add(monthly, fill_value=0).astype('int64')
+        aggregates['category_totals'] = (aggregates['category_totals']
+                                         .add(category_totals, fill_value=0).astype('int64'))
+
+    first_date, last_date = chunk['date'].min(), chunk['date'].max()
+    if aggregates['first_date'] is None or first_date < aggregates['first_date']:
+        aggregates['first_date'] = first_date
+    if aggregates['last_date'] is None or last_date > aggregates['last_date']:
+        aggregates['last_date'] = last_date
+
+    aggregates['balance_cents'] += int(cents.sum())
+    aggregates['rows'] += len(chunk)
+    aggregates['chunks'] += 1
+    return aggregates
+
+
+def stream_aggregates(file_path, chunk_rows=DEFAULT_CHUNK_ROWS, resolve_missing=None):
+    """
+    Stream a transactions CSV into running aggregates in bounded memory.
+
+    Args:
+        file_path: Path to the CSV file
+        chunk_rows: Number of rows per chunk
+        resolve_missing: Optional callable passed to resolve_column_mapping()
+
+    Returns:
+        Aggregates dict (see empty_aggregates()) plus 'encoding', 'delimiter',
+        'invalid_dates' and 'invalid_date_rows' (first MAX_REPORTED_ROWS)
+    """
+    dialect = detect_csv_dialect(file_path)
+
+    def fold_chunks():
+        aggregates = empty_aggregates()
+        # A running count plus the first few indices, so bad rows never grow memory
+        invalid_dates, invalid_date_rows = 0, []
+        for chunk, invalid_rows in iter_transaction_chunks(file_path, dialect, chunk_rows, resolve_missing):
+            if len(chunk):
+                update_aggregates(aggregates, chunk)
+            invalid_dates += len(invalid_rows)
+            invalid_date_rows.extend(invalid_rows[:MAX_REPORTED_ROWS - len(invalid_date_rows)])
+        return aggregates, invalid_dates, invalid_date_rows
+
+    try:
+        aggregates, invalid_dates, invalid_date_rows = fold_chunks()
+    except UnicodeDecodeError:
+        # Mis-detected encoding past the sniffed sample: restart once with the fallback
+        dialect['encoding'] = FALLBACK_ENCODING
+        aggregates, invalid_dates, invalid_date_rows = fold_chunks()
+
+    if aggregates['rows'] == 0 and invalid_dates:
+        raise ValueError("Invalid date values found. Ensure dates are in a parseable format.")
+    if aggregates['rows'] == 0:
+        raise ValueError("Could not read CSV file. Please ensure the file is a valid CSV.")
+
+    aggregates['encoding'] = dialect['encoding']
+    aggregates['delimiter'] = dialect['delimiter']
+    aggregates['invalid_dates'] = invalid_dates
+    aggregates['invalid_date_rows'] = [int(row) for row in invalid_date_rows]
+    return aggregates
+
+
+def monthly_cashflow_from_aggregates(aggregates):
+    """
+    Rebuild the calculate_monthly_cashflow() output from aggregates.
+
+    Returns:
+        DataFrame with columns: month, income, expenses, net_cashflow
+    """
+    if aggregates['monthly'] is None:
+        return pd.DataFrame(columns=['month', 'income', 'expenses', 'net_cashflow'])
+
+    result = to_dollars(aggregates['monthly'].sort_index()).rename_axis('month').reset_index()
+    result['month'] = result['month'].astype(str)
+    return result[['month', 'income', 'expenses', 'net_cashflow']]
+
+
+def category_breakdown_from_aggregates(aggregates):
+    """
+    Rebuild the calculate_category_breakdown() output from aggregates.
+
+    Returns:
+        DataFrame with columns: Category, Amount, Percentage
+    """
+    if aggregates['category_totals'] is None:
+        return pd.DataFrame(columns=['Category', 'Amount', 'Percentage'])
+
+    category_totals = aggregates['category_totals'].sort_values()
+    expenses_only = category_totals[category_totals < 0]
+    expenses_only = -expenses_only  # Make positive for display
+    total_expenses = expenses_only.sum()
+
+    return pd.DataFrame({
+        'Category': expenses_only.index,
+        'Amount': to_dollars(expenses_only.values),
+        'Percentage': (expenses_only.values / total_expenses * 100).round(2)
+    }).reset_index(drop=True)
+
+
+def running_balance_from_aggregates(aggregates):
+    """
+    Running balance at the end of each month.
+
+    Returns:
+        DataFrame with columns: month, net_cashflow, balance
+    """
+    if aggregates['monthly'] is None:
+        return pd.DataFrame(columns=['month', 'net_cashflow', 'balance'])
+
+    net_cents = aggregates['monthly']['net_cashflow'].sort_index()
+    return pd.DataFrame({
+        'month': net_cents.index.astype(str),
+        'net_cashflow': to_dollars(net_cents.values),
+        'balance': to_dollars(net_cents.cumsum().values)
+    })
+
+
+def stream_report(aggregates, name):
+    """
+    Build one summary report from stream_aggregates() output.
+
+    Results match the batch CLI's full-load reports: savings is the positive
+    end-of-ledger balance and runway divides it by mean monthly expenses.
+
+    Args:
+        aggregates: Dict from stream_aggregates()
+        name: Report name from STREAMING_REPORTS
+
+    Returns:
+        DataFrame (monthly, breakdown) or dict (savings, runway)
+    """
+    savings = to_dollars(max(0, aggregates['balance_cents']))
+
+    if name == 'monthly':
+        return monthly_cashflow_from_aggregates(aggregates)
+    if name == 'savings':
+        return {'total_savings': savings}
+    if name == 'runway':
+        avg_expenses = monthly_cashflow_from_aggregates(aggregates)['expenses'].mean()
+        return {
+            'runway_months': savings / avg_expenses if avg_expenses != 0 else float('inf'),
+            'savings': savings,
+            'avg_monthly_expenses': avg_expenses
+        }
+    if name == 'breakdown':
+        return category_breakdown_from_aggregates(aggregates)
+    raise ValueError(f"Report '{name}' needs the full loader.")
+
+def aggregates_to_dict(aggregates):
+    """
+    Convert aggregates into a JSON-serializable dict.
+
+    Returns:
+        Dict with months and categories as string keys
+    """
+    monthly = aggregates['monthly']
+    category_totals = aggregates['category_totals']
+    return {
+        'monthly': {} if monthly is None else {
+            str(month): [int(v) for v in row] for month, row in zip(monthly.index, monthly.values)
+        },
+        'category_totals': {} if category_totals is None else {
+            str(category): int(total) for category, total in category_totals.items()
+        },
+        'balance_cents': int(aggregates['balance_cents']),
+        'rows': int(aggregates['rows']),
+        'chunks': int(aggregates['chunks']),
+        'first_date': None if aggregates['first_date'] is None else aggregates['first_date'].isoformat(),
+        'last_date': None if aggregates['last_date'] is None else aggregates['last_date'].isoformat()
+    }
+
+
+def aggregates_from_dict(data):
+    """
+    Rebuild aggregates from the output of aggregates_to_dict().
+
+    Returns:
+        Aggregates dict (see empty_aggregates())
+    """
+    aggregates = empty_aggregates()
+    if data['monthly']:
+        index = pd.PeriodIndex(list(data['monthly']), freq='M', name='month')
+        aggregates['monthly'] = pd.DataFrame(list(data['monthly'].values()), index=index,
+                                             columns=['income', 'expenses', 'net_cashflow'], dtype='int64')
+    if data['category_totals']:
+        aggregates['category_totals'] = pd.Series(data['category_totals'], name='amount_cents',
+                                                  dtype='int64').rename_axis('category')
+
+    aggregates['balance_cents'] = data['balance_cents']
+    aggregates['rows'] = data['rows']
+    aggregates['chunks'] = data['chunks']
+    if data['first_date'] is not None:
+        aggregates['first_date'] = pd.Timestamp(data['first_date'])
+        aggregates['last_date'] = pd.Timestamp(data['last_date'])
+    return aggregates
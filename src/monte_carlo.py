@@ -0,0 +1,184 @@
+"""
+Monte Carlo Module
+
+This module projects a range of outcomes instead of a single average by:
+1. Taking each category's net cents per historical month from the ledger cube
+2. Simulating future months by bootstrapping: every category draws one of
+   its own historical months independently ('category'), or every month
+   draws a whole historical month so categories keep moving together ('month')
+3. Drawing several categories at once from a table of their summed
+   combinations, which is the same distribution as independent draws
+   with a fraction of the random numbers and gathers
+4. Running the paths in fixed-size chunks, each with its own seed spawned
+   from one root seed, so results are identical in-process or across any
+   number of worker processes
+5. Reducing the cumulative-savings paths to percentile bands and the
+   probability of reaching a savings goal
+
+All amounts are exact integer cents.
+"""
+
+import os
+
+from lazy_imports import lazy_import
+from ledger_cube import as_cube
+
+np = lazy_import('numpy')
+
+SIMULATION_METHODS = ('category', 'month')
+
+# Paths per chunk (and per seed); part of the results' identity, so changing it changes every result
+CHUNK_PATHS = 10_000
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+# Largest combination table for the 'category' method (int64 entries, kept cache-sized)
+MAX_TABLE_ENTRIES = 1 << 16
+
+
+def category_history(ledger):
+    """
+    Net cents per category in each month with transactions.
+
+    Args:
+        ledger: Ledger DataFrame or cube from build_cube()
+
+    Returns:
+        int64 array (months, categories); categories that never occur and
+        months without transactions are left out
+    """
+    cube = as_cube(ledger)
+    counts = cube['counts']
+    net = cube['cents'][..., 0] - cube['cents'][..., 1]
+    return net[np.ix_(counts.sum(axis=1) > 0, counts.sum(axis=0) > 0)]
+
+
+def combination_tables(history, max_entries=MAX_TABLE_ENTRIES):
+    """
+    Group categories so each group is drawn with a single random number.
+
+    For a group of k categories over n months, entry i of its table is the
+    sum of each category's month given by the base-n digits of i. Drawing i
+    uniformly from the n**k entries is the same as drawing every category's
+    month independently.
+
+    Args:
+        history: Array from category_history()
+        max_entries: Largest table size
+
+    Returns:
+        List of int64 arrays, one combination table per group of categories
+    """
+    n_months, n_categories = history.shape
+    group = 1
+    while group < n_categories and n_months ** (group + 1) <= max_entries:
+        group += 1
+    tables = []
+    for start in range(0, n_categories, group):
+        table = np.zeros(1, dtype='int64')
+        for column in history[:, start:start + group].T:
+            table = (table[:, None] + column).ravel()
+        tables.append(table)
+    return tables
+
+
+def simulate_chunk(history, months, n_paths, seed, method='category', monthly_change=0):
+    """
+    Simulate one chunk of cumulative net cash flow paths.
+
+    Kept at module level so it can be pickled for the process pool.
+
+    Args:
+        history: Array from category_history()
+        months: Months to simulate
+        n_paths: Number of paths
+        seed: numpy.random.SeedSequence for this chunk
+        method: 'category' or 'month' (see module docstring)
+        monthly_change: Cents added to every simulated month's net
+
+    Returns:
+        int64 array (n_paths, months) of cumulative net cents
+    """
+    rng = np.random.default_rng(seed)
+    if method == 'month':
+        tables = [history.sum(axis=1)]
+    else:
+        tables = combination_tables(history)
+    nets = np.zeros((n_paths, months), dtype='int64')
+    for table in tables:
+        nets += table[rng.integers(0, len(table), size=(n_paths, months))]
+    nets += monthly_change
+    return np.cumsum(nets, axis=1, out=nets)
+
+
+def simulate_paths(history, months, paths, seed=0, method='category', monthly_change=0, max_workers=1):
+    """
+    Simulate cumulative net cash flow paths, optionally in a process pool.
+
+    Args:
+        history: Array from category_history()
+        months: Months to simulate
+        paths: Number of paths
+        seed: Root seed; the same seed always gives the same paths
+        method: 'category' or 'month'
+        monthly_change: Cents added to every simulated month's net
+        max_workers: Worker processes (None: one per CPU; 1: in-process)
+
+    Returns:
+        int64 array (paths, months) of cumulative net cents
+    """
+    if method not in SIMULATION_METHODS:
+        raise ValueError(f"Unknown simulation method '{method}'. Choose one of: {', '.join(SIMULATION_METHODS)}.")
+    if months < 1 or paths < 1:
+        raise ValueError("Months and paths must be positive.")
+    if len(history) == 0:
+        raise ValueError("Need at least one month of transactions to simulate.")
+
+    sizes = [min(CHUNK_PATHS, paths - start) for start in range(0, paths, CHUNK_PATHS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(history, months, size, chunk_seed, method, monthly_change) for size, chunk_seed in zip(sizes, seeds)]
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    workers = max(1, min(max_workers, len(sizes)))
+    if workers == 1:
+        chunks = [simulate_chunk(*chunk_args) for chunk_args in args]
+    else:
+        # Imported here: the process pool machinery is slow to import and only needed for several workers
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(simulate_chunk, *zip(*args)))
+    return np.concatenate(chunks)
+
+
+def percentile_bands(cumulative, percentiles=DEFAULT_PERCENTILES):
+    """
+    Percentiles of cumulative net cash flow for every simulated month.
+
+    Args:
+        cumulative: Array from simulate_paths()
+        percentiles: Percentiles to compute (0-100)
+
+    Returns:
+        float64 array (percentiles, months) of cents
+    """
+    # Months as contiguous rows make the per-month selection cache-friendly
+    return np.percentile(np.ascontiguousarray(cumulative.T), percentiles, axis=1)
+
+
+def goal_probability(cumulative, goal_cents, month=None, start_cents=0):
+    """
+    Share of paths whose savings reach a goal by a given month.
+
+    Args:
+        cumulative: Array from simulate_paths()
+        goal_cents: Savings goal in cents
+        month: 1-based simulated month to check (default: the last one)
+        start_cents: Savings before the first simulated month
+
+    Returns:
+        Probability between 0 and 1
+    """
+    final = cumulative[:, (month or cumulative.shape[1]) - 1]
+    return float(np.mean(start_cents + final >= goal_cents))
@@ -0,0 +1,163 @@
+"""
+Small Ledger Module
+
+This module answers summary reports for small single-file ledgers without
+importing pandas or NumPy, whose import alone outweighs the work, by:
+1. Reading the file with the csv module, using the same dialect detection
+   and column aliases as the full loader
+2. Parsing dates with one format from the full loader's candidate list
+3. Aggregating exact integer cents per month and category in plain Python
+
+Anything the full loader would treat specially (unparseable dates or
+amounts, ragged rows, empty categories) makes the reader give up, so callers
+fall back to the full pipeline and its error reporting.
+"""
+
+import csv
+import math
+import os
+from datetime import datetime
+
+from money import CENTS_PER_DOLLAR
+from transaction_loader import DATE_FORMATS, detect_csv_dialect, required_column_renames
+
+# Files up to this size are summarized in pure Python
+SMALL_LEDGER_BYTES = 256 * 1024
+
+# Reports the pure-Python path can produce
+SMALL_LEDGER_REPORTS = ('monthly', 'savings', 'runway', 'breakdown')
+
+
+def infer_small_date_format(values):
+    """
+    Find the first candidate format that parses every distinct date string.
+
+    Args:
+        values: Iterable of distinct, stripped date strings
+
+    Returns:
+        Dict of date string -> datetime, or None if no single format fits
+    """
+    for fmt in DATE_FORMATS:
+        try:
+            return {value: datetime.strptime(value, fmt) for value in values}
+        except ValueError:
+            continue
+    return None
+
+
+def read_small_ledger(file_path, max_bytes=SMALL_LEDGER_BYTES):
+    """
+    Read a small ledger into (month, category, cents) tuples.
+
+    Args:
+        file_path: Path to a single CSV file
+        max_bytes: Largest file size handled here
+
+    Returns:
+        List of tuples ('YYYY-MM', category, amount in cents), or None if the
+        file is too large, not a plain file, or needs the full loader
+    """
+    if not os.path.isfile(file_path) or os.path.getsize(file_path) > max_bytes:
+        return None
+
+    try:
+        dialect = detect_csv_dialect(file_path)
+        renames = required_column_renames(dialect['header'])
+        with open(file_path, encoding=dialect['encoding'], newline='') as f:
+            rows = [row for row in csv.reader(f, delimiter=dialect['delimiter']) if row][1:]
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+    width = len(dialect['header'])
+    if not rows or any(len(row) != width for row in rows):
+        return None
+
+    positions = {target: dialect['header'].index(raw) for raw, target in renames.items()}
+    date_at, category_at, amount_at = positions['date'], positions['category'], positions['amount']
+
+    dates = infer_small_date_format(dict.fromkeys(row[date_at].strip() for row in rows))
+    if dates is None:
+        return None
+
+    ledger = []
+    for row in rows:
+        category = row[category_at]
+        try:
+            amount = float(row[amount_at])
+        except ValueError:
+            return None
+        if not category or not math.isfinite(amount):
+            return None
+        ledger.append((dates[row[date_at].strip()].strftime('%Y-%m'), category,
+                       round(amount * CENTS_PER_DOLLAR)))
+    return ledger
+
+
+def aggregate_small_ledger(ledger):
+    """
+    Fold read_small_ledger() output into per-month and per-category cents.
+
+    Args:
+        ledger: List of (month, category, cents) tuples
+
+    Returns:
+        Dict with 'monthly' (month -> (income, expenses, net) cents, sorted by
+        month) and 'category_totals' (category -> net cents)
+    """
+    monthly = {}
+    category_totals = {}
+    for month, category, cents in ledger:
+        income, expenses, net = monthly.get(month, (0, 0, 0))
+        if cents > 0:
+            income += cents
+        else:
+            expenses -= cents
+        monthly[month] = (income, expenses, net + cents)
+        category_totals[category] = category_totals.get(category, 0) + cents
+
+    return {'monthly': dict(sorted(monthly.items())), 'category_totals': category_totals}
+
+
+def small_ledger_report(aggregates, name):
+    """
+    Build one summary report from aggregate_small_ledger() output.
+
+    Results have the same fields as the pandas-based reports: monthly rows
+    sorted by month, expense categories from largest to smallest spend, and
+    percentages rounded to two decimals the way NumPy rounds them.
+
+    Args:
+        aggregates: Dict from aggregate_small_ledger()
+        name: Report name from SMALL_LEDGER_REPORTS
+
+    Returns:
+        List of row dicts (monthly, breakdown) or a dict (savings, runway)
+    """
+    monthly = aggregates['monthly']
+    savings = max(0, sum(net for _, _, net in monthly.values())) / CENTS_PER_DOLLAR
+
+    if name == 'monthly':
+        return [
+            {'month': month, 'income': income / CENTS_PER_DOLLAR, 'expenses': expenses / CENTS_PER_DOLLAR,
+             'net_cashflow': net / CENTS_PER_DOLLAR}
+            for month, (income, expenses, net) in monthly.items()
+        ]
+    if name == 'savings':
+        return {'total_savings': savings}
+    if name == 'runway':
+        avg_expenses = math.fsum(expenses / CENTS_PER_DOLLAR for _, expenses, _ in monthly.values()) / len(monthly)
+        return {
+            'runway_months': savings / avg_expenses if avg_expenses != 0 else float('inf'),
+            'savings': savings,
+            'avg_monthly_expenses': avg_expenses
+        }
+    if name == 'breakdown':
+        spending = sorted((cents, category) for category, cents in aggregates['category_totals'].items() if cents < 0)
+        total = -sum(cents for cents, _ in spending)
+        return [
+            {'Category': category, 'Amount': -cents / CENTS_PER_DOLLAR,
+             'Percentage': round(-cents / total * 100 * 100) / 100}
+            for cents, category in spending
+        ]
+    raise ValueError(f"Report '{name}' needs the full loader.")
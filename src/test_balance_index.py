@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script for the prefix-sum balance index (date-range balance queries)
+"""
+
+import numpy as np
+import pandas as pd
+
+from balance_index import balance_cents, balance_index, day_number, flow_cents
+from ledger_cube import build_cube
+from transaction_loader import compact_transactions
+
+# Random ledger with unsorted rows and days without transactions
+rng = np.random.default_rng(11)
+n_rows = 5_000
+ledger = pd.DataFrame({
+    'date': pd.to_datetime('2024-01-01') + pd.to_timedelta(rng.integers(0, 400, n_rows) * 2, unit='D'),
+    'category': rng.choice(['Rent', 'Groceries', 'Salary'], n_rows),
+    'amount': rng.normal(-10, 150, n_rows).round(2)
+})
+compact = compact_transactions(ledger.copy())
+cube = build_cube(compact)
+index = balance_index(cube)
+cents = compact['amount_cents']
+
+
+def brute_flow(start, end):
+    """Row-level reference: income, expenses and net between two dates."""
+    in_range = cents[(compact['date'] >= start) & (compact['date'] <= end)]
+    income, expenses = int(in_range[in_range > 0].sum()), -int(in_range[in_range < 0].sum())
+    return {'income': income, 'expenses': expenses, 'net': income - expenses}
+
+
+print("="*70)
+print("BALANCE INDEX - TEST SUITE")
+print("="*70)
+print(f"\n{n_rows} rows -> {len(index['days'])} indexed days")
+
+# Test 1: The index is built once per cube and covers the whole ledger
+print("\n" + "="*70)
+print("TEST 1: INDEX")
+print("="*70)
+assert balance_index(cube) is index
+assert np.all(np.diff(index['days']) > 0)
+assert len(index['income']) == len(index['days']) + 1 and index['income'][0] == 0
+assert balance_cents(index) == int(cents.sum())
+assert day_number('1970-01-02') == 1 and day_number(pd.Timestamp('2024-01-01')) == 19723
+print(f"Final balance: {balance_cents(index)} cents")
+
+# Test 2: Balances and flows match a row-level filter, on and between transaction days
+print("\n" + "="*70)
+print("TEST 2: DATE-RANGE QUERIES")
+print("="*70)
+for start, end in [('2024-01-01', '2024-01-01'), ('2024-01-02', '2024-01-02'), ('2024-03-10', '2024-09-01'),
+                   ('2023-01-01', '2030-01-01'), ('2024-06-01', '2024-05-01')]:
+    expected = brute_flow(pd.Timestamp(start), pd.Timestamp(end))
+    assert flow_cents(index, start, end) == expected
+    assert balance_cents(index, end) == int(cents[compact['date'] <= end].sum())
+    print(f"{start} .. {end}: {expected}")
+assert balance_cents(index, '2000-01-01') == 0
+assert flow_cents(index) == brute_flow(compact['date'].min(), compact['date'].max())
+
+# Test 3: Invalid dates and empty ledgers
+print("\n" + "="*70)
+print("TEST 3: EDGE CASES")
+print("="*70)
+try:
+    balance_cents(index, 'not a date')
+    raise AssertionError("Expected ValueError")
+except ValueError as e:
+    print(f"Rejected: {e}")
+empty = balance_index(compact.iloc[:0])
+assert balance_cents(empty) == 0 and flow_cents(empty, '2024-01-01', '2024-12-31')['net'] == 0
+print("Empty ledger: balance 0")
+
+print("\n" + "="*70)
+print("TEST SUITE COMPLETE")
+print("="*70)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test script for the non-interactive cashflow library API
+"""
+
+import contextlib
+import io
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+print("="*70)
+print("CASHFLOW LIBRARY API - TEST SUITE")
+print("="*70)
+
+# Test 1: Importing does no work (no prompt, no output, no file access)
+print("\n" + "="*70)
+print("TEST 1: SIDE-EFFECT-FREE IMPORT")
+print("="*70)
+captured = io.StringIO()
+with contextlib.redirect_stdout(captured):
+    import cashflow
+assert captured.getvalue() == ""
+print("Imported cashflow without prompting or printing")
+
+# Test 2: Loading and aggregating through the API
+print("\n" + "="*70)
+print("TEST 2: LOAD AND AGGREGATE")
+print("="*70)
+df, report = cashflow.load_ledger(os.path.join('data', 'multi_month_transactions.csv'))
+monthly = cashflow.monthly_cashflow(df)
+assert list(monthly.columns) == ['month', 'income', 'expenses', 'net_cashflow']
+assert np.isclose(monthly['net_cashflow'].sum(), 1344.5)
+assert cashflow.total_savings(df) == 1344.5
+runway = cashflow.runway(df)
+assert np.isclose(runway['runway_months'], 1344.5 / monthly['expenses'].mean())
+assert cashflow.balance(df, '2025-05-31') == 327.0 and cashflow.total_savings(df, '2025-06-30') == 825.0
+assert cashflow.flows(df, '2025-06-01', '2025-06-30') == {'income': 1450.0, 'expenses': 952.0, 'net': 498.0}
+assert np.isclose(cashflow.runway(df, '2025-06-15')['avg_monthly_expenses'], (1123.0 + 952.0) / 2)
+breakdown = cashflow.category_breakdown(df)
+assert np.isclose(breakdown['Percentage'].sum(), 100, atol=0.1)
+print(monthly.to_string(index=False))
+print(f"\nSavings: ${runway['savings']:.2f}, runway: {runway['runway_months']:.1f} months")
+
+# Test 3: Scenarios and goals take parameters instead of prompts
+print("\n" + "="*70)
+print("TEST 3: SCENARIO AND GOAL")
+print("="*70)
+result = cashflow.scenario(df, 6, income_change=200, expense_change=-50)
+assert len(result['projection']) == 6
+assert np.isclose(result['difference'], 250 * 6)
+goal = cashflow.plan_goal(df, 5000, 12)
+assert np.isclose(goal['remaining_needed'], 5000 - 1344.5)
+assert np.isclose(goal['required_monthly_savings'], (5000 - 1344.5) / 12)
+assert cashflow.plan_goal(df, 5000, '2000-01-01') == {"error": "Target date is in the past"}
+print(f"Scenario difference after 6 months: ${result['difference']:.2f}")
+print(f"Required monthly savings for $5000 in 12 months: ${goal['required_monthly_savings']:.2f}")
+
+# Test 4: Projections are built in one array pass: consecutive months, running-sum cumulative savings
+print("\n" + "="*70)
+print("TEST 4: VECTORIZED PROJECTION")
+print("="*70)
+projection = cashflow.project_future_cashflow(monthly, 600, required_savings=100)
+assert list(projection.columns) == ['month', 'income', 'expenses', 'net_cashflow', 'cumulative_savings']
+months = pd.PeriodIndex(projection['month'], freq='M')
+assert months[0] == pd.Period(datetime.now(), freq='M') + 1 and (months[1:] - months[:-1] == months.freq).all()
+net = monthly['income'].mean() - (monthly['expenses'].mean() + 100)
+cumulative, expected = 0, []
+for _ in range(600):  # The month-by-month loop the projection replaces
+    cumulative += net
+    expected.append(cumulative)
+assert np.array_equal(projection['cumulative_savings'], expected)
+assert cashflow.project_future_cashflow(monthly, 0).empty
+print(projection.tail(3).to_string(index=False))
+
+# Test 5: A scenario grid matches one project_scenario() call per scenario
+print("\n" + "="*70)
+print("TEST 5: SCENARIO GRID")
+print("="*70)
+grid = cashflow.scenario_grid(df, income_changes=[0, 250, -100], expense_changes=[0, -75.5], horizons=[6, 24])
+assert grid['values'].shape == (6, 24, len(cashflow.SCENARIO_METRICS)) and len(grid['summary']) == 12
+for k, (income_change, expense_change) in grid['scenarios'].iterrows():
+    single = cashflow.scenario(df, 24, income_change, expense_change)
+    assert np.array_equal(single['projection'][list(cashflow.SCENARIO_METRICS)].to_numpy(), grid['values'][k])
+    final = grid['summary'].iloc[2 * k + 1]
+    assert final['months'] == 24 and final['cumulative_savings'] == single['scenario_cumulative']
+    assert final['difference'] == single['difference']
+assert list(grid['months']) == list(single['projection']['month'])
+try:
+    cashflow.scenario_grid(df, horizons=[0])
+    raise AssertionError("Expected ValueError")
+except ValueError as e:
+    print(f"Rejected: {e}")
+print(grid['summary'].to_string(index=False))
+
+# Test 6: Batch goal solver over users x candidate dates, with earliest feasible dates
+print("\n" + "="*70)
+print("TEST 6: BATCH SAVINGS GOALS")
+print("="*70)
+goals = np.array([[5000.0], [1000.0], [20000.0], [3000.0]])
+savings = np.array([[1344.5], [1500.0], [0.0], [0.0]])
+net = np.array([[448.17], [100.0], [-5.0], [250.0]])
+dates = np.array(['2025-01-01', '2026-11-01', '2027-06-30', '2030-01-01'], dtype='datetime64[D]')
+plan = cashflow.solve_savings_goals(goals, dates, savings, net, today='2026-10-17')
+assert all(values.shape == (4, 4) for values in plan.values())
+for user, date in np.ndindex(4, 4):
+    days = (dates[date] - np.datetime64('2026-10-17')).astype(int)
+    remaining = goals[user, 0] - savings[user, 0]
+    if days <= 0:
+        assert np.isnan(plan['required_monthly_savings'][user, date]) and not plan['achievable'][user, date]
+        continue
+    required = 0.0 if remaining <= 0 else remaining / (days / cashflow.DAYS_PER_MONTH)
+    assert np.isclose(plan['required_monthly_savings'][user, date], required)
+    assert plan['achievable'][user, date] == (required <= net[user, 0])
+earliest = plan['earliest_date'][:, 0]
+assert earliest[1] == np.datetime64('2026-10-18') and np.isnat(earliest[2])  # Already met: tomorrow
+for user in (0, 1, 3):
+    # Achievable from the earliest date on, not a day before
+    check = cashflow.solve_savings_goals(goals[user], [earliest[user] - 1, earliest[user]], savings[user], net[user],
+                                         today='2026-10-17')
+    assert list(check['achievable']) == [False, True]
+# Already met but losing money every month: never achievable, so no earliest date
+met_losing = cashflow.solve_savings_goals(1000, ['2026-10-18', '2030-01-01'], 1500, -50, today='2026-10-17')
+assert not met_losing['achievable'].any() and np.isnat(met_losing['earliest_date']).all()
+ledger_plan = cashflow.plan_goals(df, [5000, 10000], '2030-01-01')
+assert np.allclose(ledger_plan['remaining_needed'], [5000 - 1344.5, 10000 - 1344.5])
+print(f"Earliest feasible dates: {earliest}")
+
+print("\n" + "="*70)
+print("TEST SUITE COMPLETE")
+print("="*70)
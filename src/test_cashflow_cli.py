@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for the headless batch CLI (JSON/CSV report output)
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+from cashflow_cli import main
+
+multi_month = os.path.join('data', 'multi_month_transactions.csv')
+sample = os.path.join('data', 'sample_transactions.csv')
+
+
+def run_cli(*argv):
+    """Run the CLI in-process and return (exit code, stdout, stderr)."""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        code = main(list(argv))
+    return code, stdout.getvalue(), stderr.getvalue()
+
+
+print("="*70)
+print("BATCH CLI - TEST SUITE")
+print("="*70)
+
+# Test 1: JSON output, one object per ledger, only the requested reports
+print("\n" + "="*70)
+print("TEST 1: JSON REPORTS")
+print("="*70)
+code, out, err = run_cli('monthly', 'runway', 'scenario', '--months', '3', '--income-change', '100',
+                         '-l', multi_month, '-l', sample, '--timings')
+assert code == 0
+lines = [json.loads(line) for line in out.splitlines()]
+assert [line['ledger'] for line in lines] == [multi_month, sample]
+assert set(lines[0]) == {'ledger', 'monthly', 'runway', 'scenario'}
+assert lines[0]['runway']['savings'] == 1344.5
+assert len(lines[0]['scenario']['projection']) == 3
+assert abs(lines[0]['scenario']['difference'] - 300) < 1e-9
+timings = [json.loads(line) for line in err.splitlines()]
+assert set(timings[0]['report_seconds']) == {'monthly', 'runway', 'scenario'} and timings[0]['path'] == 'full'
+assert 'import_seconds' in timings[-1]
+print(json.dumps(lines[0]['runway']))
+print(err.strip())
+
+# Test 2: CSV output with a leading ledger column, to stdout or one file per report
+print("\n" + "="*70)
+print("TEST 2: CSV REPORTS")
+print("="*70)
+code, out, _ = run_cli('monthly', '--format', 'csv', '-l', multi_month, '-l', sample)
+monthly = pd.read_csv(io.StringIO(out))
+assert list(monthly.columns) == ['ledger', 'month', 'income', 'expenses', 'net_cashflow']
+assert len(monthly) == 4
+out_dir = tempfile.mkdtemp()
+code, _, _ = run_cli('savings', 'breakdown', 'insights', '--format', 'csv', '--output-dir', out_dir,
+                     '-l', multi_month)
+assert sorted(os.listdir(out_dir)) == ['breakdown.csv', 'insights.csv', 'savings.csv']
+assert pd.read_csv(os.path.join(out_dir, 'savings.csv'))['total_savings'].iloc[0] == 1344.5
+code, out, _ = run_cli('cashflow', '--granularity', 'quarter', '--format', 'csv', '-l', multi_month)
+quarterly = pd.read_csv(io.StringIO(out))
+assert list(quarterly.columns) == ['ledger', 'quarter', 'income', 'expenses', 'net_cashflow']
+assert abs(quarterly['net_cashflow'].sum() - 1344.5) < 1e-9
+code, out, _ = run_cli('history', '--format', 'csv', '-l', multi_month)
+history = pd.read_csv(io.StringIO(out))
+assert list(history.columns[:4]) == ['ledger', 'category', 'previous_month', 'current_month'] and len(history) == 16
+print(out.strip())
+
+# Test 3: A bad ledger is reported without aborting the batch
+print("\n" + "="*70)
+print("TEST 3: FAILED LEDGER")
+print("="*70)
+code, out, _ = run_cli('savings', '-l', 'missing.csv', '-l', sample)
+lines = [json.loads(line) for line in out.splitlines()]
+assert code == 1 and 'error' in lines[0] and 'savings' in lines[1]
+print(lines[0])
+code, out, _ = run_cli('savings', 'runway', '--as-of', '2025-05-31', '-l', multi_month)
+lines = [json.loads(line) for line in out.splitlines()]
+assert lines[0]['savings'] == {'total_savings': 327.0} and lines[0]['runway']['avg_monthly_expenses'] == 1123.0
+
+# Test 4: Files of at least --stream-bytes are summarized chunk by chunk with the same results
+print("\n" + "="*70)
+print("TEST 4: STREAMED LEDGER")
+print("="*70)
+summary_reports = ('monthly', 'savings', 'runway', 'breakdown')
+_, expected, _ = run_cli(*summary_reports, '-l', multi_month)
+code, out, err = run_cli(*summary_reports, '--stream-bytes', '0', '--timings', '-l', multi_month)
+assert code == 0 and json.loads(out) == json.loads(expected)
+assert json.loads(err.splitlines()[0])['path'] == 'stream'
+assert json.loads(out)['savings'] == {'total_savings': 1344.5}
+code, out, err = run_cli('monthly', 'scenario', '--stream-bytes', '0', '--timings', '-l', multi_month)
+assert json.loads(err.splitlines()[0])['path'] == 'full'
+code, out, _ = run_cli('savings', '--stream-bytes', '0', '-l', 'missing.csv')
+assert code == 1 and 'error' in json.loads(out)
+print(err.strip())
+
+print("\n" + "="*70)
+print("TEST SUITE COMPLETE")
+print("="*70)
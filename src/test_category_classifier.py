@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script for the compiled (Aho-Corasick) category classifier
+"""
+
+import numpy as np
+
+from benchmark import merchant_categories, reference_classify_category
+from category_classifier import CategoryClassifier
+from delayed_gratification import (
+    DISCRETIONARY_CATEGORIES,
+    ESSENTIAL_CATEGORIES,
+    category_classifier,
+    classify_categories,
+    classify_category
+)
+
+print("="*70)
+print("CATEGORY CLASSIFIER - TEST SUITE")
+print("="*70)
+
+# Test 1: Same answers as the linear keyword scan, including edge cases
+print("\n" + "="*70)
+print("TEST 1: IDENTICAL TO THE LINEAR SCAN")
+print("="*70)
+tricky = ['Eating Out', '  RENT ', 'Gas Station', 'gaming', 'game', 'Games', 'us', 'e', '', '   ',
+          'Online Shopping Amazon', 'part-time job', 'Part-Time', 'Workshop', 'Foodie Coffee', 'Schoolbooks',
+          'Bus pass', 'Café', 'Gym \U0001F3CB', 'Utilities & Internet', 'Misc', 'drinks & food', 'ent']
+rng = np.random.default_rng(3)
+letters = list('abcdefghijklmnopqrstuvwxyz -')
+random_names = [''.join(rng.choice(letters, rng.integers(1, 9))) for _ in range(3000)]
+names = tricky + random_names + merchant_categories(5000)
+expected = [reference_classify_category(name) for name in names]
+assert classify_categories(names) == expected
+assert [classify_category(name) for name in names] == expected
+for name in tricky:
+    print(f"{name!r:28s} -> {classify_category(name)}")
+
+# Test 2: Precedence between taxonomies
+print("\n" + "="*70)
+print("TEST 2: PRECEDENCE")
+print("="*70)
+classifier = CategoryClassifier([('first', {'card', 'bar'}), ('second', {'bar fees', 'car', 'cards'})], default='none')
+cases = {
+    'cards': 'second',       # Exact match in the second taxonomy beats a substring in the first
+    'Car': 'second',          # Exact match
+    'bar fees': 'second',     # Exact match, although it contains 'bar'
+    'bar fee': 'first',       # Contains 'bar' (first) and is part of 'bar fees' (second)
+    'ca': 'first',            # Part of 'card' (first) and of 'car' (second)
+    'rent a car': 'second',
+    'xyz': 'none'
+}
+for name, label in cases.items():
+    assert classifier.classify(name) == label, name
+assert classifier.classify_many(list(cases)) == list(cases.values())
+assert classifier.classify_many([]) == []
+print(cases)
+
+# Test 3: Memoized single lookups and one compiled classifier per process
+print("\n" + "="*70)
+print("TEST 3: MEMO AND COMPILATION")
+print("="*70)
+assert category_classifier() is category_classifier()
+default = category_classifier()
+hits = default.classify.cache_info().hits
+classify_category('Eating Out')
+assert default.classify.cache_info().hits == hits + 1
+assert set(default._exact) == DISCRETIONARY_CATEGORIES | ESSENTIAL_CATEGORIES
+print(default.classify.cache_info())
+
+print("\n" + "="*70)
+print("TEST SUITE COMPLETE")
+print("="*70)
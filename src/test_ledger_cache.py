@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Test script for the parsed-ledger cache (fingerprinting, invalidation, eviction)
+"""
+
+import os
+import shutil
+import tempfile
+
+import ledger_cache
+from ledger_cache import cached_aggregates, evict_cache, invalidate_cache, load_transactions_cached
+from transaction_loader import load_transactions
+
+tmp_dir = tempfile.mkdtemp()
+cache_dir = os.path.join(tmp_dir, 'cache')
+source = os.path.join(tmp_dir, 'transactions.csv')
+shutil.copy('data/multi_month_transactions.csv', source)
+
+print("="*70)
+print("LEDGER CACHE - TEST SUITE")
+print("="*70)
+
+# Test 1: First load parses, second load is served from the cache
+print("\n" + "="*70)
+print("TEST 1: CACHE MISS THEN HIT")
+print("="*70)
+df, report = load_transactions_cached(source, cache_dir=cache_dir)
+assert report['cache'] == 'miss'
+cached_df, cached_report = load_transactions_cached(source, cache_dir=cache_dir)
+assert cached_report['cache'] == 'hit'
+assert cached_df.equals(df)
+print(f"miss: {report['load_seconds'] * 1000:.1f} ms, hit: {cached_report['load_seconds'] * 1000:.1f} ms")
+print(f"Cached columns: {dict(cached_df.dtypes.astype(str))}")
+
+# Test 2: Touching the file keeps the entry, changing it invalidates
+print("\n" + "="*70)
+print("TEST 2: FINGERPRINT INVALIDATION")
+print("="*70)
+os.utime(source, ns=(0, 0))
+assert load_transactions_cached(source, cache_dir=cache_dir)[1]['cache'] == 'hit'
+print("touched, same content -> hit")
+with open(source, 'a') as f:
+    f.write("2025-07-30,Coffee,-5.00\n")
+df, report = load_transactions_cached(source, cache_dir=cache_dir, incremental=False)
+assert report['cache'] == 'stale' and len(df) == 31
+print("appended row, non-incremental -> stale, re-parsed 31 rows")
+assert invalidate_cache(source, cache_dir)
+assert load_transactions_cached(source, cache_dir=cache_dir)[1]['cache'] == 'miss'
+print("explicit invalidation -> miss")
+
+
+def read_only(*args, **kwargs):
+    """Stand-in for writes to a read-only cache directory."""
+    raise PermissionError(13, "Read-only file system")
+
+
+os.utime(source, ns=(1, 1))
+real_utime, real_write_meta = os.utime, ledger_cache.write_cache_meta
+os.utime, ledger_cache.write_cache_meta = read_only, read_only
+try:
+    assert load_transactions_cached(source, cache_dir=cache_dir)[1]['cache'] == 'hit'
+finally:
+    os.utime, ledger_cache.write_cache_meta = real_utime, real_write_meta
+print("read-only cache, touched file -> still a hit")
+
+# Test 3: Incremental append merges only the new tail
+print("\n" + "="*70)
+print("TEST 3: INCREMENTAL APPEND")
+print("="*70)
+with open(source, 'a') as f:
+    f.write("2025-08-01,Part-time Job,450.00\n2025-08-03,Eating Out,-30.00\n2025-08-05,Coff")
+df, report = load_transactions_cached(source, cache_dir=cache_dir)
+assert report['cache'] == 'append' and report['appended_rows'] == 2 and len(df) == 33
+print(f"appended 2 complete lines (partial line left for later) in {report['load_seconds'] * 1000:.1f} ms")
+with open(source, 'a') as f:
+    f.write("ee,-4.00\n")
+df, report = load_transactions_cached(source, cache_dir=cache_dir)
+assert report['appended_rows'] == 1 and df['category'].iloc[-1] == 'Coffee'
+aggregates = cached_aggregates(source, cache_dir)
+assert aggregates['rows'] == len(df)
+assert aggregates['balance_cents'] == df['amount_cents'].sum()
+print(f"completed line appended; cached aggregates cover {aggregates['rows']} rows")
+
+with open(source, 'rb') as f:
+    content = f.read()
+with open(source, 'wb') as f:
+    f.write(content.replace(b'Rent,-600.00', b'Rent,-650.00', 1))
+df, report = load_transactions_cached(source, cache_dir=cache_dir)
+assert report['cache'] == 'stale' and len(df) == 34
+print("rewritten history -> stale, full reload")
+with open(source, 'wb') as f:
+    f.write(content[:content.index(b'2025-06-02')])
+df, report = load_transactions_cached(source, cache_dir=cache_dir)
+assert report['cache'] == 'stale' and len(df) == 10
+print("truncated file -> stale, full reload")
+
+# A partly written last row at the first load is never cached as the append boundary
+partial = os.path.join(tmp_dir, 'partial.csv')
+with open(partial, 'w') as f:
+    f.write("date,category,amount\n2025-01-02,Food,-10.00\n2025-01-03,Coffee,-4")
+df, report = load_transactions_cached(partial, cache_dir=cache_dir)
+assert df['amount_cents'].sum() == -1400
+with open(partial, 'a') as f:
+    f.write(".75\n2025-01-04,Food,-1\n")
+df, report = load_transactions_cached(partial, cache_dir=cache_dir)
+assert report['cache'] == 'stale' and report['invalid_dates'] == 0 and df['amount_cents'].sum() == -1575
+with open(partial, 'a') as f:
+    f.write("2025-01-05,Food,-2\n")
+df, report = load_transactions_cached(partial, cache_dir=cache_dir)
+assert report['cache'] == 'append' and df['amount_cents'].sum() == -1775
+print("partial last row at first load -> full reload on the next append, then incremental")
+
+
+def assert_same_as_full_load(path, df, report):
+    """The cached ledger and report agree with parsing the file from scratch."""
+    full_df, full_report = load_transactions(path)
+    assert len(df) == len(full_df) and df['amount_cents'].sum() == full_df['amount_cents'].sum()
+    assert list(df['category'].astype(object).fillna('')) == list(full_df['category'].astype(object).fillna(''))
+    assert report['invalid_date_rows'] == full_report['invalid_date_rows']
+
+
+# Appends a full reload accepts: blank categories, footers, another encoding, UTF-16 files
+messy = os.path.join(tmp_dir, 'messy.csv')
+shutil.copy('data/multi_month_transactions.csv', messy)
+load_transactions_cached(messy, cache_dir=cache_dir)
+for tail, status in [(b"2025-08-10,,90.00\n", 'append'), (b"Total,,90\n2025-08-11,Food,-1.00\n", 'append'),
+                     (b"2025-08-12,Caf\xe9,-3.00\n", 'stale')]:
+    with open(messy, 'ab') as f:
+        f.write(tail)
+    df, report = load_transactions_cached(messy, cache_dir=cache_dir)
+    assert report['cache'] == status, (tail, report['cache'])
+    assert_same_as_full_load(messy, df, report)
+wide = os.path.join(tmp_dir, 'wide.csv')
+with open(wide, 'w', encoding='utf-16') as f:
+    f.write("date,category,amount\n2025-01-02,Food,-10.00\n")
+load_transactions_cached(wide, cache_dir=cache_dir)
+with open(wide, 'ab') as f:
+    f.write("2025-01-03,Café,-4.00\n".encode('utf-16-le'))
+df, report = load_transactions_cached(wide, cache_dir=cache_dir)
+assert report['cache'] == 'stale'
+assert_same_as_full_load(wide, df, report)
+print("blank category and footer rows -> append; cp1252 tail and UTF-16 file -> full reload")
+day_first = os.path.join(tmp_dir, 'day_first.csv')
+with open(day_first, 'w') as f:
+    f.write("date,category,amount\n13/01/2025,Rent,-1.00\n14/02/2025,Rent,-1.00\n")
+load_transactions_cached(day_first, cache_dir=cache_dir)
+with open(day_first, 'a') as f:
+    f.write("03/04/2025,Rent,-1.00\n")
+df, report = load_transactions_cached(day_first, cache_dir=cache_dir)
+assert report['cache'] == 'append' and str(df['date'].iloc[-1].date()) == '2025-04-03'
+print("ambiguous appended date -> read with the cached day-first format")
+
+# Edits far before the end of a large file are caught, with or without appended rows
+large = os.path.join(tmp_dir, 'large.csv')
+with open(large, 'w') as f:
+    f.write("date,category,amount\n2025-01-01,Coffee,-10.50\n")
+    f.writelines(f"2025-{month:02d}-15,Rent,-1500.00\n" for month in range(1, 13) for _ in range(1000))
+assert os.path.getsize(large) > 256 * 1024
+df, report = load_transactions_cached(large, cache_dir=cache_dir)
+expected_cents = df['amount_cents'].sum()
+with open(large, 'r+b') as f:
+    f.seek(f.read().index(b'-10.50'))
+    f.write(b'-99.50')  # Same size, new mtime
+df, report = load_transactions_cached(large, cache_dir=cache_dir)
+assert report['cache'] == 'stale' and df['amount_cents'].sum() == expected_cents - 8900
+with open(large, 'r+b') as f:
+    f.seek(f.read().index(b'-99.50'))
+    f.write(b'-10.50')
+with open(large, 'a') as f:
+    f.write("2025-12-31,Coffee,-4.00\n")
+df, report = load_transactions_cached(large, cache_dir=cache_dir)
+assert report['cache'] == 'stale' and df['amount_cents'].sum() == expected_cents - 400
+with open(large, 'a') as f:
+    f.write("2025-12-31,Coffee,-4.00\n")
+df, report = load_transactions_cached(large, cache_dir=cache_dir)
+assert report['cache'] == 'append' and df['amount_cents'].sum() == expected_cents - 800
+os.utime(large, ns=(0, 0))
+assert load_transactions_cached(large, cache_dir=cache_dir)[1]['cache'] == 'hit'
+print(f"{os.path.getsize(large) // 1024} KB file: early edit (same size or with an append) -> stale, "
+      f"clean append -> append, then touched -> hit")
+
+# Test 4: Size-bounded eviction keeps the most recently used entry
+print("\n" + "="*70)
+print("TEST 4: SIZE-BOUNDED EVICTION")
+print("="*70)
+other = os.path.join(tmp_dir, 'other.csv')
+shutil.copy('data/dramatic_savings_transactions.csv', other)
+load_transactions_cached(other, cache_dir=cache_dir)
+evicted = evict_cache(cache_dir, max_bytes=1)
+remaining = [name for name in os.listdir(cache_dir) if name.endswith('.data')]
+print(f"Evicted {len(evicted)} entries, {len(remaining)} remaining")
+assert len(evicted) == 7 and not remaining
+
+print("\n" + "="*70)
+print("TEST SUITE COMPLETE")
+print("="*70)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test script for the pre-aggregated month x category x sign cube
+"""
+
+import numpy as np
+import pandas as pd
+
+from benchmark import (
+    reference_category_spending_trends,
+    reference_insight_blocks,
+    reference_insight_text,
+    reference_map_to_reward,
+    synthetic_trends
+)
+from cashflow import calculate_cashflow, calculate_category_breakdown, calculate_monthly_cashflow, calculate_total_savings
+from delayed_gratification import (
+    InsightBlocks,
+    category_trend_matrix,
+    detect_delayed_gratification,
+    detect_delayed_gratification_history,
+    get_category_spending_trends,
+    generate_delayed_gratification_insights,
+    get_category_trend_history,
+    map_to_reward,
+    map_to_rewards,
+    project_delayed_gratification,
+    project_future_value,
+    render_insights
+)
+from ledger_cube import GRANULARITIES, build_cube, category_totals, monthly_totals, rollup_totals, total_cents
+from transaction_loader import compact_transactions
+
+# Random ledger with a gap month and a few missing categories
+rng = np.random.default_rng(7)
+n_rows = 20_000
+dates = pd.to_datetime('2023-01-01') + pd.to_timedelta(rng.integers(0, 700, n_rows), unit='D')
+ledger = pd.DataFrame({
+    'date': dates,
+    'category': rng.choice(['Rent', 'Eating Out', 'Groceries', 'Salary', 'Coffee', 'Shopping'], n_rows),
+    'amount': rng.normal(-20, 200, n_rows).round(2)
+})
+ledger = ledger[ledger['date'].dt.to_period('M') != pd.Period('2023-06', 'M')].reset_index(drop=True)
+ledger.loc[::997, 'category'] = None
+compact = compact_transactions(ledger.copy())
+cube = build_cube(compact)
+
+print("="*70)
+print("LEDGER CUBE - TEST SUITE")
+print("="*70)
+print(f"\n{cube['rows']} rows -> cube of shape {cube['cents'].shape}")
+
+# Test 1: Cube totals equal row-level totals
+print("\n" + "="*70)
+print("TEST 1: TOTALS")
+print("="*70)
+cents = compact['amount_cents']
+assert cube['rows'] == len(compact) and cube['counts'].sum() == len(compact)
+assert total_cents(cube) == (int(cents[cents > 0].sum()), -int(cents[cents < 0].sum()))
+assert calculate_total_savings(cube) == calculate_total_savings(ledger)
+print(f"income/expense cents: {total_cents(cube)}")
+
+# Test 2: Reports served from the cube equal reports computed from rows
+print("\n" + "="*70)
+print("TEST 2: REPORTS FROM CUBE")
+print("="*70)
+for from_cube, from_rows in zip(monthly_totals(cube), monthly_totals(compact)):
+    assert np.array_equal(from_cube, from_rows)
+pd.testing.assert_frame_equal(calculate_monthly_cashflow(cube), calculate_monthly_cashflow(ledger))
+assert '2023-06' not in set(calculate_monthly_cashflow(cube)['month'])
+expected_totals = cents.groupby(compact['category'], observed=True).sum()
+assert category_totals(cube).to_dict() == expected_totals.to_dict()
+pd.testing.assert_frame_equal(calculate_category_breakdown(cube), calculate_category_breakdown(ledger))
+print(calculate_category_breakdown(cube).to_string(index=False))
+
+# Test 3: Spending trends from the cube match a row-level groupby
+print("\n" + "="*70)
+print("TEST 3: SPENDING TRENDS FROM CUBE")
+print("="*70)
+trends = get_category_spending_trends(cube)
+expenses = ledger[ledger['amount'] < 0]
+by_month = (-expenses['amount']).groupby([expenses['category'], expenses['date'].dt.to_period('M')]).sum()
+for _, row in trends.iterrows():
+    last_two = by_month[row['category']].sort_index().tail(2)
+    assert [str(month) for month in last_two.index] == [row['previous_month'], row['current_month']]
+    assert np.allclose(last_two.values, [row['previous_month_spend'], row['current_month_spend']])
+pd.testing.assert_frame_equal(trends, get_category_spending_trends(ledger))
+pd.testing.assert_frame_equal(trends, reference_category_spending_trends(ledger))  # Same as the per-category loop
+print(trends[['category', 'previous_month', 'current_month', 'trend_direction']].to_string(index=False))
+
+# Test 4: Day, week, month, quarter and year rollups match a row-level groupby
+print("\n" + "="*70)
+print("TEST 4: PERIOD ROLLUPS")
+print("="*70)
+iso = compact['date'].dt.isocalendar()
+periods = {
+    'day': compact['date'].dt.strftime('%Y-%m-%d'),
+    'week': iso['year'].astype(str) + '-W' + iso['week'].astype(str).str.zfill(2),
+    'month': compact['date'].dt.to_period('M').astype(str),
+    'quarter': compact['date'].dt.to_period('Q').astype(str),
+    'year': compact['date'].dt.to_period('Y').astype(str)
+}
+for granularity in GRANULARITIES:
+    labels, income, expenses, net = rollup_totals(cube, granularity)
+    grouped = cents.groupby(periods[granularity])
+    assert labels == list(grouped.groups) and labels == sorted(labels)
+    assert np.array_equal(income, grouped.agg(lambda x: x[x > 0].sum()).to_numpy())
+    assert np.array_equal(expenses, grouped.agg(lambda x: -x[x < 0].sum()).to_numpy())
+    assert np.array_equal(net, grouped.sum().to_numpy())
+    print(f"{granularity:>8s}: {len(labels)} periods, {labels[0]} .. {labels[-1]}")
+assert rollup_totals(cube, 'week') is rollup_totals(cube, 'week')  # Cached on the cube
+pd.testing.assert_frame_equal(calculate_cashflow(cube), calculate_monthly_cashflow(cube))
+print(calculate_cashflow(cube, 'quarter').to_string(index=False))
+
+# Test 5: Trends over the whole history match a per-category walk over a sparse ledger
+print("\n" + "="*70)
+print("TEST 5: FULL-HISTORY TRENDS")
+print("="*70)
+sparse = compact_transactions(ledger.sample(400, random_state=5).copy())
+history = get_category_trend_history(sparse)
+spending = sparse[sparse['amount_cents'] < 0]
+by_month = (-spending['amount_cents']).groupby([spending['category'], spending['date'].dt.to_period('M')],
+                                               observed=True).sum()
+expected_pairs = []
+for category in history['category'].unique():
+    months = by_month[category].sort_index()
+    expected_pairs += [(category, str(prev), str(curr), int(curr_cents - prev_cents))
+                       for (prev, prev_cents), (curr, curr_cents) in zip(months.items(), list(months.items())[1:])]
+actual_pairs = list(zip(history['category'], history['previous_month'], history['current_month'],
+                        (history['absolute_change'] * 100).round().astype('int64')))
+assert actual_pairs == expected_pairs
+assert len(history) == sum(len(by_month[category]) - 1 for category in history['category'].unique())
+latest = history.groupby('category', sort=False).tail(1).reset_index(drop=True)
+pd.testing.assert_frame_equal(latest, get_category_spending_trends(sparse))
+matrix = category_trend_matrix(cube)
+assert matrix['expenses'].shape == matrix['change_cents'].shape == (len(matrix['months']), len(matrix['categories']))
+assert np.array_equal(np.isnan(matrix['percentage_change']), matrix['previous'] < 0)
+detected = detect_delayed_gratification_history(sparse)
+assert len(detected) == len(detect_delayed_gratification(history))
+assert list(detected.columns[:3]) == ['category', 'previous_month', 'current_month']
+assert get_category_trend_history(compact.iloc[:0]).empty
+# Insight text from column operations equals the per-row f-string, also without the column at first
+many = detect_delayed_gratification(synthetic_trends(20_000), insights=False)
+assert 'insight' not in many and many['saved_amount'].min() < 1 < many['saved_amount'].max()
+assert render_insights(many).equals(reference_insight_text(many))
+assert detected['insight'].equals(reference_insight_text(detected))
+print(f"{len(history)} month pairs over {history['category'].nunique()} categories, {len(detected)} reductions")
+
+# Test 6: Stage 3 as one table, with text blocks formatted on access
+print("\n" + "="*70)
+print("TEST 6: STAGE 3 PROJECTIONS")
+print("="*70)
+values = [-5, 0, 0.01, 74.99, 75, 150, 299.999, 300, 2999, 3000, 1e9]
+assert list(map_to_rewards(values)) == [reference_map_to_reward(value) for value in values]
+assert [map_to_reward(value) for value in values] == [reference_map_to_reward(value) for value in values]
+assert project_future_value(12.5) == [{'months': 6, 'future_value': 75.0}, {'months': 24, 'future_value': 300.0},
+                                      {'months': 60, 'future_value': 750.0}]
+table = project_delayed_gratification(many)
+assert list(table.columns[-4:]) == ['value_6m', 'value_24m', 'value_60m', 'reward']
+assert np.array_equal(table['value_24m'], many['saved_amount'].to_numpy() * 24)
+blocks = InsightBlocks(project_delayed_gratification(detected))
+assert list(blocks) == reference_insight_blocks(detected) and blocks[-2:] == reference_insight_blocks(detected)[-2:]
+assert blocks[0] == InsightBlocks(project_delayed_gratification(detected.drop(columns='insight')))[0]
+assert list(InsightBlocks(project_delayed_gratification(detected.drop(columns='insight')))) == list(blocks)
+assert blocks[-1] == list(blocks)[-1]
+insights = generate_delayed_gratification_insights(sparse)
+assert len(insights['detailed_insights']) == len(insights['projections'])
+print(blocks[0])
+
+print("\n" + "="*70)
+print("TEST SUITE COMPLETE")
+print("="*70)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test script for parallel multi-file ingestion (directory and glob inputs)
+"""
+
+import os
+import shutil
+import tempfile
+
+from cashflow import load_ledger
+from ledger_ingest import expand_input_paths, format_ingest_report, is_multi_file_input, load_transaction_files
+
+tmp_dir = tempfile.mkdtemp()
+for name in ['sample_transactions.csv', 'multi_month_transactions.csv', 'dramatic_savings_transactions.csv']:
+    shutil.copy(os.path.join('data', name), tmp_dir)
+
+print("="*70)
+print("MULTI-FILE INGESTION - TEST SUITE")
+print("="*70)
+
+# Test 1: Directory and glob expansion
+print("\n" + "="*70)
+print("TEST 1: INPUT EXPANSION")
+print("="*70)
+assert len(expand_input_paths(tmp_dir)) == 3
+assert len(expand_input_paths(os.path.join(tmp_dir, '*month*.csv'))) == 1
+bracketed = os.path.join(tempfile.mkdtemp(), 'statement[2025].csv')
+shutil.copy(os.path.join('data', 'sample_transactions.csv'), bracketed)
+assert not is_multi_file_input(bracketed) and expand_input_paths(bracketed) == [bracketed]
+assert load_ledger(bracketed)[1]['rows'] == 10
+assert is_multi_file_input(os.path.join(tmp_dir, '[ms]*.csv'))
+print("directory -> 3 files, glob -> 1 file, existing 'statement[2025].csv' -> that file")
+
+# Test 2: Concurrent load into one ledger with a source_file column
+print("\n" + "="*70)
+print("TEST 2: PARALLEL LOAD")
+print("="*70)
+ledger, report = load_transaction_files(tmp_dir, max_workers=3)
+assert len(ledger) == 80
+assert ledger.groupby('source_file').size().to_dict() == {
+    os.path.join(tmp_dir, 'dramatic_savings_transactions.csv'): 40,
+    os.path.join(tmp_dir, 'multi_month_transactions.csv'): 30,
+    os.path.join(tmp_dir, 'sample_transactions.csv'): 10,
+}
+print(format_ingest_report(report))
+
+print("\n" + "="*70)
+print("TEST SUITE COMPLETE")
+print("="*70)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming ingestion: chunked aggregates must match full-load results
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from ledger_stream import (
+    category_breakdown_from_aggregates,
+    monthly_cashflow_from_aggregates,
+    running_balance_from_aggregates,
+    stream_aggregates,
+)
+from transaction_loader import MAX_REPORTED_ROWS, amount_dollars, load_transactions
+
+# Build a multi-year ledger large enough to span many chunks
+rng = np.random.default_rng(42)
+n_rows = 5000
+ledger = pd.DataFrame({
+    'date': pd.to_datetime('2023-01-01') + pd.to_timedelta(rng.integers(0, 900, n_rows), unit='D'),
+    'category': rng.choice(['Rent', 'Eating Out', 'Groceries', 'Salary', 'Coffee', 'Shopping'], n_rows),
+    'amount': rng.normal(-20, 200, n_rows).round(2)
+})
+path = os.path.join(tempfile.mkdtemp(), 'large_ledger.csv')
+ledger.to_csv(path, index=False)
+
+print("="*70)
+print("STREAMING INGESTION - TEST SUITE")
+print("="*70)
+
+df, _ = load_transactions(path)
+df = df.assign(amount=amount_dollars(df))
+aggregates = stream_aggregates(path, chunk_rows=700)
+print(f"\nStreamed {aggregates['rows']} rows in {aggregates['chunks']} chunks "
+      f"({aggregates['first_date'].date()} to {aggregates['last_date'].date()})")
+
+# Test 1: Monthly cashflow matches the full-load computation
+print("\n" + "="*70)
+print("TEST 1: MONTHLY CASHFLOW FROM AGGREGATES")
+print("="*70)
+months = df['date'].dt.to_period('M')
+expected = df.groupby(months)['amount'].agg(
+    income=lambda x: x[x > 0].sum(),
+    expenses=lambda x: -x[x < 0].sum(),
+    net_cashflow='sum'
+).reset_index().rename(columns={'date': 'month'})
+expected['month'] = expected['month'].astype(str)
+streamed = monthly_cashflow_from_aggregates(aggregates)
+pd.testing.assert_frame_equal(streamed, expected)
+print(streamed.head().to_string(index=False))
+
+# Test 2: Category breakdown matches
+print("\n" + "="*70)
+print("TEST 2: CATEGORY BREAKDOWN FROM AGGREGATES")
+print("="*70)
+category_totals = df.groupby('category', observed=True)['amount'].sum().sort_values()
+expenses_only = -category_totals[category_totals < 0]
+breakdown = category_breakdown_from_aggregates(aggregates)
+assert list(breakdown['Category']) == list(expenses_only.index)
+assert np.allclose(breakdown['Amount'], expenses_only.values)
+print(breakdown.to_string(index=False))
+
+# Test 3: Running balance ends at the total of all amounts
+print("\n" + "="*70)
+print("TEST 3: RUNNING BALANCE")
+print("="*70)
+balance = running_balance_from_aggregates(aggregates)
+assert np.isclose(balance['balance'].iloc[-1], df['amount'].sum())
+assert aggregates['balance_cents'] == df['amount_cents'].sum()
+print(balance.tail().to_string(index=False))
+
+# Test 4: Bad dates across many chunks are counted, with only the first few indices kept
+print("\n" + "="*70)
+print("TEST 4: INVALID DATES")
+print("="*70)
+bad = ledger.astype({'date': str})
+bad.loc[::20, 'date'] = 'not a date'
+bad_path = os.path.join(tempfile.mkdtemp(), 'bad_dates.csv')
+bad.to_csv(bad_path, index=False)
+bad_aggregates = stream_aggregates(bad_path, chunk_rows=700)
+assert bad_aggregates['invalid_dates'] == len(bad.index[::20]) > MAX_REPORTED_ROWS
+assert bad_aggregates['invalid_date_rows'] == list(bad.index[::20][:MAX_REPORTED_ROWS])
+assert bad_aggregates['rows'] == n_rows - bad_aggregates['invalid_dates']
+print(f"{bad_aggregates['invalid_dates']} invalid dates, first reported rows "
+      f"{bad_aggregates['invalid_date_rows'][:5]}")
+
+# Test 5: One date format for the whole file; a chunk of only bad dates is skipped, not fatal
+print("\n" + "="*70)
+print("TEST 5: ONE DATE FORMAT PER FILE")
+print("="*70)
+day_first_path = os.path.join(tempfile.mkdtemp(), 'day_first.csv')
+with open(day_first_path, 'w') as f:
+    f.write("date,category,amount\n13/01/2025,Rent,-1\n14/01/2025,Rent,-2\n03/04/2025,Rent,-3\n"
+            "05/06/2025,Rent,-4\nTotal,,-10\n")
+full_df, full_report = load_transactions(day_first_path)
+day_first = stream_aggregates(day_first_path, chunk_rows=2)
+assert [str(month) for month in day_first['monthly'].index] == ['2025-01', '2025-04', '2025-06']
+assert day_first['invalid_date_rows'] == full_report['invalid_date_rows'] == [4]
+assert day_first['balance_cents'] == full_df['amount_cents'].sum()
+print(f"Chunks of 2 rows: months {[str(month) for month in day_first['monthly'].index]}, "
+      f"format {full_report['date_format']}")
+
+print("\n" + "="*70)
+print("TEST SUITE COMPLETE")
+print("="*70)
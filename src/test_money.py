@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for exact integer-cent money arithmetic
+"""
+
+import numpy as np
+import pandas as pd
+
+from money import ledger_cents, monthly_cents, split_cents, to_cents, to_dollars
+from transaction_loader import compact_transactions
+
+print("="*70)
+print("MONEY ARITHMETIC - TEST SUITE")
+print("="*70)
+
+# Test 1: Conversions round to the nearest cent
+print("\n" + "="*70)
+print("TEST 1: CONVERSIONS")
+print("="*70)
+assert to_cents(19.99) == 1999
+assert to_cents(-0.29) == -29
+assert list(to_cents(np.array([0.1, 2.675, -538.88]))) == [10, 268, -53888]
+assert to_dollars(1999) == 19.99
+print("19.99 -> 1999 cents, -0.29 -> -29 cents, 1999 cents -> $19.99")
+
+# Test 2: Cent sums stay exact where float sums drift
+print("\n" + "="*70)
+print("TEST 2: EXACT AGGREGATION")
+print("="*70)
+ledger = pd.DataFrame({'amount': [0.10] * 1_000_000})
+float_total = ledger['amount'].cumsum().iloc[-1]
+cents_total = ledger_cents(ledger).cumsum().iloc[-1]
+assert cents_total == 10_000_000
+print(f"float cumsum of 1M x $0.10: {float_total:.10f}")
+print(f"cents cumsum of 1M x $0.10: {to_dollars(cents_total):.10f}")
+
+# Test 3: Income / expense split
+print("\n" + "="*70)
+print("TEST 3: INCOME / EXPENSE SPLIT")
+print("="*70)
+income, expenses = split_cents(pd.Series([45000, -12000, -550, 100000]))
+assert income.sum() == 145000 and expenses.sum() == 12550
+print(f"income: ${to_dollars(income.sum()):.2f}, expenses: ${to_dollars(expenses.sum()):.2f}")
+
+# Test 4: Vectorized monthly kernel
+print("\n" + "="*70)
+print("TEST 4: MONTHLY CENTS KERNEL")
+print("="*70)
+plain = pd.DataFrame({
+    'date': pd.to_datetime(['2025-03-02', '2025-01-15', '2025-03-20', '2025-01-03', '2025-03-09']),
+    'category': ['Salary', 'Rent', 'Food', 'Salary', 'Food'],
+    'amount': [1200.00, -600.00, -42.50, 1200.00, -0.10]
+})
+columns_before = list(plain.columns)
+for ledger in [plain, compact_transactions(plain.copy())]:
+    ordinals, income, expenses, net = monthly_cents(ledger)
+    assert list(ordinals) == [(2025 - 1970) * 12, (2025 - 1970) * 12 + 2]  # Empty February is skipped
+    assert list(income) == [120000, 120000] and list(expenses) == [60000, 4260]
+    assert list(net) == [60000, 115740] and net.dtype == np.int64
+assert list(plain.columns) == columns_before
+print(f"months {ordinals.tolist()}: income {income.tolist()}, expenses {expenses.tolist()}, net {net.tolist()}")
+
+print("\n" + "="*70)
+print("TEST SUITE COMPLETE")
+print("="*70)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for the Monte Carlo cashflow simulation
+"""
+
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+
+from cashflow import calculate_monthly_cashflow, load_ledger, project_scenario, simulate, simulate_cashflow
+from ledger_cube import build_cube
+from monte_carlo import CHUNK_PATHS, category_history, combination_tables, goal_probability, simulate_paths
+
+df, _ = load_ledger(os.path.join('data', 'multi_month_transactions.csv'))
+cube = build_cube(df)
+history = category_history(cube)
+
+print("="*70)
+print("MONTE CARLO SIMULATION - TEST SUITE")
+print("="*70)
+print(f"\nHistory: {history.shape[0]} months x {history.shape[1]} categories")
+
+# Test 1: History and combination tables
+print("\n" + "="*70)
+print("TEST 1: HISTORY AND COMBINATION TABLES")
+print("="*70)
+monthly = calculate_monthly_cashflow(cube)
+assert np.array_equal(history.sum(axis=1), (monthly['net_cashflow'] * 100).round().astype('int64'))
+small = np.array([[100, -5, 7], [200, -6, 8], [300, -7, 9]])
+tables = combination_tables(small, max_entries=9)
+expected = sorted(sum(combo) for combo in itertools.product(small[:, 0], small[:, 1]))
+assert [len(table) for table in tables] == [9, 3] and sorted(tables[0]) == expected
+assert np.isclose(sum(table.mean() for table in combination_tables(history)), history.mean(axis=0).sum())
+print(f"Tables for {history.shape[1]} categories: {[len(table) for table in combination_tables(history)]}")
+
+# Test 2: Same seed, same paths, whatever the chunking across workers
+print("\n" + "="*70)
+print("TEST 2: DETERMINISTIC SEEDS")
+print("="*70)
+paths = 2 * CHUNK_PATHS + 123
+in_process = simulate_paths(history, 24, paths, seed=42)
+assert in_process.shape == (paths, 24) and in_process.dtype == np.int64
+assert np.array_equal(in_process, simulate_paths(history, 24, paths, seed=42, max_workers=2))
+assert not np.array_equal(in_process, simulate_paths(history, 24, paths, seed=43))
+print(f"{paths} paths identical in-process and across 2 workers")
+
+# Test 3: Bootstrapped months average out to the historical mean
+print("\n" + "="*70)
+print("TEST 3: BOOTSTRAP STATISTICS")
+print("="*70)
+mean_net = monthly['net_cashflow'].mean() * 100
+for method in ('category', 'month'):
+    final = simulate_paths(history, 12, 50_000, method=method)[:, -1]
+    assert abs(final.mean() / 12 - mean_net) < 0.01 * abs(mean_net)
+    print(f"{method:>8s}: mean monthly net {final.mean() / 1200:.2f} vs historical {mean_net / 100:.2f}")
+steady = pd.DataFrame({'date': pd.to_datetime(['2025-01-05', '2025-02-05', '2025-01-06', '2025-02-06']),
+                       'category': ['Salary', 'Salary', 'Rent', 'Rent'], 'amount': [2000.0, 2000.0, -1500.0, -1500.0]})
+steady_result = simulate_cashflow(steady, 6, paths=100, savings=50)
+baseline = project_scenario(calculate_monthly_cashflow(steady), 6)['projection']
+for column in ('p5', 'p50', 'p95'):
+    assert np.allclose(steady_result['bands'][column], baseline['cumulative_savings'] + 50)
+assert list(steady_result['bands']['month']) == list(baseline['month'])
+
+# Test 4: Percentile bands and goal probability through the library API
+print("\n" + "="*70)
+print("TEST 4: BANDS AND GOAL PROBABILITY")
+print("="*70)
+result = simulate(df, months=12, paths=20_000, goal_amount=7900, income_change=100)
+bands = result['bands']
+assert list(bands.columns) == ['month', 'p5', 'p25', 'p50', 'p75', 'p95']
+assert (bands[['p5', 'p25', 'p50', 'p75', 'p95']].diff(axis=1).iloc[:, 1:] >= 0).all().all()
+assert 0.2 < result['goal_probability'] < 0.8  # Goal near the median final savings
+assert goal_probability(np.array([[1, 5], [2, 3]]), 4) == 0.5
+assert simulate(df, 12, 20_000, goal_amount=7900, income_change=100)['bands'].equals(bands)
+for bad in ({'paths': 0}, {'method': 'normal'}):
+    try:
+        simulate(df, **bad)
+        raise AssertionError("Expected ValueError")
+    except ValueError as e:
+        print(f"Rejected {bad}: {e}")
+print(bands.tail(3).to_string(index=False))
+print(f"Chance of $7900 in 12 months: {result['goal_probability']:.1%}")
+
+print("\n" + "="*70)
+print("TEST SUITE COMPLETE")
+print("="*70)
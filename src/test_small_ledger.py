@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test script for fast start-up: lazy heavy imports and the pure-Python small-ledger path
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import cashflow
+from cashflow_cli import build_parser, compute_reports, to_json_value
+from small_ledger import SMALL_LEDGER_REPORTS, aggregate_small_ledger, read_small_ledger, small_ledger_report
+
+src_dir = os.path.dirname(os.path.abspath(__file__))
+tmp_dir = tempfile.mkdtemp()
+
+print("="*70)
+print("FAST START-UP - TEST SUITE")
+print("="*70)
+
+# Test 1: Importing the analyzer and CLI does not import pandas or NumPy
+print("\n" + "="*70)
+print("TEST 1: LAZY IMPORTS")
+print("="*70)
+probe = "import sys, cashflow, cashflow_cli; print(json.dumps(['pandas' in sys.modules, 'numpy' in sys.modules]))"
+loaded = subprocess.run([sys.executable, '-c', 'import json; ' + probe], cwd=src_dir,
+                        capture_output=True, text=True, check=True).stdout
+assert json.loads(loaded) == [False, False]
+print("cashflow and cashflow_cli import without pandas or NumPy")
+
+# Test 2: Pure-Python reports equal the pandas-based reports
+print("\n" + "="*70)
+print("TEST 2: SMALL LEDGER MATCHES FULL PIPELINE")
+print("="*70)
+options = build_parser().parse_args(['monthly', '-l', 'unused.csv'])
+for name in ['sample_transactions.csv', 'multi_month_transactions.csv', 'dramatic_savings_transactions.csv']:
+    path = os.path.join('data', name)
+    aggregates = aggregate_small_ledger(read_small_ledger(path))
+    small = {report: small_ledger_report(aggregates, report) for report in SMALL_LEDGER_REPORTS}
+    df, _ = cashflow.load_ledger(path)
+    full, _ = compute_reports(cashflow, df, list(SMALL_LEDGER_REPORTS), options)
+    assert to_json_value(small) == to_json_value(full), name
+    print(f"{name:40s} identical")
+
+# Test 3: Anything unusual falls back to the full loader
+print("\n" + "="*70)
+print("TEST 3: FALLBACK TO FULL LOADER")
+print("="*70)
+bad_date = os.path.join(tmp_dir, 'bad_date.csv')
+with open(bad_date, 'w') as f:
+    f.write("date,category,amount\n2025-06-01,Salary,100\nsoon,Rent,-50\n")
+assert read_small_ledger(bad_date) is None
+assert read_small_ledger(os.path.join(tmp_dir, 'missing.csv')) is None
+assert read_small_ledger(os.path.join('data', 'multi_month_transactions.csv'), max_bytes=100) is None
+print("invalid dates, missing files and large files -> full loader")
+
+print("\n" + "="*70)
+print("TEST SUITE COMPLETE")
+print("="*70)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script for the transaction loader (dialect detection and single-pass parsing)
+"""
+
+import os
+import tempfile
+
+import pandas as pd
+
+from transaction_loader import (
+    amount_dollars,
+    detect_csv_dialect,
+    infer_date_format,
+    load_transactions,
+    month_periods,
+    parse_dates,
+)
+
+tmp_dir = tempfile.mkdtemp()
+
+
+def write_sample(name, content):
+    """Write raw bytes to a temporary CSV and return its path."""
+    path = os.path.join(tmp_dir, name)
+    with open(path, 'wb') as f:
+        f.write(content)
+    return path
+
+
+print("="*70)
+print("TRANSACTION LOADER - TEST SUITE")
+print("="*70)
+
+# Test 1: Dialect detection across encodings and delimiters
+print("\n" + "="*70)
+print("TEST 1: DIALECT DETECTION")
+print("="*70)
+samples = {
+    'comma_utf8.csv': (b"date,category,amount\n2025-06-01,Rent,-600\n2025-06-02,Salary,1200\n",
+                       'utf-8', ','),
+    'semicolon_cp1252.csv': (b"date;category;amount\n2025-06-01;Caf\xe9;-3.50\n2025-06-02;Salary;1200\n",
+                             'cp1252', ';'),
+    'tab_bom.csv': (b"\xef\xbb\xbfdate\tcategory\tamount\n2025-06-01\tRent\t-600\n",
+                    'utf-8-sig', '\t'),
+    'pipe_quoted.csv': (b'date|category|amount\n2025-06-01|"Food, Groceries"|-42.50\n2025-06-02|Salary|1200\n',
+                        'utf-8', '|'),
+}
+for name, (content, encoding, delimiter) in samples.items():
+    dialect = detect_csv_dialect(write_sample(name, content))
+    assert (dialect['encoding'], dialect['delimiter']) == (encoding, delimiter), (name, dialect)
+    print(f"{name:25s} -> {dialect['encoding']:10s} {dialect['delimiter']!r}")
+
+# Test 2: Full load with column aliases and timing report
+print("\n" + "="*70)
+print("TEST 2: LOAD WITH COLUMN ALIASES")
+print("="*70)
+path = write_sample('aliases.csv',
+                    b"Transaction_Date;Description;Value\n2025-06-01;Rent;-600\n2025-07-01;Salary;1200\n")
+df, report = load_transactions(path)
+assert list(df.columns) == ['date', 'category', 'amount_cents', 'month_ordinal']
+assert list(df['amount_cents']) == [-60000, 120000]
+assert report['rows'] == 2
+print(df.to_string(index=False))
+print(f"\nDetected: {report['encoding']} / {report['delimiter']!r} (engine: {report['engine']})")
+print(f"Detection: {report['detection_seconds'] * 1000:.2f} ms, parsing: {report['parse_seconds'] * 1000:.2f} ms")
+
+# Test 3: Parser tiers fall back only when needed
+print("\n" + "="*70)
+print("TEST 3: PARSER TIER FALLBACK")
+print("="*70)
+clean = write_sample('clean.csv', b"date,category,amount\n2025-06-01,Rent,-600\n2025-06-02,Salary,1200\n")
+messy = write_sample('messy.csv', b"date,category,amount\n2025-06-01,Rent,-600\n2025-06-02,Salary,n/a\n")
+_, clean_report = load_transactions(clean)
+assert clean_report['engine'] in ('pyarrow', 'c')
+print(f"clean.csv -> {clean_report['engine']}")
+try:
+    load_transactions(messy)
+except ValueError as e:
+    print(f"messy.csv -> rejected after untyped parse: {e}")
+
+# Test 4: Compact representation
+print("\n" + "="*70)
+print("TEST 4: COMPACT LEDGER")
+print("="*70)
+df, report = load_transactions(os.path.join('data', 'multi_month_transactions.csv'))
+assert isinstance(df['category'].dtype, pd.CategoricalDtype)
+assert str(df['amount_cents'].dtype) == 'int64' and str(df['month_ordinal'].dtype) == 'int32'
+assert (month_periods(df) == df['date'].dt.to_period('M')).all()
+assert abs(amount_dollars(df).sum() - 1344.5) < 1e-9
+print(df.dtypes.to_string())
+print(f"\nMemory: {report['raw_bytes_per_row']:.1f} -> {report['compact_bytes_per_row']:.1f} bytes/row")
+
+# Test 5: Sample data shipped with the project
+print("\n" + "="*70)
+print("TEST 5: PROJECT DATASETS")
+print("="*70)
+for name in ['sample_transactions.csv', 'multi_month_transactions.csv', 'dramatic_savings_transactions.csv']:
+    df, report = load_transactions(os.path.join('data', name))
+    print(f"{name:40s} {report['rows']:4d} rows  {report['encoding']} {report['delimiter']!r} {report['engine']}")
+
+# Test 6: Date format inference and invalid-date reporting
+print("\n" + "="*70)
+print("TEST 6: DATE PARSING")
+print("="*70)
+assert infer_date_format(['03/01/2025', '25/01/2025']) == '%d/%m/%Y'
+assert infer_date_format(['2025-01-03', '2025-01-25']) == '%Y-%m-%d'
+repeated = pd.Series(['2025-01-03', '2025-01-04'] * 50 + ['not a date'])
+parsed, invalid_rows = parse_dates(repeated)
+assert invalid_rows == [100]
+assert parsed.iloc[1] == pd.Timestamp('2025-01-04')
+dmy = write_sample('dmy.csv', b"Date,Category,Amount\n"
+                   b"03/01/2025,Coffee,-4.50\n25/01/2025,Salary,3000\n"
+                   b"??/??/2025,Rent,-1200\n28/02/2025,Coffee,-5.00\n")
+df, report = load_transactions(dmy)
+assert report['rows'] == 3 and report['invalid_dates'] == 1 and report['invalid_date_rows'] == [2]
+assert list(df['date']) == list(pd.to_datetime(['2025-01-03', '2025-01-25', '2025-02-28']))
+print(f"dmy.csv -> {report['rows']} rows, skipped rows {report['invalid_date_rows']}")
+
+print("\n" + "="*70)
+print("TEST SUITE COMPLETE")
+print("="*70)
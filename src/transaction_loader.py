@@ -0,0 +1,614 @@
+"""
+Transaction Loader Module
+
+This module loads transaction CSV files for the Personal Finance Analyzer by:
+1. Sniffing the encoding and delimiter once from a bounded byte sample
+2. Parsing the full file exactly once with the detected dialect
+3. Standardizing column names and validating date/amount values, parsing
+   dates with a format inferred once and converting only distinct strings
+4. Converting the ledger to a compact representation (categorical
+   category, integer-cent amounts, precomputed month ordinals)
+"""
+
+import codecs
+import csv
+import importlib.util
+import time
+
+from lazy_imports import lazy_import
+
+# Heavy dependencies load on first use so importing this module stays cheap
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Number of bytes read from the head of the file for dialect detection
+SNIFF_SAMPLE_BYTES = 64 * 1024
+
+# Delimiters considered during detection, in tie-break order
+CANDIDATE_DELIMITERS = [',', ';', '\t', '|']
+
+# Byte order marks mapped to the encoding that strips them
+BOM_ENCODINGS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+# Encoding used when the detected one turns out to be wrong further into the file
+FALLBACK_ENCODING = 'latin-1'
+
+# Parser tiers tried in order as (engine, use explicit dtypes); the python
+# engine is only reached when the faster engines cannot handle the file
+PARSER_TIERS = [('pyarrow', True), ('c', True), ('c', False), ('python', False)]
+
+# Explicit dtypes for the required columns, applied via their raw header names
+COLUMN_DTYPES = {
+    'date': str,
+    'category': str,
+    'amount': 'float64'
+}
+
+# Date formats tried, in order, against a sample of distinct date strings
+# (month-first before day-first, matching pandas' default inference)
+DATE_FORMATS = [
+    '%Y-%m-%d', '%Y/%m/%d', '%Y%m%d', '%m/%d/%Y', '%d/%m/%Y', '%m-%d-%Y', '%d-%m-%Y',
+    '%d.%m.%Y', '%m/%d/%y', '%d/%m/%y', '%d %b %Y', '%b %d, %Y', '%d-%b-%Y',
+    '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%m/%d/%Y %H:%M', '%d/%m/%Y %H:%M'
+]
+
+# Number of distinct date strings used to infer the format
+DATE_SAMPLE_SIZE = 500
+
+# Parse distinct strings and map back when they are at most this share of rows
+UNIQUE_DATE_RATIO = 0.5
+
+# Maximum number of unparseable row indices kept in a load report
+MAX_REPORTED_ROWS = 100
+
+# Flexible mapping for common column name variations
+COLUMN_ALIASES = {
+    'date': ['date', 'transaction_date', 'trans_date'],
+    'category': ['category', 'description', 'type', 'transaction_type'],
+    'amount': ['amount', 'value', 'transaction_amount']
+}
+
+
+def detect_encoding(sample, at_eof=False):
+    """
+    Detect the text encoding of a byte sample.
+
+    Checks for a byte order mark first, then tries strict UTF-8 and falls
+    back to cp1252 / latin-1 using their decodable byte ranges.
+
+    Args:
+        sample: Raw bytes from the head of the file
+        at_eof: True if the sample contains the whole file
+
+    Returns:
+        Encoding name usable by pandas.read_csv
+    """
+    for bom, encoding in BOM_ENCODINGS:
+        if sample.startswith(bom):
+            return encoding
+
+    # An incremental decoder tolerates a multi-byte character cut at the sample edge
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=at_eof)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    # cp1252 leaves 0x81, 0x8D, 0x8F, 0x90 and 0x9D undefined; latin-1 accepts every byte
+    try:
+        sample.decode('cp1252')
+        return 'cp1252'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+
+def score_delimiter(lines, delimiter):
+    """
+    Score how well a delimiter splits sample lines into a consistent table.
+
+    Args:
+        lines: List of complete text lines from the sample
+        delimiter: Candidate delimiter character
+
+    Returns:
+        Tuple (consistency, field_count) where consistency is the fraction of
+        lines having the most common field count; (0, 0) if it never splits
+    """
+    field_counts = {}
+    for row in csv.reader(lines, delimiter=delimiter):
+        if row:
+            field_counts[len(row)] = field_counts.get(len(row), 0) + 1
+
+    if not field_counts:
+        return (0, 0)
+
+    field_count, frequency = max(field_counts.items(), key=lambda item: (item[1], item[0]))
+    if field_count < 2:
+        return (0, 0)
+
+    return (frequency / sum(field_counts.values()), field_count)
+
+
+def detect_csv_dialect(file_path, sample_size=SNIFF_SAMPLE_BYTES):
+    """
+    Detect encoding and delimiter from a single bounded read of the file.
+
+    Args:
+        file_path: Path to the CSV file
+        sample_size: Maximum number of bytes to sniff
+
+    Returns:
+        Dict with 'encoding', 'delimiter' and 'header' (raw column names)
+    """
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_size)
+        at_eof = not f.read(1)
+
+    if not sample.strip():
+        raise ValueError("CSV file is empty.")
+
+    encoding = detect_encoding(sample, at_eof)
+    text = sample.decode(encoding, errors='replace')
+    lines = text.splitlines()
+
+    # Drop the trailing partial line unless the whole file fit in the sample
+    if not at_eof and len(lines) > 1:
+        lines = lines[:-1]
+
+    best_delimiter = CANDIDATE_DELIMITERS[0]
+    best_score = (0, 0)
+    for delimiter in CANDIDATE_DELIMITERS:
+        score = score_delimiter(lines, delimiter)
+        if score > best_score:
+            best_delimiter, best_score = delimiter, score
+
+    header = next(csv.reader(lines[:1], delimiter=best_delimiter), [])
+
+    return {'encoding': encoding, 'delimiter': best_delimiter, 'header': header}
+
+
+def build_column_dtypes(header):
+    """
+    Map raw header names of the required columns to explicit dtypes.
+
+    Args:
+        header: Raw column names from detect_csv_dialect()
+
+    Returns:
+        Dict usable as the dtype argument of pandas.read_csv
+    """
+    normalized = {col.lower().strip(): col for col in header}
+    dtypes = {}
+    for required_col, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in normalized:
+                dtypes[normalized[alias]] = COLUMN_DTYPES[required_col]
+                break
+    return dtypes
+
+
+def parse_with_fallback(file_path, dialect):
+    """
+    Parse the file with the fastest parser tier that accepts it.
+
+    Args:
+        file_path: Path to the CSV file
+        dialect: Dict from detect_csv_dialect(); 'engine' is set to the tier used
+
+    Returns:
+        Raw DataFrame as read from the file
+    """
+    dtypes = build_column_dtypes(dialect.get('header', []))
+    pyarrow_available = importlib.util.find_spec('pyarrow') is not None
+    last_error = None
+
+    for engine, typed in PARSER_TIERS:
+        if engine == 'pyarrow' and not pyarrow_available:
+            continue
+        try:
+            df = pd.read_csv(file_path, encoding=dialect['encoding'], delimiter=dialect['delimiter'],
+                             dtype=dtypes if typed else None, on_bad_lines='skip', engine=engine)
+        except UnicodeDecodeError:
+            raise
+        except (ValueError, TypeError, pd.errors.ParserError) as e:
+            last_error = e
+            continue
+        dialect['engine'] = engine
+        return df
+
+    raise ValueError(f"Could not parse CSV file: {last_error}")
+
+
+def read_transactions_csv(file_path, dialect):
+    """
+    Parse the full CSV file once using a detected dialect.
+
+    If a decoding error shows up past the sniffed sample, the file is
+    re-read a single time with FALLBACK_ENCODING and the dialect updated.
+
+    Args:
+        file_path: Path to the CSV file
+        dialect: Dict from detect_csv_dialect()
+
+    Returns:
+        Raw DataFrame as read from the file
+    """
+    try:
+        return parse_with_fallback(file_path, dialect)
+    except UnicodeDecodeError:
+        dialect['encoding'] = FALLBACK_ENCODING
+        return parse_with_fallback(file_path, dialect)
+
+
+def resolve_column_mapping(columns, resolve_missing=None):
+    """
+    Work out which columns map onto date, category and amount.
+
+    Args:
+        columns: Normalized (lowercase, stripped) column names
+        resolve_missing: Optional callable(required_col, available_columns)
+            returning the actual column name when no alias matches
+
+    Returns:
+        Dict of {source_column: required_column} for columns needing a rename
+    """
+    column_mapping = {}
+    for required_col, aliases in COLUMN_ALIASES.items():
+        found = False
+        for alias in aliases:
+            if alias in columns:
+                if alias != required_col:
+                    column_mapping[alias] = required_col
+                found = True
+                break
+
+        if not found:
+            alt_col = resolve_missing(required_col, list(columns)) if resolve_missing else None
+            if alt_col and alt_col in columns:
+                column_mapping[alt_col] = required_col
+            else:
+                raise ValueError(f"Required column '{required_col}' is missing.")
+
+    return column_mapping
+
+
+def required_column_renames(header, resolve_missing=None):
+    """
+    Map raw header names onto date, category and amount, for those columns only.
+
+    Args:
+        header: Raw column names from detect_csv_dialect()
+        resolve_missing: Optional callable passed to resolve_column_mapping()
+
+    Returns:
+        Dict of {raw_column: required_column} with exactly one entry per required column
+    """
+    normalized = [str(col).lower().strip() for col in header]
+    column_mapping = resolve_column_mapping(normalized, resolve_missing)
+
+    renames = {}
+    for raw, norm in zip(header, normalized):
+        target = column_mapping.get(norm, norm)
+        if target in COLUMN_ALIASES and target not in renames.values():
+            renames[raw] = target
+    return renames
+
+
+def standardize_columns(df, resolve_missing=None):
+    """
+    Normalize column names and map aliases onto date, category and amount.
+
+    Args:
+        df: Raw transaction DataFrame
+        resolve_missing: Optional callable passed to resolve_column_mapping()
+
+    Returns:
+        DataFrame with standardized columns
+    """
+    # Remove empty columns
+    df = df.dropna(axis=1, how='all')
+
+    # Standardize column names (lowercase and strip whitespace)
+    df.columns = df.columns.str.lower().str.strip()
+
+    column_mapping = resolve_column_mapping(list(df.columns), resolve_missing)
+
+    # Rename columns if alternatives were provided
+    if column_mapping:
+        df = df.rename(columns=column_mapping)
+
+    return df
+
+
+def infer_date_format(values):
+    """
+    Infer a single strptime format from a sample of date strings.
+
+    Args:
+        values: Array-like of distinct date strings
+
+    Returns:
+        The first format in DATE_FORMATS that parses the whole sample, else
+        the one parsing the most values, or None if none parses any
+    """
+    sample = pd.Series(values[:DATE_SAMPLE_SIZE], dtype=object).dropna().astype(str).str.strip()
+    if sample.empty:
+        return None
+
+    best_format, best_count = None, 0
+    for fmt in DATE_FORMATS:
+        count = pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum()
+        if count == len(sample):
+            return fmt
+        if count > best_count:
+            best_format, best_count = fmt, count
+    return best_format
+
+
+def parse_date_strings(values, date_format):
+    """
+    Parse strings with an explicit format, inferring per value only for stragglers.
+
+    Args:
+        values: Array-like of date strings
+        date_format: Format from infer_date_format(), or None
+
+    Returns:
+        DatetimeIndex with NaT for unparseable values
+    """
+    strings = pd.Series(values, dtype=object).astype(str).str.strip()
+    if date_format is None:
+        parsed = pd.Series(pd.NaT, index=strings.index, dtype='datetime64[ns]')
+    else:
+        parsed = pd.to_datetime(strings, format=date_format, errors='coerce')
+
+    # Messy exports mix formats: let pandas infer the few values the format missed
+    missing = parsed.isna()
+    if missing.any():
+        try:
+            parsed[missing] = pd.to_datetime(strings[missing], format='mixed', errors='coerce')
+        except (TypeError, ValueError):
+            parsed[missing] = pd.to_datetime(strings[missing], errors='coerce')
+
+    return pd.DatetimeIndex(parsed)
+
+
+def column_date_format(dates):
+    """
+    Infer the date format of a raw date column from its first distinct values.
+
+    Args:
+        dates: Series of raw date values
+
+    Returns:
+        Format from infer_date_format(), or None
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return None
+    return infer_date_format(pd.factorize(dates)[1])
+
+
+def parse_dates(dates, date_format=None):
+    """
+    Parse a date column, converting each distinct string only once.
+
+    Args:
+        dates: Series of raw date values
+        date_format: Format to parse with, e.g. inferred once for a whole
+            file read in pieces (default: inferred from these dates)
+
+    Returns:
+        Tuple (parsed, invalid_rows) where parsed is a datetime Series aligned
+        with dates and invalid_rows lists the index labels that failed to parse
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        parsed = dates
+    else:
+        codes, uniques = pd.factorize(dates)
+        if date_format is None:
+            date_format = infer_date_format(uniques)
+        if len(uniques) <= len(dates) * UNIQUE_DATE_RATIO:
+            # Heavy repetition: parse distinct strings, then map back by code (-1 -> NaT)
+            parsed_uniques = parse_date_strings(uniques, date_format)
+            values = np.append(parsed_uniques.values, np.datetime64('NaT'))[codes]
+            parsed = pd.Series(values, index=dates.index)
+        else:
+            parsed = pd.Series(parse_date_strings(dates.values, date_format), index=dates.index)
+
+    invalid = parsed.isna()
+    return parsed, list(dates.index[invalid])
+
+
+def validate_transactions(df, date_format=None, allow_empty=False):
+    """
+    Parse dates and amounts.
+
+    Rows with unparseable dates are dropped and reported by row index rather
+    than failing the whole load; unparseable amounts are still rejected.
+
+    Args:
+        df: DataFrame with standardized columns
+        date_format: Format passed to parse_dates()
+        allow_empty: Return an empty DataFrame instead of raising when no
+            date parses (for one piece of a larger file)
+
+    Returns:
+        Tuple (df, invalid_date_rows) where df has datetime 'date' and numeric
+        'amount', and invalid_date_rows lists the dropped row indices
+    """
+    df['date'], invalid_date_rows = parse_dates(df['date'], date_format)
+    if invalid_date_rows:
+        df = df.drop(index=invalid_date_rows)
+        if df.empty and not allow_empty:
+            raise ValueError("Invalid date values found. Ensure dates are in a parseable format.")
+
+    df['amount'] = pd.to_numeric(df['amount'], errors='coerce')
+    if df['amount'].isnull().any():
+        raise ValueError("Invalid 'amount' values found. Ensure all amounts are numeric.")
+
+    return df, invalid_date_rows
+
+
+def month_ordinals(dates):
+    """
+    Month ordinal (months since 1970-01, as used by pandas monthly periods).
+
+    Args:
+        dates: Datetime Series
+
+    Returns:
+        int32 Series
+    """
+    return ((dates.dt.year - 1970) * 12 + dates.dt.month - 1).astype('int32')
+
+
+def ordinals_to_periods(ordinals):
+    """
+    Convert month ordinals back to monthly periods.
+
+    Args:
+        ordinals: Array-like of month ordinals
+
+    Returns:
+        PeriodIndex with monthly frequency
+    """
+    ordinals = np.asarray(ordinals, dtype='int64')
+    starts = pd.to_datetime(pd.DataFrame({'year': ordinals // 12 + 1970, 'month': ordinals % 12 + 1, 'day': 1}))
+    return pd.DatetimeIndex(starts).to_period('M')
+
+
+def compact_transactions(df):
+    """
+    Convert a validated ledger to its compact representation.
+
+    Args:
+        df: DataFrame with datetime 'date', 'category' and numeric 'amount'
+
+    Returns:
+        DataFrame with columns:
+        - date: datetime64
+        - category: pandas Categorical
+        - amount_cents: int64 cents (positive=income, negative=expense)
+        - month_ordinal: int32 month ordinal of the date
+    """
+    return pd.DataFrame({
+        'date': df['date'],
+        'category': df['category'].astype('category'),
+        'amount_cents': (df['amount'] * 100).round().astype('int64'),
+        'month_ordinal': month_ordinals(df['date'])
+    })
+
+
+def amount_dollars(df):
+    """
+    Transaction amounts in dollars for plain or compact ledgers.
+
+    Args:
+        df: DataFrame with a float 'amount' or an integer 'amount_cents' column
+
+    Returns:
+        float Series named 'amount'
+    """
+    if 'amount_cents' in df.columns:
+        return (df['amount_cents'] / 100).rename('amount')
+    return df['amount']
+
+
+def month_periods(df):
+    """
+    Monthly period of every transaction for plain or compact ledgers.
+
+    Compact ledgers convert only their distinct month ordinals.
+
+    Args:
+        df: DataFrame with a 'date' column and optionally 'month_ordinal'
+
+    Returns:
+        Series of monthly periods aligned with df
+    """
+    if 'month_ordinal' not in df.columns:
+        return df['date'].dt.to_period('M')
+
+    codes, uniques = pd.factorize(df['month_ordinal'])
+    return pd.Series(ordinals_to_periods(uniques)[codes], index=df.index)
+
+
+def concat_ledgers(frames):
+    """
+    Concatenate ledgers, keeping category categorical across differing categories.
+
+    Args:
+        frames: List of DataFrames with the same columns
+
+    Returns:
+        Concatenated DataFrame
+    """
+    frames = [frame for frame in frames if not frame.empty] or frames[:1]
+    categorical = all(isinstance(frame['category'].dtype, pd.CategoricalDtype) for frame in frames)
+    ledger = pd.concat(frames, ignore_index=True)
+    if categorical and len(frames) > 1:
+        ledger['category'] = pd.api.types.union_categoricals([frame['category'] for frame in frames])
+    return ledger
+
+
+def memory_per_row(df):
+    """Deep memory usage of a DataFrame in bytes per row."""
+    return df.memory_usage(deep=True).sum() / max(len(df), 1)
+
+
+def load_transactions(file_path, resolve_missing=None):
+    """
+    Load, standardize and validate a transactions CSV file.
+
+    Args:
+        file_path: Path to the CSV file
+        resolve_missing: Optional callable passed to standardize_columns()
+
+    Returns:
+        Tuple (df, report) where df is the compact ledger from
+        compact_transactions() and report is a dict with:
+        - encoding, delimiter: detected dialect
+        - engine: parser tier that read the file ('pyarrow', 'c' or 'python')
+        - columns: raw column names as read from the file
+        - rows: number of loaded transactions
+        - detection_seconds, parse_seconds: time spent in each stage
+        - raw_bytes_per_row, compact_bytes_per_row: memory before and after compaction
+        - invalid_dates: number of rows dropped for unparseable dates
+        - invalid_date_rows: their row indices (first MAX_REPORTED_ROWS)
+        - date_format: format the dates were parsed with (None if inferred per value)
+    """
+    start = time.perf_counter()
+    dialect = detect_csv_dialect(file_path)
+    detected = time.perf_counter()
+
+    df = read_transactions_csv(file_path, dialect)
+    if df.empty:
+        raise ValueError("Could not read CSV file. Please ensure the file is a valid CSV.")
+    columns = [str(col).lower().strip() for col in df.columns]
+
+    df = standardize_columns(df, resolve_missing)
+    date_format = column_date_format(df['date'])
+    df, invalid_date_rows = validate_transactions(df, date_format)
+    raw_bytes_per_row = memory_per_row(df[['date', 'category', 'amount']])
+    df = compact_transactions(df)
+    parsed = time.perf_counter()
+
+    report = {
+        'encoding': dialect['encoding'],
+        'delimiter': dialect['delimiter'],
+        'engine': dialect['engine'],
+        'columns': columns,
+        'rows': len(df),
+        'detection_seconds': detected - start,
+        'parse_seconds': parsed - detected,
+        'raw_bytes_per_row': raw_bytes_per_row,
+        'compact_bytes_per_row': memory_per_row(df),
+        'invalid_dates': len(invalid_date_rows),
+        'invalid_date_rows': [int(row) for row in invalid_date_rows[:MAX_REPORTED_ROWS]],
+        'date_format': date_format
+    }
+    return df, report